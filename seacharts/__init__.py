@@ -1,5 +1,7 @@
 """
-Contains and exposes the ENC class and its Config class for the maritime spatial API.
+Contains and exposes the ENC class and its Config class for the maritime spatial API,
+and the functions for building the charts of many regions at once or in shards.
 """
 from .core import Config
 from .enc import ENC
+from .batch import build_regions, plan_shards, run_shards, merge_shards
@@ -0,0 +1,42 @@
+"""
+Command line interface for planning, running and merging the shards of a chart build,
+e.g. 'python -m seacharts run shards/plan.json' on every worker machine.
+"""
+import argparse
+
+from seacharts.batch import plan_shards, run_shards, merge_shards
+
+
+def main() -> None:
+    """
+    Parses the command line arguments and runs the requested build step.
+    """
+    parser = argparse.ArgumentParser(prog="seacharts", description="Sharded chart builds.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="split the build of a chart into shards")
+    plan.add_argument("config", help="path to the .yaml config file of the chart")
+    plan.add_argument("directory", help="shared directory of the plan and shard outputs")
+    plan.add_argument("--columns", type=int, default=2, help="number of tiles along the x-axis")
+    plan.add_argument("--rows", type=int, default=2, help="number of tiles along the y-axis")
+    plan.add_argument("--whole-layers", action="store_true", help="build all layers of a tile together")
+
+    run = commands.add_parser("run", help="run shards of a plan, by default all unclaimed ones")
+    run.add_argument("plan", help="path to the plan file")
+    run.add_argument("shards", nargs="*", help="ids of the shards to be run")
+
+    merge = commands.add_parser("merge", help="merge the shard outputs into the chart cache")
+    merge.add_argument("plan", help="path to the plan file")
+
+    arguments = parser.parse_args()
+    if arguments.command == "plan":
+        plan_shards(arguments.config, arguments.directory,
+                    arguments.columns, arguments.rows, not arguments.whole_layers)
+    elif arguments.command == "run":
+        run_shards(arguments.plan, arguments.shards or None)
+    else:
+        merge_shards(arguments.plan)
+
+
+if __name__ == "__main__":
+    main()
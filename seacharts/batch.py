@@ -0,0 +1,421 @@
+"""
+Contains functions for building the charts of many regions at once, and for splitting the
+build of one large region into shards run on several machines.
+"""
+import json
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from shapely import geometry as geo
+
+from seacharts.core import Config, Scope, MapFormat, FGDBParser, GPKGParser, cache, files, paths
+from seacharts.enc import ENC
+from seacharts.environment.map import MapData
+from seacharts.layers import Layer, Land, Shore, Seabed
+from seacharts.shapes.repair import polygonal_parts
+
+# Name of the file recording the layers written by the last complete build of a region
+_BUILD_RECORD = "build.json"
+
+# Version of the shard plan format
+_PLAN_VERSION = 1
+
+# Name of the file claiming a shard for the worker running it
+_CLAIM = "claim"
+
+
+def build_regions(configs: list[Config | Path | str], workers: int | None = None) -> None:
+    """
+    Builds the shapefile caches of the charts of many regions, e.g. one per mission area,
+    such that each chart is afterwards created from its cache by ENC.
+
+    Regions reading the same FGDB, GeoPackage or FlatGeobuf resources are built together:
+    every source layer is read once within the bounding box of all regions, and each record
+    is routed to every region it intersects. The regions are then merged, clipped and
+    written to their cache entries in parallel worker processes. Regions of S-57 resources,
+    whose reads are clipped per cell, are built one at a time.
+
+    Regions whose layers are all completely cached are skipped, such that an interrupted
+    batch build may simply be run again. The cache entries of all regions are kept from
+    garbage collection during the build, so the cache may exceed its limit until the next
+    chart is created.
+
+    :param configs: List of Config objects or valid paths to .yaml config files, one per region.
+    :param workers: Optional number of worker processes, defaulting to the ingestion setting.
+    """
+    configs = [config if isinstance(config, Config) else Config(config) for config in configs]
+    groups: dict[tuple, list[Scope]] = {}
+    with cache.retaining():
+        for config in configs:
+            scope = Scope(config.settings)
+            if scope.type is MapFormat.S57:
+                with _shapefiles_in(paths.shapefiles):
+                    ENC(config)
+                continue
+            key = scope.type, tuple(sorted(str(Path(resource).resolve()) for resource in scope.resources))
+            groups.setdefault(key, []).append(scope)
+        for scopes in groups.values():
+            _build_group(scopes, workers)
+
+
+def _build_group(scopes: list[Scope], workers: int | None) -> None:
+    """
+    Builds the regions reading the same resources in a single scan of their sources.
+
+    :param scopes: List of Scope objects of the regions.
+    :param workers: Optional number of worker processes.
+    """
+    start_time = time.time()
+    boxes = [scope.extent.bbox for scope in scopes]
+    bounding_box = (
+        min(box[0] for box in boxes), min(box[1] for box in boxes),
+        max(box[2] for box in boxes), max(box[3] for box in boxes),
+    )
+    scanner = _parser(scopes[0], bounding_box)
+    pending, directories = [], set()
+    for scope in scopes:
+        parser = _parser(scope, scope.extent.bbox)
+        parser.catalogue = scanner.catalogue
+        directory = files.cache_entry(scope, parser)
+        regions_list = MapData(scope, parser).featured_regions
+        if directory in directories:
+            continue
+        directories.add(directory)
+        if not _is_built(parser, regions_list, directory):
+            pending.append((parser, regions_list, directory))
+    print(f"INFO: Building {len(pending)} of {len(scopes)} regions in a single scan.\n")
+    if not pending:
+        return
+
+    labelled: dict[str, Layer] = {}
+    for _, regions_list, _ in pending:
+        for regions in regions_list:
+            labelled.setdefault(regions.label, regions)
+    scanned = scanner.scan_regions([parser.bounding_box for parser, _, _ in pending], list(labelled.values()))
+    build_args = [(*task, geometries) for task, geometries in zip(pending, scanned)]
+    workers = min(workers or scanner.ingestion.workers, len(build_args))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_build_region, *zip(*build_args), [True] * len(build_args)))
+    else:
+        for args in build_args:
+            _build_region(*args)
+    end_time = round(time.time() - start_time, 1)
+    print(f"\rSaved {len(pending)} regions to shapefiles in {end_time} s.\n")
+
+
+def _parser(scope: Scope, bounding_box: tuple[int, int, int, int]) -> FGDBParser:
+    """
+    Creates the parser of a region for the given bounding box.
+
+    :param scope: Scope object of the region.
+    :param bounding_box: Bounding box to be read by the parser.
+    :return: An FGDBParser, or a GPKGParser for GeoPackage and FlatGeobuf resources.
+    """
+    parser_class = GPKGParser if scope.type is MapFormat.GPKG else FGDBParser
+    return parser_class(bounding_box, scope.resources, scope.ingestion)
+
+
+class _shapefiles_in:
+    """
+    Context manager pointing the shapefile cache to the directory of a region, and back.
+
+    :param directory: Path to the shapefile cache directory of the region.
+    """
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def __enter__(self):
+        self.previous, paths.shapefiles = paths.shapefiles, self.directory
+
+    def __exit__(self, *_):
+        paths.shapefiles = self.previous
+
+
+def _build_region(parser: FGDBParser, regions_list: list[Layer], directory: Path,
+                  geometries: dict[str, list[Any]], serial: bool = False) -> None:
+    """
+    Finishes the scanned geometries of a region and writes them to its shapefile cache,
+    as a worker process task.
+
+    :param parser: Parser of the region.
+    :param regions_list: List of Layer objects of the region.
+    :param directory: Path to the shapefile cache directory of the region.
+    :param geometries: Dictionary mapping region labels to lists of scanned geometries.
+    :param serial: Whether to finish the layers of the region without further processes.
+    """
+    if serial:
+        parser.ingestion.workers = 1
+        parser.union_engine = parser.union_engine.serial()
+    _link_seabeds(parser, regions_list)
+    (directory / _BUILD_RECORD).unlink(missing_ok=True)
+    with _shapefiles_in(directory):
+        parser.discard_layers(regions_list)
+        jobs = parser.parse_scanned_regions(regions_list, geometries)
+        parser.write_topology(jobs)
+        parser.write_mapped_cache(jobs)
+    _record_build(directory, regions_list, jobs)
+    print(f"\rSaved {len(jobs)} layers of {directory.name} to shapefiles.")
+
+
+def _link_seabeds(parser: FGDBParser, regions_list: list[Layer]) -> None:
+    """
+    Links each seabed of a region to the next deeper one, as in MapData, if the parser
+    stores seabeds as depth bands. Pickled seabeds lose their links when sent to a worker
+    process, such that their cumulative areas would otherwise be written as bands.
+
+    :param parser: Parser of the region.
+    :param regions_list: List of Layer objects of the region.
+    """
+    if not parser.cumulative_depths:
+        return
+    seabeds = sorted((r for r in regions_list if isinstance(r, Seabed)), key=lambda seabed: seabed.depth)
+    for seabed, deeper in zip(seabeds, seabeds[1:]):
+        seabed.deeper = deeper
+
+
+def _is_built(parser: FGDBParser, regions_list: list[Layer], directory: Path) -> bool:
+    """
+    Checks whether the last build of a region completed for all of its layers, with every
+    written layer still complete. Layers without geometries in the region are not written.
+
+    :param parser: Parser of the region.
+    :param regions_list: List of Layer objects of the region.
+    :param directory: Path to the shapefile cache directory of the region.
+    :return: True if the region need not be built again.
+    """
+    record_path = directory / _BUILD_RECORD
+    if not record_path.exists():
+        return False
+    try:
+        with open(record_path) as record_file:
+            record = json.load(record_file)
+        layers, written = set(record["layers"]), set(record["written"])
+    except (ValueError, KeyError):
+        return False
+    if not {regions.label for regions in regions_list} <= layers:
+        return False
+    with _shapefiles_in(directory):
+        return not parser.incomplete_layers([r for r in regions_list if r.label in written])
+
+
+def _record_build(directory: Path, regions_list: list[Layer], written: list[Layer]) -> None:
+    """
+    Records the completed build of a region or shard atomically, through a temporary file
+    that is then renamed.
+
+    :param directory: Path to the shapefile cache directory that was built.
+    :param regions_list: List of Layer objects that were built.
+    :param written: List of the Layer objects written, i.e. those with geometries.
+    """
+    record_path = directory / _BUILD_RECORD
+    temporary_path = record_path.with_name(record_path.name + ".tmp")
+    with open(temporary_path, "w") as record_file:
+        json.dump(dict(layers=[regions.label for regions in regions_list],
+                       written=[regions.label for regions in written]), record_file, indent=2)
+    os.replace(temporary_path, record_path)
+
+
+def _written_layers(directory: Path) -> list[str]:
+    """
+    Returns the labels of the layers written by the last complete build of a directory.
+
+    :param directory: Path to a shapefile cache directory with a build record.
+    :return: List of layer labels.
+    """
+    with open(directory / _BUILD_RECORD) as record_file:
+        return json.load(record_file)["written"]
+
+
+def plan_shards(
+        config: Config | Path | str,
+        directory: Path | str,
+        columns: int = 2,
+        rows: int = 2,
+        split_layers: bool = True,
+) -> Path:
+    """
+    Splits the build of a chart into independent shards, written to a plan in a directory
+    shared by the machines running them. Each shard builds a tile of the bounding box of
+    the chart, for one group of layers (land, shore or seabed, or all layers together).
+    Seabed layers always share a shard, as their depth bands are derived from each other.
+
+    :param config: Config object or a valid path to a .yaml config file of an FGDB,
+        GeoPackage or FlatGeobuf chart.
+    :param directory: Path to the shared directory of the plan and the shard outputs.
+    :param columns: Number of tiles along the x-axis of the bounding box.
+    :param rows: Number of tiles along the y-axis of the bounding box.
+    :param split_layers: Whether the land, shore and seabed layers are built by separate shards.
+    :return: Path to the written plan file.
+    """
+    config = config if isinstance(config, Config) else Config(config)
+    settings = json.loads(json.dumps(config.settings))
+    settings["enc"]["resources"] = [str(Path(r).resolve()) for r in settings["enc"]["resources"]]
+    scope = Scope(settings)
+    if scope.type is MapFormat.S57:
+        raise ValueError("Sharded builds support FGDB, GeoPackage and FlatGeobuf resources.")
+    regions_list = _merge_layers(scope)
+    if split_layers:
+        groups = [[r.label for r in regions_list if isinstance(r, kind)] for kind in (Land, Shore, Seabed)]
+    else:
+        groups = [[r.label for r in regions_list]]
+    x_min, y_min, x_max, y_max = scope.extent.bbox
+    xs = sorted({x_min + (x_max - x_min) * i // columns for i in range(columns + 1)})
+    ys = sorted({y_min + (y_max - y_min) * j // rows for j in range(rows + 1)})
+    tiles = [(x0, y0, x1, y1) for y0, y1 in zip(ys, ys[1:]) for x0, x1 in zip(xs, xs[1:])]
+    shards = [
+        dict(id=f"shard{i:04d}", bbox=tile, layers=group)
+        for i, (tile, group) in enumerate((tile, group) for tile in tiles for group in groups if group)
+    ]
+    directory = Path(directory).resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+    plan_path = directory / "plan.json"
+    with open(plan_path, "w") as plan_file:
+        json.dump(dict(version=_PLAN_VERSION, settings=settings, shards=shards), plan_file, indent=2)
+    print(f"INFO: Planned {len(shards)} shards of {len(tiles)} tiles in {plan_path}.\n")
+    return plan_path
+
+
+def run_shards(plan_path: Path | str, shard_ids: list[str] | None = None) -> list[str]:
+    """
+    Runs shards of a plan, writing the outputs of each shard to its directory next to the
+    plan. Without given shards, the shards not built or claimed yet are claimed one at a
+    time and run, such that any number of machines sharing the plan directory may run
+    this until no shards remain. A given shard is run even if claimed, e.g. by a worker
+    that stopped, unless it was built completely.
+
+    :param plan_path: Path to a plan written by plan_shards.
+    :param shard_ids: Optional list of ids of the shards to be run.
+    :return: List of the ids of the shards run.
+    """
+    plan_path = Path(plan_path)
+    plan = _read_plan(plan_path)
+    scope = Scope(plan["settings"])
+    area = scope.extent.area / _box_area(scope.extent.bbox)
+    run = []
+    for shard in plan["shards"]:
+        if shard_ids is not None and shard["id"] not in shard_ids:
+            continue
+        bounding_box = tuple(shard["bbox"])
+        parser = _parser(scope, bounding_box)
+        directory = plan_path.parent / shard["id"]
+        regions_list = [r for r in MapData(scope, parser).featured_regions if r.label in shard["layers"]]
+        for regions in regions_list:
+            (directory / regions.label).mkdir(parents=True, exist_ok=True)
+        if _is_built(parser, regions_list, directory):
+            continue
+        if shard_ids is None and not _claim(directory):
+            continue
+        print(f"INFO: Running {shard['id']} of {len(plan['shards'])} shards.\n")
+        (directory / _BUILD_RECORD).unlink(missing_ok=True)
+        with _shapefiles_in(directory):
+            parser.discard_layers(regions_list)
+            parser.parse_resources(regions_list, scope.resources, area * _box_area(bounding_box))
+        _record_build(directory, regions_list, [r for r in regions_list if r.is_loaded])
+        run.append(shard["id"])
+    return run
+
+
+def merge_shards(plan_path: Path | str) -> None:
+    """
+    Merges the outputs of all shards of a plan into the shapefile cache of its chart, from
+    which the chart is then created by ENC with the planned configuration.
+
+    :param plan_path: Path to a plan written by plan_shards, with all shards built.
+    """
+    plan_path = Path(plan_path)
+    plan = _read_plan(plan_path)
+    scope = Scope(plan["settings"])
+    parser = _parser(scope, scope.extent.bbox)
+    regions_list = _merge_layers(scope)
+    missing = []
+    for shard in plan["shards"]:
+        shard_regions = [r for r in regions_list if r.label in shard["layers"]]
+        if not _is_built(parser, shard_regions, plan_path.parent / shard["id"]):
+            missing.append(shard["id"])
+    if missing:
+        raise ValueError(f"Shards not built yet: {', '.join(missing)}")
+
+    start_time = time.time()
+    for regions in regions_list:
+        geometries = []
+        for shard in plan["shards"]:
+            directory = plan_path.parent / shard["id"]
+            if regions.label not in _written_layers(directory):
+                continue
+            regions.geometry = geo.MultiPolygon()
+            with _shapefiles_in(directory):
+                parser.load_shapefiles(regions)
+            geometry = polygonal_parts(regions.geometry)
+            if not geometry.is_empty:
+                geometries.append(geometry)
+        merged = parser.union_engine.union_coverage(geometries) if geometries else geo.MultiPolygon()
+        regions.geometry = polygonal_parts(merged)
+        regions.records = None
+
+    written = [regions for regions in regions_list if regions.is_loaded]
+    directory = files.cache_entry(scope, parser)
+    with _shapefiles_in(directory):
+        parser.discard_layers(regions_list)
+        parser.write_regions(written)
+        parser.write_topology(written)
+        parser.write_mapped_cache(written)
+    end_time = round(time.time() - start_time, 1)
+    print(f"\rMerged {len(plan['shards'])} shards into {len(written)} layers in {end_time} s.\n")
+
+
+def _merge_layers(scope: Scope) -> list[Layer]:
+    """
+    Creates the featured map layers of a chart, unlinked such that the geometry of each
+    seabed is its depth band, as built by shards.
+
+    :param scope: Scope object of the chart.
+    :return: List of Layer objects.
+    """
+    layers = [Land(), Shore(), *(Seabed(depth=d) for d in scope.depths)]
+    return [layer for layer in layers if layer.label in scope.features]
+
+
+def _read_plan(plan_path: Path) -> dict:
+    """
+    Reads a plan written by plan_shards.
+
+    :param plan_path: Path to the plan file.
+    :return: Dictionary of the plan, with its 'settings' and 'shards'.
+    """
+    with open(plan_path) as plan_file:
+        plan = json.load(plan_file)
+    if plan.get("version") != _PLAN_VERSION:
+        raise ValueError(f"Unsupported shard plan version in {plan_path}.")
+    return plan
+
+
+def _claim(directory: Path) -> bool:
+    """
+    Claims a shard for this worker by creating its claim file, which fails if another
+    worker created it first, also on shared file systems.
+
+    :param directory: Path to the output directory of the shard.
+    :return: True if the shard was claimed by this worker.
+    """
+    try:
+        descriptor = os.open(directory / _CLAIM, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(descriptor, "w") as claim_file:
+        claim_file.write(f"{socket.gethostname()} {os.getpid()}\n")
+    return True
+
+
+def _box_area(bounding_box: tuple[int, int, int, int]) -> float:
+    """
+    Computes the area of a bounding box.
+
+    :param bounding_box: Bounding box as (x_min, y_min, x_max, y_max).
+    :return: The area, in units of the coordinate reference system squared.
+    """
+    return (bounding_box[2] - bounding_box[0]) * (bounding_box[3] - bounding_box[1])
@@ -4,7 +4,9 @@ Contains core classes and functions used throughout the SeaCharts package.
 from . import files
 from . import paths
 from .config import Config
+from .ingestion import Ingestion
 from .parser import DataParser
 from .parserFGDB import FGDBParser
+from .parserGPKG import GPKGParser
 from .parserS57 import S57Parser
 from .scope import Scope, MapFormat
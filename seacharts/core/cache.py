@@ -0,0 +1,153 @@
+"""
+Contains functions for the content-addressed shapefile cache, where each entry holds the
+layers of a chart and is keyed on the inputs they were built from.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from .parser import DataParser
+
+if TYPE_CHECKING:
+    from .scope import Scope
+
+# Name of the file recording the inputs and the last use of a cache entry
+_ENTRY_RECORD = "entry.json"
+
+# Number of hexadecimal digits of the input hash naming a cache entry
+_KEY_LENGTH = 16
+
+# Seconds since the last use or write of a cache entry during which it is kept from garbage
+# collection, as it may be in use by another process (e.g. a parallel build)
+_GRACE_PERIOD = 3600
+
+# Cache entries used within the active retaining context, kept from garbage collection
+_retained: set[Path] | None = None
+
+
+def cache_inputs(scope: "Scope", parser: DataParser) -> dict:
+    """
+    Collects the inputs that the layers of a chart are built from: the identities of the
+    sources within its bounding box, the bounding box, the coordinate reference system, the
+    attribute filters of extra layers, and the precision and simplification settings.
+
+    Depth bins are an input of parsers storing seabeds as depth bands, as each band depends
+    on the next depth. S-57 seabeds only depend on their own depth, and changed depth bins
+    are re-binned from the cached depth areas instead. Layers are cached as separate files,
+    such that layers added to a chart are parsed without invalidating the others.
+
+    :param scope: Scope object of the chart.
+    :param parser: DataParser of the chart.
+    :return: Dictionary of the inputs, serializable as JSON.
+    """
+    return dict(
+        sources=parser.source_identities(),
+        bbox=list(scope.extent.bbox),
+        crs=scope.settings["enc"].get("crs"),
+        depths=sorted(scope.depths) if parser.cumulative_depths else None,
+        filters=scope.extra_layer_filters,
+        precision=scope.ingestion.precision,
+        simplification=scope.ingestion.simplification,
+    )
+
+
+def cache_key(inputs: dict) -> str:
+    """
+    Hashes the inputs of a chart into the key of its cache entry.
+
+    :param inputs: Dictionary of inputs returned by cache_inputs.
+    :return: Hexadecimal key.
+    """
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:_KEY_LENGTH]
+
+
+def use_entry(directory: Path, inputs: dict) -> None:
+    """
+    Records the inputs and the time of use of a cache entry, atomically through a temporary
+    file that is then renamed. Within a retaining context, the entry is kept from garbage
+    collection until the context exits.
+
+    :param directory: Path to the cache entry directory.
+    :param inputs: Dictionary of the inputs the entry is keyed on.
+    """
+    if _retained is not None:
+        _retained.add(directory)
+    record_path = directory / _ENTRY_RECORD
+    temporary_path = record_path.with_name(f"{record_path.name}.{os.getpid()}.tmp")
+    with open(temporary_path, "w") as record_file:
+        json.dump(dict(used=time.time(), inputs=inputs), record_file, indent=2, default=str)
+    os.replace(temporary_path, record_path)
+
+
+def collect_garbage(root: Path, limit: int | None, keep: set[Path]) -> None:
+    """
+    Removes the least recently used cache entries until the entries take at most the given
+    size. The entries in use, and those used within the active retaining context, are
+    always kept, as are entries used or written within the grace period, which may be in
+    use by other processes. Directories that are not cache entries (e.g. caches written by
+    older versions) are left alone.
+
+    :param root: Path to the directory holding the cache entries.
+    :param limit: Size limit of the cache in megabytes, or None for no limit.
+    :param keep: Set of paths to the cache entries in use.
+    """
+    if limit is None or not root.exists():
+        return
+    keep = {directory for directory in keep | (_retained or set()) if directory.parent == root}
+    entries, total = [], sum(_usage(directory)[0] for directory in keep)
+    for directory in root.iterdir():
+        record_path = directory / _ENTRY_RECORD
+        if directory in keep or not record_path.exists():
+            continue
+        try:
+            with open(record_path) as record_file:
+                used = float(json.load(record_file)["used"])
+        except (ValueError, KeyError):
+            used = 0.0
+        size, modified = _usage(directory)
+        total += size
+        if time.time() - max(used, modified) < _GRACE_PERIOD:
+            continue
+        entries.append((used, size, directory))
+    for used, size, directory in sorted(entries):
+        if total <= limit * 1e6:
+            break
+        shutil.rmtree(directory, ignore_errors=True)
+        total -= size
+        print(f"INFO: Removed least recently used cache entry {directory.name}.")
+
+
+@contextmanager
+def retaining() -> Iterator[None]:
+    """
+    Keeps every cache entry used within the context from garbage collection, such that e.g.
+    the entries of a batch build are not removed while later regions are built. Nested
+    contexts share the entries of the outermost one.
+    """
+    global _retained
+    previous = _retained
+    if _retained is None:
+        _retained = set()
+    try:
+        yield
+    finally:
+        _retained = previous
+
+
+def _usage(directory: Path) -> tuple[int, float]:
+    """
+    Sums the sizes of the files in a directory tree, and finds when any of them was last written.
+
+    :param directory: Path to the directory.
+    :return: Tuple of the total size in bytes and the latest modification time in seconds.
+    """
+    if not directory.exists():
+        return 0, 0.0
+    stats = [path.stat() for path in directory.rglob("*") if path.is_file()]
+    return sum(stat.st_size for stat in stats), max((stat.st_mtime for stat in stats), default=0.0)
@@ -0,0 +1,113 @@
+"""
+Contains functions for reading S-57 exchange set catalogues (CATALOG.031), update files
+and cell usage bands.
+"""
+import csv
+from pathlib import Path
+
+from .iso8211 import read_records
+
+CATALOG_NAME = "CATALOG.031"
+
+# Navigational purposes (usage bands) of ENC cells, by the largest scale denominator they serve
+USAGE_BANDS = {
+    1: None,       # overview
+    2: 1500000,    # general
+    3: 350000,     # coastal
+    4: 90000,      # approach
+    5: 22000,      # harbour
+    6: 4000,       # berthing
+}
+
+
+def cell_usage_band(cell_path: Path) -> int:
+    """
+    Returns the usage band of an ENC cell, given by the third character of its file name.
+
+    :param cell_path: Path to the S-57 cell file, e.g. 'US5FL11M.000'.
+    :return: Usage band from 1 (overview) to 6 (berthing), or 0 if the name has no usage band.
+    """
+    band = cell_path.stem[2:3]
+    return int(band) if band.isdigit() and int(band) in USAGE_BANDS else 0
+
+
+def scale_usage_band(scale: int) -> int:
+    """
+    Returns the most detailed usage band needed to display charts at the given scale.
+
+    :param scale: Display scale denominator, e.g. 50000 for 1:50 000.
+    :return: Usage band from 1 (overview) to 6 (berthing).
+    """
+    band = 1
+    for usage_band, denominator in USAGE_BANDS.items():
+        if denominator is not None and scale < denominator:
+            band = usage_band
+    return band
+
+
+def read_cell_bounds(catalog_path: Path) -> dict[Path, tuple[float, float, float, float]]:
+    """
+    Reads the geographic bounds of every data set file listed in a S-57 exchange set catalogue.
+
+    Files without bounds in the catalogue (e.g. text or picture files) are left out.
+
+    :param catalog_path: Path to the CATALOG.031 file.
+    :return: Dictionary mapping resolved file paths to bounds as (west, south, east, north).
+    """
+    bounds = {}
+    root = catalog_path.parent
+    entries = [values for fields in read_records(catalog_path) for tag, values in fields if tag == "CATD"]
+    for record in entries:
+        try:
+            west, south = float(record["WLON"]), float(record["SLAT"])
+            east, north = float(record["ELON"]), float(record["NLAT"])
+        except (KeyError, ValueError):
+            continue
+        file_path = root / record.get("FILE", "").replace("\\", "/")
+        bounds[file_path.resolve()] = west, south, east, north
+    return bounds
+
+
+def cell_updates(cell_path: Path) -> list[tuple[int, Path]]:
+    """
+    Finds the sequential update files (.001, .002, ...) of a S-57 base cell (.000).
+
+    :param cell_path: Path to the S-57 base cell file.
+    :return: Sorted list of (update number, path) pairs of the update files.
+    """
+    updates = []
+    for path in cell_path.parent.glob(cell_path.stem + ".*"):
+        number = path.suffix[1:]
+        if number.isdigit() and int(number) > 0:
+            updates.append((int(number), path))
+    return sorted(updates)
+
+
+def read_update_changes(update_path: Path) -> tuple[set[int], set[tuple[int, int]]]:
+    """
+    Reads which feature object classes and spatial (vector) records a S-57 update file changes.
+
+    :param update_path: Path to the S-57 update file.
+    :return: Tuple of the set of object class codes (OBJL) of inserted, deleted or modified
+             feature records, and the set of (RCNM, RCID) identifiers of changed vector records.
+    """
+    object_classes, vectors = set(), set()
+    for fields in read_records(update_path):
+        for tag, values in fields:
+            if tag == "FRID" and "OBJL" in values:
+                object_classes.add(values["OBJL"])
+            elif tag == "VRID" and "RCID" in values:
+                vectors.add((values["RCNM"], values["RCID"]))
+    return object_classes, vectors
+
+
+def read_object_classes(csv_path: Path) -> dict[int, str]:
+    """
+    Reads the S-57 object class codes and acronyms from the GDAL 's57objectclasses.csv' file.
+
+    :param csv_path: Path to the object classes CSV file.
+    :return: Dictionary mapping object class codes (OBJL) to acronyms, e.g. 42 to "DEPARE".
+    """
+    with open(csv_path, encoding="latin-1") as csv_file:
+        reader = csv.DictReader(csv_file)
+        return {int(row["Code"]): row["Acronym"] for row in reader if row.get("Code", "").isdigit()}
@@ -0,0 +1,136 @@
+"""
+Contains functions for storing layers in compressed columnar GeoParquet or Arrow IPC files.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyproj
+import shapely
+
+try:  # optional columnar layer cache, written and read through Arrow
+    import pyarrow
+    from pyarrow import feather, parquet
+except ImportError:
+    pyarrow = None
+
+from seacharts.core.records import RecordTable
+
+# File suffixes of the columnar cache formats
+COLUMNAR_SUFFIXES = {"parquet": ".parquet", "feather": ".arrow"}
+
+# Version of the GeoParquet metadata written to the files
+_GEOPARQUET_VERSION = "1.0.0"
+
+# Names of the geometry column and of the column flagging the merged geometry of the layer
+_GEOMETRY = "geometry"
+_MERGED = "_merged"
+
+
+def columnar_available() -> bool:
+    """
+    Checks whether columnar layer files can be written and read, which requires pyarrow.
+
+    :return: True if pyarrow is installed, otherwise False.
+    """
+    return pyarrow is not None
+
+
+def write_columnar(
+        path: Path,
+        geometries: list[Any],
+        properties: dict[str, list],
+        merged: Any | None = None,
+        schema: dict | None = None,
+        crs: str | None = None,
+) -> None:
+    """
+    Writes geometries as WKB together with their attributes to a zstd-compressed GeoParquet
+    (.parquet) or Arrow IPC (.arrow) file, through a temporary file that is then renamed.
+    The merged geometry of the layer, if given, is stored as an extra row flagged in the
+    '_merged' column, such that loading the layer needs no union.
+
+    :param path: Path of the file to be written, whose suffix selects the format.
+    :param geometries: List of Shapely geometries, one for each record.
+    :param properties: Dictionary mapping attribute names to lists of values.
+    :param merged: Optional merged geometry of the layer.
+    :param schema: Optional shapefile schema of the records, kept in the file metadata.
+    :param crs: Optional coordinate reference system of the geometries, e.g. "EPSG:25833".
+    """
+    rows = [*geometries, *([merged] if merged is not None else [])]
+    padding = [None] * (len(rows) - len(geometries))
+    columns = {name: _column([*values, *padding]) for name, values in properties.items()}
+    columns[_GEOMETRY] = pyarrow.array(shapely.to_wkb(np.asarray(rows, dtype=object)), pyarrow.binary())
+    columns[_MERGED] = pyarrow.array([False] * len(geometries) + [True] * len(padding))
+    geometry_types = sorted({geometry.geom_type for geometry in rows if geometry is not None})
+    column_metadata = dict(encoding="WKB", geometry_types=geometry_types)
+    if crs is not None:
+        column_metadata["crs"] = pyproj.CRS.from_user_input(crs).to_json_dict()
+    metadata = {
+        b"geo": json.dumps(dict(
+            version=_GEOPARQUET_VERSION, primary_column=_GEOMETRY, columns={_GEOMETRY: column_metadata}
+        )),
+        b"seacharts": json.dumps(dict(schema=schema)),
+    }
+    table = pyarrow.table(columns).replace_schema_metadata(metadata)
+    temporary_path = path.with_name(path.name + ".tmp")
+    if path.suffix == COLUMNAR_SUFFIXES["parquet"]:
+        parquet.write_table(table, temporary_path, compression="zstd")
+    else:
+        feather.write_feather(table, temporary_path, compression="zstd")
+    os.replace(temporary_path, path)
+
+
+def read_columnar(path: Path, bounding_box: tuple[int, int, int, int] | None = None) -> tuple[RecordTable, Any]:
+    """
+    Reads geometries and their attributes from a columnar layer file, decoding all WKB
+    geometries at once.
+
+    :param path: Path to the columnar layer file.
+    :param bounding_box: Optional bounding box, where only intersecting records are kept.
+    :return: Tuple of a RecordTable of the records, and the merged geometry of the layer or None.
+    """
+    if path.suffix == COLUMNAR_SUFFIXES["parquet"]:
+        table = parquet.read_table(path)
+    else:
+        table = feather.read_table(path, memory_map=True)
+    flags = table.column(_MERGED).to_numpy(zero_copy_only=False).astype(bool)
+    geometries = shapely.from_wkb(table.column(_GEOMETRY).to_numpy(zero_copy_only=False))
+    merged = geometries[flags][0] if flags.any() else None
+    keep = ~flags
+    if bounding_box is not None:
+        keep &= shapely.intersects(geometries, shapely.box(*bounding_box))
+    properties = {
+        name: [value for value, k in zip(table.column(name).to_pylist(), keep) if k]
+        for name in table.column_names if name not in (_GEOMETRY, _MERGED)
+    }
+    return RecordTable(geometries[keep], properties), merged
+
+
+def read_columnar_schema(path: Path) -> dict | None:
+    """
+    Reads the shapefile schema of the records kept in the metadata of a columnar layer file.
+
+    :param path: Path to the columnar layer file.
+    :return: The schema with its 'geometry' type and 'properties', or None if not kept.
+    """
+    if path.suffix == COLUMNAR_SUFFIXES["parquet"]:
+        metadata = parquet.read_schema(path).metadata
+    else:
+        metadata = feather.read_table(path, memory_map=True).schema.metadata
+    return json.loads(metadata[b"seacharts"])["schema"]
+
+
+def _column(values: list) -> Any:
+    """
+    Converts attribute values to an Arrow array, storing values of mixed types as text.
+
+    :param values: List of attribute values, where None is a missing value.
+    :return: An Arrow array of the values.
+    """
+    try:
+        return pyarrow.array(values)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        return pyarrow.array([None if value is None else str(value) for value in values])
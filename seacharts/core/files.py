@@ -4,11 +4,16 @@ Contains utility functions related to system files and directories.
 import csv
 from collections.abc import Generator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from seacharts.core.parser import DataParser
 
+from . import cache
 from . import paths
 
+if TYPE_CHECKING:
+    from .scope import Scope
+
 
 def verify_directory_exists(path_string: str) -> None:
     """
@@ -25,29 +30,46 @@ def verify_directory_exists(path_string: str) -> None:
         print(f"WARNING: {path_type} database path '{path}' not found.\n")
 
 
-def build_directory_structure(features: list[str], resources: list[str], parser: DataParser) -> None:
+def cache_entry(scope: "Scope", parser: DataParser) -> Path:
     """
-    Creates the directory structure for shapefiles and outputs based on the provided features 
-    and resources.
-
-    :param features: A list of feature names for which directories will be created.
-    :param resources: A list of resource paths to validate and create directories for.
-    :param parser: An instance of DataParser used to get the source root name.
+    Prepares the entry of the content-addressed shapefile cache holding the layers of a
+    chart, named after the hash of the inputs they are built from (see cache.cache_inputs)
+    under the source root of the resources, and optionally prefixed by the cache name of
+    the chart. The layer directories of the entry are created and its use is recorded,
+    while the least recently used entries beyond the cache limit are removed.
+
+    :param scope: Scope object of the chart.
+    :param parser: An instance of DataParser used to get the source root name and sources.
+    :return: Path to the cache entry directory.
     """
     map_dir_name = parser.get_source_root_name()
     if map_dir_name is None:
         raise ValueError("Cannot build directory structure: source root name is None.")
-    paths.shapefiles.mkdir(exist_ok=True)
-    paths.shapefiles =  paths.shapefiles / map_dir_name
+    inputs = cache.cache_inputs(scope, parser)
+    key = cache.cache_key(inputs)
+    directory = paths.shapefiles / map_dir_name / (f"{scope.cache}-{key}" if scope.cache else key)
+    for feature in scope.features:
+        (directory / feature.lower()).mkdir(parents=True, exist_ok=True)
+    cache.use_entry(directory, inputs)
+    cache.collect_garbage(directory.parent, scope.ingestion.cache_limit, keep={directory})
+    return directory
+
+
+def build_directory_structure(scope: "Scope", parser: DataParser) -> None:
+    """
+    Creates the directory structure for shapefiles and outputs based on the features and
+    resources of the given scope, where shapefiles are kept in the cache entry of the chart.
+
+    :param scope: Scope object holding the features and resources of the chart.
+    :param parser: An instance of DataParser used to get the source root name and sources.
+    """
+    paths.shapefiles.mkdir(parents=True, exist_ok=True)
+    paths.shapefiles = cache_entry(scope, parser)
     paths.output.mkdir(exist_ok=True)
-    paths.shapefiles.mkdir(exist_ok=True)
 
-    for feature in features:
-        shapefile_dir = paths.shapefiles / feature.lower()
-        shapefile_dir.mkdir(parents=True, exist_ok=True)
-    for resource in resources:
+    for resource in scope.resources:
         path = Path(resource).resolve()
-        if path.suffix not in [".gdb", ".000"]:
+        if path.suffix not in [".gdb", ".000", ".gpkg", ".fgb"]:
             path.mkdir(exist_ok=True)
 
 
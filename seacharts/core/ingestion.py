@@ -0,0 +1,95 @@
+"""
+Contains the Ingestion class for settings controlling how spatial data resources are parsed.
+"""
+
+
+class Ingestion:
+    """
+    Ingestion class holding the settings that control how spatial data resources are
+    parsed into layers and shapefiles. Every setting is optional and falls back to a
+    default when it is not given in the configuration.
+
+    :param settings: Dictionary of ingestion settings from the ENC configuration.
+    """
+    def __init__(self, settings: dict | None = None):
+        """
+        Initializes the Ingestion object from the 'ingestion' section of the ENC settings.
+
+        :param settings: Dictionary of ingestion settings, or None for defaults.
+        """
+        settings = settings or {}
+
+        # Read S-57 cells in-process through GDAL/OGR instead of ogr2ogr subprocesses, if the
+        # GDAL Python bindings (osgeo) are installed
+        self.in_process: bool = settings.get("in_process", True)
+
+        # Read all depth areas once and assign them to depth bins in a single pass
+        self.single_pass_depths: bool = settings.get("single_pass_depths", True)
+
+        # Number of worker processes used for parallel reading and merging, where the
+        # default of 1 keeps all work in the calling process
+        self.workers: int = settings.get("workers", 1)
+
+        # Keep only the best-scale S-57 cell for each part of the bounding box
+        self.best_scale: bool = settings.get("best_scale", False)
+
+        # Optional display scale denominator limiting the usage bands of selected cells
+        self.display_scale: int | None = settings.get("display_scale", None)
+
+        # Read each FGDB layer once and dispatch its records to every map layer using it
+        self.single_scan: bool = settings.get("single_scan", True)
+
+        # Number of worker processes uniting spatial partitions of large layers
+        self.union_workers: int = settings.get("union_workers", self.workers)
+
+        # Optional memory ceiling in megabytes for the partitions united at the same time
+        self.union_memory: int | None = settings.get("union_memory", None)
+
+        # Merge seabed depth areas with a coverage union, after validating ('validate', which
+        # requires shapely 2.1 or later), assuming ('trust') that they form a coverage, or not
+        # at all ('off')
+        self.coverage_union: str = settings.get("coverage_union", "validate")
+
+        # Stream FGDB records in chunks merged per spatial tile, keeping memory bounded
+        self.streaming: bool = settings.get("streaming", False)
+
+        # Number of records read at a time when streaming
+        self.chunk_size: int = settings.get("chunk_size", 10000)
+
+        # Side length of the spatial tiles used when streaming, in units of the map CRS
+        self.tile_size: int = settings.get("tile_size", 10000)
+
+        # Optional memory limit in megabytes for partial tile unions, spilled to disk beyond it
+        self.memory_limit: int | None = settings.get("memory_limit", None)
+
+        # Read whole layers as Arrow tables through pyogrio ('arrow'), if installed,
+        # or record by record through fiona ('fiona')
+        self.reader: str = settings.get("reader", "arrow")
+
+        # Topology-preserving simplification tolerances by layer ('land', 'shore', 'seabed',
+        # extra layer names or 'default'), in units of the map CRS, where 0 keeps all vertices
+        self.simplification: dict[str, float] = settings.get("simplification", {})
+
+        # Optional precision grid size in units of the map CRS, e.g. 0.01, snapping coordinates
+        # at ingest, which the 'quantized' cache format stores layers on
+        self.precision: float | None = settings.get("precision", None)
+
+        # Format of the layer cache: compressed columnar GeoParquet ('parquet') or Arrow IPC
+        # ('feather') files holding the merged layer geometries, which require pyarrow, files
+        # of integer offsets on the precision grid ('quantized'), which require a precision,
+        # a shared-edge topology file of the polygonal map layers ('topology'), where boundaries
+        # shared by adjacent layers (e.g. depth bands and land) are kept once as arcs and other
+        # layers are kept as shapefiles, or ESRI shapefiles ('shapefile')
+        self.cache_format: str = settings.get("cache_format", "shapefile")
+
+        # Store the merged geometries of map layers as flat arrays in a memory-mapped file,
+        # from which they are reconstructed without parsing when loaded
+        self.mapped: bool = settings.get("mapped", False)
+
+        # Verify the checksum of the memory-mapped geometry file when it is loaded, which
+        # reads the whole file instead of only the pages of the layers used
+        self.verify_mapped: bool = settings.get("verify_mapped", False)
+
+        # Optional size limit in megabytes of the shapefile cache, beyond which the least
+        # recently used cache entries of other charts are removed
+        self.cache_limit: int | None = settings.get("cache_limit", None)
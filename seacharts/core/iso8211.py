@@ -0,0 +1,120 @@
+"""
+Contains functions for reading ISO 8211 files, the encoding of S-57 cells, updates and catalogues.
+"""
+import re
+from collections.abc import Generator
+from pathlib import Path
+
+# ISO 8211 unit (subfield) and field terminators
+_UNIT_TERMINATOR = b"\x1f"
+_FIELD_TERMINATOR = b"\x1e"
+
+
+def read_records(file_path: Path) -> Generator[list[tuple[str, dict]], None, None]:
+    """
+    Reads the data records of an ISO 8211 file, decoding their fields into subfield values
+    as described by the data descriptive record (DDR). Fields with repeating subfield groups
+    or unsupported formats are left out.
+
+    :param file_path: Path to the ISO 8211 file.
+    :yield: List of (tag, dictionary of subfield labels to values) pairs for each data record.
+    """
+    records = _split_records(file_path.read_bytes())
+    ddr = next(records, None)
+    if ddr is None:
+        return
+    descriptions = _field_descriptions(ddr)
+    for fields in records:
+        decoded = []
+        for tag, field in fields:
+            if tag in descriptions:
+                labels, formats = descriptions[tag]
+                decoded.append((tag, dict(zip(labels, _split_subfields(field, formats)))))
+        yield decoded
+
+
+def _split_records(data: bytes) -> Generator[list[tuple[str, bytes]], None, None]:
+    """
+    Splits ISO 8211 data into records, each given as a list of (tag, field data) pairs.
+
+    :param data: Raw bytes of an ISO 8211 file.
+    :yield: List of (tag, field data) pairs for each record, starting with the DDR.
+    """
+    offset = 0
+    while offset + 24 <= len(data):
+        leader = data[offset:offset + 24]
+        record_length = int(leader[0:5])
+        base_address = int(leader[12:17])
+        size_length, size_position = int(leader[20:21]), int(leader[21:22])
+        size_tag = int(leader[23:24])
+        entry_size = size_tag + size_length + size_position
+        record = data[offset:offset + record_length]
+        directory = record[24:record.index(_FIELD_TERMINATOR, 24)]
+        fields = []
+        for i in range(0, len(directory) - entry_size + 1, entry_size):
+            entry = directory[i:i + entry_size]
+            tag = entry[:size_tag].decode("ascii")
+            length = int(entry[size_tag:size_tag + size_length])
+            position = int(entry[size_tag + size_length:])
+            start = base_address + position
+            fields.append((tag, record[start:start + length]))
+        yield fields
+        offset += record_length
+
+
+def _field_descriptions(ddr_fields: list[tuple[str, bytes]]) -> dict[str, tuple[list[str], list]]:
+    """
+    Reads the subfield labels and formats of every field described in a data descriptive record.
+
+    :param ddr_fields: List of (tag, field data) pairs of the DDR.
+    :return: Dictionary mapping field tags to subfield labels and formats.
+    """
+    descriptions = {}
+    for tag, field in ddr_fields:
+        parts = field.rstrip(_FIELD_TERMINATOR).split(_UNIT_TERMINATOR)
+        if len(parts) < 3 or parts[1].startswith(b"*"):
+            continue
+        labels = parts[1].decode("ascii").split("!")
+        formats = _format_controls(parts[2].decode("ascii"))
+        if len(labels) == len(formats):
+            descriptions[tag] = labels, formats
+    return descriptions
+
+
+def _format_controls(controls: str) -> list[tuple[str, int | None]]:
+    """
+    Expands ISO 8211 format controls, e.g. '(A(2),I(10),3A,b14)', into subfield formats.
+
+    :param controls: Format controls string of a field description.
+    :return: List of (type, width) pairs for each subfield, where the width is None for
+             delimited subfields, and given in bytes for binary ('b1' unsigned, 'b2' signed).
+    """
+    formats = []
+    for repeat, kind, width in re.findall(r"(\d*)(b[12]\d|[AIRS])(?:\((\d+)\))?", controls):
+        if kind.startswith("b"):
+            kind, width = kind[:2], kind[2]
+        formats.extend([(kind, int(width) if width else None)] * (int(repeat) if repeat else 1))
+    return formats
+
+
+def _split_subfields(field: bytes, formats: list[tuple[str, int | None]]) -> list[str | int]:
+    """
+    Splits the data of a field into its subfield values, using fixed widths or delimiters.
+
+    :param field: Raw field data.
+    :param formats: List of (type, width) pairs for each subfield.
+    :return: List of decoded subfield values, as integers for binary subfields.
+    """
+    values, position = [], 0
+    for kind, width in formats:
+        if width is None:
+            end = field.find(_UNIT_TERMINATOR, position)
+            end = len(field) if end < 0 else end
+            value, position = field[position:end], end + 1
+        else:
+            value, position = field[position:position + width], position + width
+        if kind in ("b1", "b2"):
+            values.append(int.from_bytes(value, "little", signed=kind == "b2"))
+        else:
+            values.append(value.rstrip(_FIELD_TERMINATOR).decode("latin-1").strip())
+    return values
@@ -9,8 +9,10 @@ class MapFormat(Enum):
 
     - FGDB: File Geodatabase format, used primarily in Esri's GIS software.
     - S57: IHO S-57 format, used for nautical chart data exchange.
+    - GPKG: GeoPackage or FlatGeobuf files with spatial indexes, holding FGDB layers.
 
     This enum can be used to specify the desired map format when working with spatial data.
     """
     FGDB = auto()
     S57 = auto()
+    GPKG = auto()
@@ -0,0 +1,102 @@
+"""
+Contains functions for storing merged layer geometries as flat arrays in a memory-mapped file.
+"""
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import shapely
+
+# Leading bytes identifying a memory-mapped geometry file
+_MAGIC = b"SCGEOM\x00\x00"
+
+# Version of the memory-mapped geometry format, stored in each header
+_FORMAT_VERSION = 2
+
+# Geometry types that may be stored, i.e. single types other than linear rings
+MAPPED_TYPES = (
+    shapely.GeometryType.POINT, shapely.GeometryType.LINESTRING, shapely.GeometryType.POLYGON,
+    shapely.GeometryType.MULTIPOINT, shapely.GeometryType.MULTILINESTRING, shapely.GeometryType.MULTIPOLYGON,
+)
+
+# Alignment in bytes of the header end and of every array in the file
+_ALIGNMENT = 8
+
+
+def write_mapped(path: Path, geometries: dict[str, Any]) -> None:
+    """
+    Writes the merged geometry of each layer as flat coordinate and offset arrays with its
+    geometry type and coordinate dimension, through a temporary file that is then renamed.
+    The file starts with a header locating the arrays of every layer, holding the size and
+    a checksum of the arrays.
+
+    :param path: Path of the file to be written.
+    :param geometries: Dictionary mapping layer labels to geometries of the MAPPED_TYPES.
+    """
+    layers, chunks, position = {}, [], 0
+    for label, geometry in geometries.items():
+        geometry_type, coordinates, offsets = shapely.to_ragged_array(np.asarray([geometry], dtype=object))
+        entry = dict(type=int(geometry_type), dimensions=int(coordinates.shape[1]), offsets=[])
+        for array in (coordinates, *offsets):
+            data = np.ascontiguousarray(array, dtype=np.float64 if array is coordinates else np.int64).tobytes()
+            span = [position, len(data)]
+            if array is coordinates:
+                entry["coordinates"] = span
+            else:
+                entry["offsets"].append(span)
+            chunks.append(data + bytes(-len(data) % _ALIGNMENT))
+            position += len(chunks[-1])
+        layers[label] = entry
+    body = b"".join(chunks)
+    header = dict(version=_FORMAT_VERSION, size=len(body), checksum=zlib.crc32(body), layers=layers)
+    header = json.dumps(header).encode()
+    header += b" " * (-(len(_MAGIC) + 8 + len(header)) % _ALIGNMENT)
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "wb") as file:
+        file.write(_MAGIC)
+        file.write(np.uint64(len(header)).tobytes())
+        file.write(header)
+        file.write(body)
+    os.replace(temporary_path, path)
+
+
+def read_mapped(path: Path, verify: bool = False) -> dict[str, Any] | None:
+    """
+    Reads the merged layer geometries of a memory-mapped geometry file, reconstructing each
+    geometry directly from the mapped arrays. Files with an unknown header or a size other
+    than recorded in it (e.g. truncated) are reported and ignored, as are files whose
+    checksum does not match their arrays if verified. Verifying reads every page of the
+    file, so it is left to the caller.
+
+    :param path: Path to the memory-mapped geometry file.
+    :param verify: True if the checksum of the arrays is to be verified.
+    :return: Dictionary mapping layer labels to their geometries, or None if the file is invalid.
+    """
+    start = len(_MAGIC) + 8
+    try:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(buffer[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError("unknown file type")
+        length = int(buffer[len(_MAGIC):start].view(np.uint64)[0])
+        header = json.loads(bytes(buffer[start:start + length]))
+        if header["version"] != _FORMAT_VERSION:
+            raise ValueError(f"unsupported version {header['version']}")
+        body = buffer[start + length:]
+        if len(body) != header["size"]:
+            raise ValueError("size mismatch")
+        if verify and zlib.crc32(body) != header["checksum"]:
+            raise ValueError("checksum mismatch")
+        geometries = {}
+        for label, entry in header["layers"].items():
+            offset, size = entry["coordinates"]
+            coordinates = body[offset:offset + size].view(np.float64).reshape(-1, entry["dimensions"])
+            offsets = tuple(body[offset:offset + size].view(np.int64) for offset, size in entry["offsets"])
+            geometry_type = shapely.GeometryType(entry["type"])
+            geometries[label] = shapely.from_ragged_array(geometry_type, coordinates, offsets)[0]
+    except (ValueError, KeyError, IndexError) as error:
+        print(f"WARNING: Ignoring memory-mapped geometry cache {path.name}: {error}.")
+        return None
+    return geometries
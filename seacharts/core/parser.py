@@ -2,14 +2,41 @@
 Contains the DataParser class for spatial data parsing.
 """
 from abc import abstractmethod
+import json
+import os
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Generator
+from typing import Any, Generator
 
 import fiona
+import numpy as np
+import shapely
+from shapely import geometry as geo
+
+try:  # optional bulk reader reading whole layers as Arrow tables
+    import pyarrow  # noqa: F401
+    import pyogrio
+    from pyogrio.errors import DataLayerError, DataSourceError
+except ImportError:
+    pyogrio = None
 
 from seacharts.core import paths
-from seacharts.layers import Layer
+from seacharts.core.columnar import COLUMNAR_SUFFIXES, columnar_available, read_columnar, write_columnar
+from seacharts.core.ingestion import Ingestion
+from seacharts.core.mapped import MAPPED_TYPES, read_mapped, write_mapped
+from seacharts.core.quantized import QUANTIZED_SUFFIX, read_quantized, write_quantized
+from seacharts.core.records import LazyRecordTable, RecordTable
+from seacharts.core.resources import ResourceCatalogue
+from seacharts.layers import Layer, Seabed
+from seacharts.shapes import Topology, UnionEngine
+from seacharts.shapes.repair import repair_geometries
+from seacharts.shapes.simplify import BYTES_PER_COORDINATE, coordinate_count, simplify_geometries
+
+# Suffix of the files marking layers as stored in the topology file, holding its token
+_TOPOLOGY_SUFFIX = ".topology"
 
 
 class DataParser:
@@ -19,14 +46,30 @@ class DataParser:
 
     :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax).
     :param path_strings: List of paths to spatial data sources.
+    :param ingestion: Optional settings controlling how resources are parsed.
     """
+    # Whether seabed layers are cumulative (all areas deeper than their depth), and thus
+    # stored as depth bands from which the cumulative views are derived
+    cumulative_depths = False
+
     def __init__(
         self,
         bounding_box: tuple[int, int, int, int],
         path_strings: list[str],
+        ingestion: Ingestion | None = None,
     ):
         self.bounding_box = bounding_box
         self.paths = set([p.resolve() for p in (map(Path, path_strings))])
+        self.ingestion = ingestion if ingestion is not None else Ingestion()
+        coverage = self.ingestion.coverage_union if self.ingestion.coverage_union != "off" else None
+        self.union_engine = UnionEngine(
+            self.ingestion.union_workers, self.ingestion.union_memory, coverage=coverage
+        )
+        self.simplification_report: dict[str, tuple[int, int]] = {}
+        self._topology: Topology | None = None
+        self._mapped: dict[str, Any] | None = None
+        self.catalogue = ResourceCatalogue(paths.shapefiles / "resources.json")
+        self._sources: list[Path] | None = None
 
     @staticmethod
     def _shapefile_path(label):
@@ -48,6 +91,412 @@ class DataParser:
         """
         return paths.shapefiles / label
 
+    @property
+    def _columnar_format(self) -> str | None:
+        """
+        Returns the configured columnar format layers are cached in, if pyarrow is installed.
+
+        :return: "parquet" or "feather", or None if layers are cached as shapefiles.
+        """
+        if self.ingestion.cache_format not in COLUMNAR_SUFFIXES or not columnar_available():
+            return None
+        return self.ingestion.cache_format
+
+    @property
+    def _quantized_format(self) -> bool:
+        """
+        Checks whether layers are cached as quantized files, which requires a precision grid.
+
+        :return: True if layers are cached as quantized files, otherwise False.
+        """
+        return self.ingestion.cache_format == "quantized" and self.ingestion.precision is not None
+
+    @property
+    def _replaces_shapefiles(self) -> bool:
+        """
+        Checks whether layers are cached in another format than shapefiles.
+
+        :return: True if layers are cached as columnar or quantized files, otherwise False.
+        """
+        return self._columnar_format is not None or self._quantized_format
+
+    def _layer_path(self, label: str) -> Path:
+        """
+        Returns the most recently written cache file of a layer, among its columnar files,
+        its quantized file, its topology marker and its shapefile, e.g. after the configured
+        cache format changed.
+
+        :param label: The label of the layer.
+        :return: Path to the cache file of the layer, or to its shapefile if none exists.
+        """
+        suffixes = [*COLUMNAR_SUFFIXES.values(), QUANTIZED_SUFFIX, _TOPOLOGY_SUFFIX]
+        candidates = [self._shapefile_path(label)]
+        candidates += [paths.shapefiles / label / (label + suffix) for suffix in suffixes]
+        existing = [path for path in candidates if path.exists()]
+        return max(existing, key=lambda path: path.stat().st_mtime_ns) if existing else candidates[0]
+
+    @property
+    def _cache_crs(self) -> str | None:
+        """
+        Returns the coordinate reference system of the cached layers, if known.
+
+        :return: The coordinate reference system, e.g. "EPSG:25833", or None.
+        """
+        return None
+
+    def _write_layer_cache(self, label: str, geometries: list[Any], properties: dict[str, list],
+                           merged: Any | None = None, schema: dict | None = None) -> bool:
+        """
+        Writes a layer to a columnar or quantized file instead of a shapefile, if one of
+        these cache formats is configured.
+
+        :param label: The label of the layer.
+        :param geometries: List of Shapely geometries of the layer, snapped to the precision grid if configured.
+        :param properties: Dictionary mapping attribute names to lists of values.
+        :param merged: Optional merged geometry of the layer, kept in columnar files such that loading needs no union.
+        :param schema: Optional shapefile schema of the records.
+        :return: True if the layer was written, or False if it is to be written as a shapefile.
+        """
+        if self._quantized_format:
+            self._write_quantized_cache(label, geometries, properties, schema)
+            return True
+        return self._write_columnar_cache(label, geometries, properties, merged, schema)
+
+    def _write_columnar_cache(self, label: str, geometries: list[Any], properties: dict[str, list],
+                              merged: Any | None = None, schema: dict | None = None) -> bool:
+        """
+        Writes a layer to a compressed columnar file instead of a shapefile, if a columnar
+        cache format is configured.
+
+        :param label: The label of the layer.
+        :param geometries: List of Shapely geometries of the layer.
+        :param properties: Dictionary mapping attribute names to lists of values.
+        :param merged: Optional merged geometry of the layer, stored such that loading needs no union.
+        :param schema: Optional shapefile schema of the records.
+        :return: True if the layer was written, or False if it is to be written as a shapefile.
+        """
+        if self._columnar_format is None:
+            return False
+        path = paths.shapefiles / label / (label + COLUMNAR_SUFFIXES[self._columnar_format])
+        write_columnar(path, geometries, properties, merged, schema, self._cache_crs)
+        return True
+
+    def _read_columnar_cache(self, label: str) -> tuple[RecordTable, Any] | None:
+        """
+        Reads the columnar cache file of a layer, if it is the most recent cache file of the
+        layer and pyarrow is installed.
+
+        :param label: The label of the layer.
+        :return: Tuple of a RecordTable of the records within the bounding box and the merged
+            geometry of the layer or None, or None if the layer has no columnar cache.
+        """
+        path = self._layer_path(label)
+        if path.suffix not in COLUMNAR_SUFFIXES.values() or not columnar_available():
+            return None
+        return read_columnar(path, self.bounding_box)
+
+    @staticmethod
+    def _quantized_path(label: str) -> Path:
+        """
+        Constructs the path of the quantized file of a layer, stored in place of its shapefile.
+
+        :param label: The label of the layer.
+        :return: Path to the quantized layer file.
+        """
+        return paths.shapefiles / label / (label + QUANTIZED_SUFFIX)
+
+    def _quantize(self, geometries: list[Any]) -> list[Any]:
+        """
+        Snaps the coordinates of geometries to the configured precision grid, if any.
+
+        :param geometries: List of Shapely geometries.
+        :return: List of snapped geometries, or the given geometries if no grid is configured.
+        """
+        if self.ingestion.precision is None or not len(geometries):
+            return list(geometries)
+        return list(shapely.set_precision(np.asarray(geometries, dtype=object), self.ingestion.precision))
+
+    def _write_quantized_cache(self, label: str, geometries: list[Any], properties: dict[str, list],
+                               schema: dict | None = None) -> None:
+        """
+        Writes a layer as integer coordinate offsets from the origin of the extent (the lower
+        left corner of the bounding box) on the configured precision grid.
+
+        :param label: The label of the layer.
+        :param geometries: List of Shapely geometries of the layer, snapped to the precision grid.
+        :param properties: Dictionary mapping attribute names to lists of values.
+        :param schema: Optional shapefile schema of the records.
+        """
+        origin = self.bounding_box[0], self.bounding_box[1]
+        path = self._quantized_path(label)
+        write_quantized(path, geometries, properties, origin, self.ingestion.precision, schema)
+
+    def _read_quantized_cache(self, label: str) -> RecordTable | None:
+        """
+        Reads the quantized file of a layer, if it is the most recent cache file of the layer.
+
+        :param label: The label of the layer.
+        :return: A RecordTable of the records within the bounding box, or None.
+        """
+        path = self._layer_path(label)
+        if path.suffix != QUANTIZED_SUFFIX:
+            return None
+        return read_quantized(path, self.bounding_box)
+
+    @staticmethod
+    def _manifest_path(label: str) -> Path:
+        """
+        Constructs the path of the completion manifest stored next to a shapefile.
+
+        :param label: The label of the layer.
+        :return: Path to the manifest file.
+        """
+        return paths.shapefiles / label / (label + ".manifest.json")
+
+    def _layer_files(self, label: str) -> dict[str, dict[str, int]]:
+        """
+        Describes the files written for a layer (shapefile components and caches).
+
+        :param label: The label of the layer.
+        :return: Dictionary mapping file names to their size and modification time.
+        """
+        directory, manifest_name = self._shapefile_dir_path(label), self._manifest_path(label).name
+        if not directory.exists():
+            return {}
+        return {
+            path.name: dict(size=path.stat().st_size, mtime=path.stat().st_mtime_ns)
+            for path in sorted(directory.glob(label + ".*"))
+            if path.name != manifest_name and not path.name.endswith(".tmp")
+        }
+
+    def _complete_layer(self, label: str) -> None:
+        """
+        Marks a layer as completely written, by atomically writing a manifest of its files
+        to a temporary file that is then renamed, such that interrupted runs never leave a
+        partial manifest.
+
+        :param label: The label of the layer.
+        """
+        manifest_path = self._manifest_path(label)
+        temporary_path = manifest_path.with_name(manifest_path.name + ".tmp")
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(dict(label=label, files=self._layer_files(label)), manifest_file, indent=2)
+        os.replace(temporary_path, manifest_path)
+
+    def _is_complete(self, label: str) -> bool:
+        """
+        Checks whether a layer has a completion manifest matching its current files.
+
+        :param label: The label of the layer.
+        :return: True if the layer was completely written and has not changed since.
+        """
+        manifest_path = self._manifest_path(label)
+        if not manifest_path.exists():
+            return False
+        try:
+            with open(manifest_path) as manifest_file:
+                files = json.load(manifest_file)["files"]
+        except (ValueError, KeyError):
+            return False
+        return bool(files) and files == self._layer_files(label)
+
+    def incomplete_layers(self, layers: list[Layer]) -> list[Layer]:
+        """
+        Finds the layers whose outputs were not completely written, or changed since.
+
+        :param layers: List of Layer objects.
+        :return: List of the layers without a valid completion manifest.
+        """
+        return [layer for layer in layers if not self._is_complete(layer.label)]
+
+    def discard_layers(self, layers: list[Layer]) -> None:
+        """
+        Removes the completion manifests of layers about to be parsed again, such that their
+        outputs count as incomplete until they are completely written.
+
+        :param layers: List of Layer objects to be parsed.
+        """
+        for layer in layers:
+            self._manifest_path(layer.label).unlink(missing_ok=True)
+
+    def _discard_incomplete(self, label: str) -> None:
+        """
+        Deletes the files of a layer without a valid completion manifest.
+
+        :param label: The label of the layer.
+        """
+        stale = [self._shapefile_dir_path(label) / name for name in self._layer_files(label)]
+        for path in stale:
+            path.unlink(missing_ok=True)
+        self._manifest_path(label).unlink(missing_ok=True)
+        if stale:
+            print(f"INFO: Discarded incomplete shapefile of {label}.")
+
+    @staticmethod
+    def _topology_path() -> Path:
+        """
+        Constructs the path of the shared-edge topology file of the polygonal map layers.
+
+        :return: Path to the topology file.
+        """
+        return paths.shapefiles / "topology.npz"
+
+    @staticmethod
+    def _topology_marker_path(label: str) -> Path:
+        """
+        Constructs the path of the file marking a layer as stored in the topology file, in
+        place of its shapefile.
+
+        :param label: The label of the layer.
+        :return: Path to the topology marker file.
+        """
+        return paths.shapefiles / label / (label + _TOPOLOGY_SUFFIX)
+
+    def _in_topology(self, label: str) -> bool:
+        """
+        Checks whether a layer is stored in the topology file, i.e. whether its most recent
+        cache file is a topology marker naming the topology file currently written.
+
+        :param label: The label of the layer.
+        :return: True if the layer is to be loaded from the topology file, otherwise False.
+        """
+        if self._layer_path(label).suffix != _TOPOLOGY_SUFFIX:
+            return False
+        topology = self._read_topology()
+        if topology is None or label not in topology.layers:
+            return False
+        return self._topology_marker_path(label).read_text().strip() == topology.token
+
+    def write_topology(self, layers: list[Layer]) -> None:
+        """
+        Stores the polygonal layers in the topology file in place of their layer files, if
+        the 'topology' cache format is configured, keeping the boundaries they share once as
+        arcs. The file is only written if any of the layers is not stored in it yet (e.g.
+        after it was parsed), and then also keeps the layers it already stores.
+
+        Arcs are simplified once with the 'topology' tolerance, if configured, such that shared
+        boundaries stay identical in all layers. The layers are then loaded again from the
+        written file, so they are the same as when loaded from the cache later.
+
+        :param layers: List of loaded Layer objects.
+        """
+        if self.ingestion.cache_format != "topology":
+            return
+        layers = [
+            layer for layer in layers
+            if isinstance(layer.geometry, (geo.Polygon, geo.MultiPolygon)) and not layer.geometry.is_empty
+        ]
+        if all(self._in_topology(layer.label) for layer in layers):
+            return
+        topology = self._read_topology()
+        labels = [layer.label for layer in layers]
+        if topology is not None:
+            labels += [label for label in topology.layers if label not in labels and self._in_topology(label)]
+        features = {}
+        for label in labels:
+            table = self._read_layer_records(label)
+            if table is None or not len(table):
+                continue
+            geometries = list(table.geometries)
+            if all(isinstance(geometry, (geo.Polygon, geo.MultiPolygon)) for geometry in geometries):
+                features[label] = geometries, table.properties
+        if not features:
+            return
+        start_time = time.time()
+        before = sum(coordinate_count(geometries) for geometries, _ in features.values())
+        topology = Topology.from_features(features)
+        topology.simplify(self.ingestion.simplification.get("topology", 0))
+        topology.save(self._topology_path())
+        self._topology = topology
+        for label in features:
+            for name in self._layer_files(label):
+                (self._shapefile_dir_path(label) / name).unlink()
+            self._topology_marker_path(label).write_text(topology.token)
+            self._complete_layer(label)
+        for layer in layers:
+            if layer.label in features:
+                self._load_topology_layer(layer)
+        end_time = round(time.time() - start_time, 1)
+        print(f"\rStored {before} coordinates of {len(features)} layers "
+              f"as {topology.coordinate_count} arc coordinates in {end_time} s.")
+
+    def _read_topology(self) -> Topology | None:
+        """
+        Reads the topology file, if it exists. Files of an unknown format are ignored, such
+        that the layers stored in them are parsed again.
+
+        :return: The Topology, or None.
+        """
+        topology_path = self._topology_path()
+        if self._topology is None and topology_path.exists():
+            try:
+                self._topology = Topology.load(topology_path)
+            except (KeyError, ValueError) as error:
+                print(f"WARNING: Ignoring topology file {topology_path.name}: {error}.")
+        return self._topology
+
+    def _load_topology_layer(self, layer: Layer) -> None:
+        """
+        Loads the features of a layer stored in the topology file into the layer, merging
+        their geometries as when loaded from a layer file.
+
+        :param layer: Layer object to load the records into.
+        """
+        table = self._read_layer_records(layer.label)
+        layer.geometries_as_geometry(list(table.geometries), self.union_engine)
+        layer.records = table
+
+    @staticmethod
+    def _mapped_path() -> Path:
+        """
+        Constructs the path of the memory-mapped geometry cache of the map layers.
+
+        :return: Path to the memory-mapped geometry file.
+        """
+        return paths.shapefiles / "geometry.bin"
+
+    def write_mapped_cache(self, layers: list[Layer]) -> None:
+        """
+        Stores the merged geometries of the given layers in the memory-mapped geometry cache
+        if enabled, unless they were all loaded from it. Seabeds store their depth bands, and
+        layers of mixed geometry types are left out.
+
+        :param layers: List of loaded Layer objects.
+        """
+        if not self.ingestion.mapped:
+            return
+        geometries = {layer.label: layer.band if isinstance(layer, Seabed) else layer.geometry for layer in layers}
+        geometries = {
+            label: geometry for label, geometry in geometries.items()
+            if not geometry.is_empty and shapely.get_type_id(geometry) in MAPPED_TYPES
+        }
+        cached = self._read_mapped_cache() or {}
+        if not geometries or all(cached.get(label) is geometry for label, geometry in geometries.items()):
+            return
+        write_mapped(self._mapped_path(), geometries)
+        self._mapped = geometries
+        print(f"\rStored {len(geometries)} layers in the memory-mapped geometry cache.")
+
+    def _read_mapped_cache(self) -> dict[str, Any] | None:
+        """
+        Reads the memory-mapped geometry cache if enabled, keeping the layers whose shapefile
+        or columnar file is not more recent than the cache, such that layers re-parsed since
+        are loaded from their files.
+
+        :return: Dictionary mapping layer labels to their merged multipart geometries, or None.
+        """
+        mapped_path = self._mapped_path()
+        if not self.ingestion.mapped or not mapped_path.exists():
+            return None
+        if self._mapped is None:
+            geometries = read_mapped(mapped_path, self.ingestion.verify_mapped) or {}
+            modified = mapped_path.stat().st_mtime
+            self._mapped = {
+                label: self._as_multi(geometry) for label, geometry in geometries.items()
+                if self._layer_path(label).exists() and self._layer_path(label).stat().st_mtime <= modified
+            }
+        return self._mapped
+
     def _read_spatial_file(self, path: Path, **kwargs) -> Generator:
         """
         Reads a spatial file (shapefile) and yields records that fall within the bounding box.
@@ -69,6 +518,36 @@ class DataParser:
             print(message)
         return
 
+    @property
+    def _bulk_reader(self) -> bool:
+        """
+        Checks whether whole layers are read as Arrow tables, which requires pyogrio and pyarrow.
+
+        :return: True if the Arrow reader is configured and available, otherwise False.
+        """
+        return self.ingestion.reader == "arrow" and pyogrio is not None
+
+    def _read_spatial_table(self, path: Path, **kwargs) -> RecordTable | None:
+        """
+        Reads a whole layer of a spatial file within the bounding box into a RecordTable,
+        through Arrow with the bounding box filter pushed down to GDAL, or through fiona
+        records if the Arrow reader is not available.
+
+        :param path: Path to the spatial file to be read.
+        :param kwargs: Additional arguments for reading the file, e.g. the layer name.
+        :return: A RecordTable of the records, or None if the layer was not found.
+        """
+        if not self._bulk_reader:
+            return RecordTable.from_records(list(self._read_spatial_file(path, **kwargs)))
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=RuntimeWarning)
+                meta, table = pyogrio.read_arrow(path, bbox=self.bounding_box, **kwargs)
+        except (DataLayerError, DataSourceError) as e:
+            print(f"Warning: {e}")
+            return None
+        return RecordTable.from_arrow(table, meta["geometry_name"] or "wkb_geometry")
+
     def _read_shapefile(self, label: str) -> Generator:
         """
         Reads records from a specified shapefile if it exists.
@@ -82,14 +561,188 @@ class DataParser:
 
     def load_shapefiles(self, layer: Layer) -> None:
         """
-        Loads records from shapefiles into the specified layer.
+        Loads records from the cached files (columnar, quantized or topology files, or
+        shapefiles) into the specified layer, taking the merged geometry stored in columnar
+        files without a union. Layers in the memory-mapped geometry cache take their geometry
+        from it, and read their records from their layer files only when these are first used.
+
+        Layers without a valid completion manifest, e.g. left half-written by an interrupted
+        ingestion, are discarded instead of loaded, such that they are parsed again.
 
         :param layer: Layer object to load the records into.
         """
+        if not self._is_complete(layer.label):
+            self._discard_incomplete(layer.label)
+            return
+        in_topology = self._layer_path(layer.label).suffix == _TOPOLOGY_SUFFIX
+        if in_topology and not self._in_topology(layer.label):
+            self._discard_incomplete(layer.label)
+            return
+        mapped = self._read_mapped_cache()
+        if mapped is not None and layer.label in mapped:
+            layer.geometry = mapped[layer.label]
+            layer.records = LazyRecordTable(partial(self._read_layer_records, layer.label))
+            return
+        if in_topology:
+            self._load_topology_layer(layer)
+            return
+        columnar = self._read_columnar_cache(layer.label)
+        if columnar is not None:
+            table, merged = columnar
+            if merged is not None:
+                layer.geometry = self._as_multi(merged)
+            else:
+                layer.geometries_as_geometry(list(table.geometries), self.union_engine)
+            layer.records = table
+            return
+        table = self._read_quantized_cache(layer.label)
+        if table is not None:
+            layer.geometries_as_geometry(list(table.geometries), self.union_engine)
+            layer.records = table
+            return
+        if self._bulk_reader:
+            file_path = self._shapefile_path(layer.label)
+            if file_path.exists():
+                table = self._read_spatial_table(file_path)
+                if table is not None:
+                    layer.geometries_as_geometry(list(table.geometries), self.union_engine)
+                    layer.records = table
+            return
         records = list(self._read_shapefile(layer.label))
-        layer.records_as_geometry(records)
-        layer.records= records
-        
+        self._load_records(layer, records)
+
+    def _read_layer_records(self, label: str) -> RecordTable | None:
+        """
+        Reads the records of a layer within the bounding box from its columnar file,
+        quantized file, topology file or shapefile, without merging their geometries.
+
+        :param label: The label of the layer.
+        :return: A RecordTable of the records, or None if the layer was not found.
+        """
+        if self._in_topology(label):
+            geometries, properties = self._topology.features(label)
+            geometries = np.asarray(geometries, dtype=object)
+            keep = shapely.intersects(geometries, shapely.box(*self.bounding_box))
+            properties = {name: [v for v, k in zip(values, keep) if k] for name, values in properties.items()}
+            return RecordTable(geometries[keep], properties)
+        columnar = self._read_columnar_cache(label)
+        if columnar is not None:
+            return columnar[0]
+        table = self._read_quantized_cache(label)
+        if table is not None:
+            return table
+        file_path = self._shapefile_path(label)
+        return self._read_spatial_table(file_path) if file_path.exists() else None
+
+    @staticmethod
+    def _as_multi(geometry: Any) -> Any:
+        """
+        Converts a single-part geometry loaded from a cache into its multipart type, as the
+        geometries of layers merged from their records always are.
+
+        :param geometry: Shapely geometry of a layer.
+        :return: The geometry itself if multipart or empty, otherwise a multipart geometry.
+        """
+        if geometry.is_empty or isinstance(geometry, geo.base.BaseMultipartGeometry):
+            return geometry
+        return Layer.as_multi([geometry])
+
+    def _load_records(self, layer: Layer, records: list[dict]) -> None:
+        """
+        Converts records into the geometry of the specified layer and keeps them as its records.
+
+        :param layer: Layer object to load the records into.
+        :param records: List of record dictionaries with geometry and properties.
+        """
+        layer.records_as_geometry(records, self.union_engine)
+        layer.records = records
+
+    def _load_records_in_parallel(self, layer_records: list[tuple[Layer, list[dict]]]) -> None:
+        """
+        Loads records into several layers, merging the geometries of each layer
+        in a separate worker process.
+
+        :param layer_records: List of pairs of a Layer object and the records to load into it.
+        """
+        jobs = [(layer, records) for layer, records in layer_records if records]
+        layers = [layer for layer, _ in jobs]
+        geometries = [
+            self._repair([layer._record_to_geometry(r) for r in records], layer.name) for layer, records in jobs
+        ]
+        workers = min(self.ingestion.workers, len(jobs))
+        if workers > 1:
+            engines = [self.union_engine.serial()] * len(jobs)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_merge_geometries, layers, geometries, engines))
+        else:
+            engines = [self.union_engine] * len(jobs)
+            results = list(map(_merge_geometries, layers, geometries, engines))
+        for (layer, records), geometry in zip(jobs, results):
+            layer.geometry = geometry
+            layer.records = records
+
+    def _repair(self, geometries: list[Any], name: str) -> list[Any]:
+        """
+        Repairs the invalid geometries among the given ones, and reports how many were repaired.
+
+        :param geometries: List of Shapely geometries.
+        :param name: Name of the layer or data set the geometries belong to, for reporting.
+        :return: List of valid geometries.
+        """
+        geometries, repaired = repair_geometries(geometries, self.union_engine.workers)
+        if repaired:
+            print(f"\rRepaired {repaired} invalid {name} geometries.")
+        return list(geometries)
+
+    def _tolerance(self, region: Layer) -> float:
+        """
+        Returns the configured simplification tolerance of a region, where all seabed
+        regions share the 'seabed' tolerance, and other regions are looked up by label.
+
+        :param region: Layer object to find the tolerance of.
+        :return: Simplification tolerance, or 0 if none is configured.
+        """
+        simplification = self.ingestion.simplification
+        name = "seabed" if region.__class__.__name__ == "Seabed" else region.label
+        return simplification.get(name, simplification.get("default", 0))
+
+    def _simplify(self, geometries: list[Any], tolerance: float, name: str, coverage: bool = False) -> list[Any]:
+        """
+        Simplifies geometries with the given tolerance while preserving their topology,
+        and records the achieved reduction of vertices and memory.
+
+        :param geometries: List of Shapely geometries.
+        :param tolerance: Simplification tolerance, where 0 leaves the geometries unchanged.
+        :param name: Name of the layer the geometries belong to, for reporting.
+        :param coverage: True if the geometries are polygons forming a coverage.
+        :return: List of simplified geometries.
+        """
+        if tolerance <= 0 or not len(geometries):
+            return list(geometries)
+        before = coordinate_count(geometries)
+        geometries = list(simplify_geometries(geometries, tolerance, coverage))
+        self._record_simplification(name, before, coordinate_count(geometries))
+        return geometries
+
+    def _simplify_region(self, region: Layer) -> None:
+        """
+        Simplifies the geometry of a region with its configured tolerance, preserving topology.
+
+        :param region: Layer object to be simplified.
+        """
+        region.geometry = self._simplify([region.geometry], self._tolerance(region), region.name)[0]
+
+    def _record_simplification(self, name: str, before: int, after: int) -> None:
+        """
+        Records and reports the vertex and memory reduction achieved by simplifying a layer.
+
+        :param name: Name of the simplified layer.
+        :param before: Number of vertices before simplification.
+        :param after: Number of vertices after simplification.
+        """
+        self.simplification_report[name] = before, after
+        saved = (before - after) * BYTES_PER_COORDINATE / 10 ** 6
+        print(f"\rSimplified {name} from {before} to {after} vertices, saving {saved:.1f} MB.")
 
     def _valid_paths_and_resources(self, paths: set[Path], resources: list[str], area: float)-> bool:
         """
@@ -135,6 +788,25 @@ class DataParser:
         """
         pass
 
+    def updated_regions(self, regions: list[Layer]) -> list[Layer]:
+        """
+        Finds the regions touched by pending incremental updates of the spatial data sources,
+        which must be parsed again. Formats without incremental updates have none.
+
+        :param regions: List of Layer objects representing loaded regions.
+        :return: List of the regions touched by pending updates.
+        """
+        return []
+
+    def record_applied_updates(self, regions: list[Layer]) -> None:
+        """
+        Records that the pending incremental updates of the spatial data sources have been
+        applied to the given regions. Formats without incremental updates have nothing to record.
+
+        :param regions: List of Layer objects representing the featured regions.
+        """
+        pass
+
     @abstractmethod
     def _is_map_type(self, path) -> bool:
         """
@@ -155,26 +827,80 @@ class DataParser:
         pass
 
     @property
-    def _file_paths(self) -> Generator[Path, None, None]:
+    def _file_paths(self) -> list[Path]:
         """
-        Generator that yields valid file paths from the configured paths.
+        Retrieves the spatial data sources found in the configured paths, from the resource
+        catalogue refreshed once for the parser.
 
-        :yield: Valid file paths for spatial data sources.
+        :return: Sorted list of paths to the spatial data sources.
         """
-        for path in self.paths:
-            if not path.is_absolute():
-                path = Path.cwd() / path
-            yield from self._get_files_recursive(path)
-    
-    def _get_files_recursive(self, path: Path) -> Generator[Path, None, None]:
+        if self._sources is None:
+            roots = [path if path.is_absolute() else Path.cwd() / path for path in self.paths]
+            self._sources = self.catalogue.refresh(roots, self._is_source, self._describe_sources)
+        return self._sources
+
+    def refresh_resources(self) -> None:
+        """
+        Makes the parser look for new or changed spatial data sources when next used.
         """
-        Recursively retrieves valid file paths for the specified path.
+        self._sources = None
 
-        :param path: Path to be searched for valid files.
-        :yield: Valid file paths found in the directory.
+    def source_identities(self) -> list[dict]:
+        """
+        Identifies the sources within the bounding box by their path, modification time, size
+        and checksum, as recorded in the resource catalogue.
+
+        :return: List of dictionaries identifying the sources, sorted by path.
+        """
+        return [dict(path=str(source), **self.catalogue.identity(source)) for source in self._sources_in_bounding_box()]
+
+    def _is_source(self, path: Path) -> bool:
+        """
+        Determines if a path is a single spatial data source, recorded in the resource
+        catalogue, whose contents are not searched for further sources.
+
+        :param path: Path to be checked.
+        :return: True if the path is a spatial data source, otherwise False.
         """
-        if self._is_map_type(path):
-            yield path
-        elif path.is_dir():
-            for p in path.iterdir():
-                yield from self._get_files_recursive(p)
+        return self._is_map_type(path)
+
+    def _describe_sources(self, sources: list[Path]) -> dict[Path, dict]:
+        """
+        Describes new or changed spatial data sources for the resource catalogue. Formats
+        without cheap access to bounds or layers describe nothing.
+
+        :param sources: List of paths to the sources.
+        :return: Dictionary mapping source paths to their 'bounds' and 'layers'.
+        """
+        return {}
+
+    def _sources_in_bounding_box(self) -> list[Path]:
+        """
+        Selects the spatial data sources whose catalogued bounds intersect the bounding box,
+        without opening them. Sources with unknown bounds are kept.
+
+        :return: List of paths to the selected sources.
+        """
+        x_min, y_min, x_max, y_max = self.bounding_box
+        selected = []
+        for source in self._file_paths:
+            bounds = self.catalogue.bounds(source)
+            if bounds is not None:
+                s_x_min, s_y_min, s_x_max, s_y_max = bounds
+                if s_x_max < x_min or s_x_min > x_max or s_y_max < y_min or s_y_min > y_max:
+                    continue
+            selected.append(source)
+        return selected
+
+
+def _merge_geometries(layer: Layer, geometries: list, engine: UnionEngine | None = None) -> Any:
+    """
+    Merges geometries into the geometry of the given layer, as a worker process task.
+
+    :param layer: Layer object the geometries belong to.
+    :param geometries: List of Shapely geometries to be merged.
+    :param engine: Optional union engine uniting the geometries in spatial partitions.
+    :return: The merged geometry of the layer.
+    """
+    layer.geometries_as_geometry(geometries, engine)
+    return layer.geometry
@@ -1,14 +1,25 @@
+import tempfile
 import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Generator
+from typing import Any, Generator
 
 import fiona
+import numpy as np
+import shapely
+from shapely import geometry as geo
 
 from seacharts.core import DataParser
-from seacharts.layers import Layer, labels
+from seacharts.core.streaming import TiledUnion, chunked
+from seacharts.layers import Layer, Seabed, labels
+from seacharts.shapes import UnionEngine
+from seacharts.shapes.repair import polygonal_parts
 
 
 class FGDBParser(DataParser):
+    cumulative_depths = True
+    _cache_crs = "EPSG:25833"
 
     def _load_from_file(self, layer: Layer) -> list[dict]:
         depth = layer.depth if hasattr(layer, "depth") else 0
@@ -23,31 +34,312 @@ class FGDBParser(DataParser):
     ) -> None:
         if not self._valid_paths_and_resources(self.paths, resources, area):
             return # interrupt parsing if paths are not valid
-        for regions in regions_list:
+        if self.ingestion.streaming:
+            self._parse_regions_streaming(regions_list)
+            return
+        if self.ingestion.single_scan:
+            self._parse_regions_in_single_scan(regions_list)
+            return
+        for regions in self._deepest_first(regions_list):
             start_time = time.time()
             records = self._load_from_file(regions)
             info = f"{len(records)} {regions.name} geometries"
 
             if not records:
                 print(f"\rFound {info}.")
-                return
+                continue
             else:
+                deeper = self._detach(regions)
                 print(f"\rMerging {info}...", end="")
-                regions.unify(records)
+                regions.unify(records, self.union_engine)
 
                 print(f"\rSimplifying {info}...", end="")
                 regions.simplify(0)
-
-                print(f"\rBuffering {info}...", end="")
-                regions.buffer(0)
+                self._simplify_region(regions)
 
                 print(f"\rClipping {info}...", end="")
                 regions.clip(self.bounding_box)
+                self._attach(regions, deeper)
 
             self._write_to_shapefile(regions)
             end_time = round(time.time() - start_time, 1)
             print(f"\rSaved {info} to shapefile in {end_time} s.")
 
+    def _parse_regions_in_single_scan(self, regions_list: list[Layer]) -> None:
+        """
+        Parses all regions by reading each FGDB layer once, dispatching its geometries to
+        every region using it, and finishing the regions in parallel worker processes.
+
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        """
+        start_time = time.time()
+        jobs = self.parse_scanned_regions(regions_list, self._scan_layers(regions_list))
+        end_time = round(time.time() - start_time, 1)
+        print(f"\rSaved {len(jobs)} layers to shapefiles in {end_time} s.")
+
+    def parse_scanned_regions(self, regions_list: list[Layer], geometries: dict[str, list[Any]]) -> list[Layer]:
+        """
+        Merges, simplifies and clips the geometries scanned for each region in parallel
+        worker processes, derives the depth bands of seabed regions, and writes the finished
+        regions to shapefiles.
+
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        :param geometries: Dictionary mapping region labels to lists of scanned geometries.
+        :return: List of the regions written, i.e. those with geometries.
+        """
+        jobs = []
+        for regions in regions_list:
+            info = f"{len(geometries[regions.label])} {regions.name} geometries"
+            if not geometries[regions.label]:
+                print(f"\rFound {info}.")
+            else:
+                jobs.append(regions)
+
+        print(f"\rMerging, simplifying and clipping {len(jobs)} layers...", end="")
+        workers = min(self.ingestion.workers, len(jobs))
+        engine = self.union_engine.serial() if workers > 1 else self.union_engine
+        finish_args = [(regions, geometries[regions.label], self.bounding_box, engine) for regions in jobs]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_finish_region, *zip(*finish_args)))
+        else:
+            results = [_finish_region(*args) for args in finish_args]
+
+        cumulative = dict(zip((regions.label for regions in jobs), results))
+        for regions in jobs:
+            if isinstance(regions, Seabed) and regions.deeper is not None:
+                label = regions.deeper.label
+                deeper = cumulative[label] if label in cumulative else regions.deeper.geometry
+                regions.geometry = self._difference(cumulative[regions.label], deeper)
+            else:
+                regions.geometry = cumulative[regions.label]
+        self._simplify_regions(jobs)
+        for regions in jobs:
+            self._write_to_shapefile(regions)
+        return jobs
+
+    def write_regions(self, regions_list: list[Layer]) -> None:
+        """
+        Writes finished regions to shapefiles, e.g. regions merged from the outputs of the
+        shards of a build.
+
+        :param regions_list: List of Layer objects holding their finished geometries.
+        """
+        for regions in regions_list:
+            self._write_to_shapefile(regions)
+
+    def _simplify_regions(self, regions_list: list[Layer]) -> None:
+        """
+        Simplifies merged regions with their configured tolerances. The non-overlapping depth
+        bands of seabed regions are simplified together as a coverage, such that adjacent
+        depth bands stay consistent.
+
+        :param regions_list: List of merged Layer objects.
+        """
+        seabeds = sorted((r for r in regions_list if isinstance(r, Seabed)), key=lambda r: r.depth)
+        for regions in regions_list:
+            if not isinstance(regions, Seabed):
+                self._simplify_region(regions)
+        if not seabeds or self._tolerance(seabeds[0]) <= 0:
+            return
+        bands = self._simplify([seabed.band for seabed in seabeds], self._tolerance(seabeds[0]), "Seabed", coverage=True)
+        for seabed, band in zip(seabeds, bands):
+            seabed.geometry = band if isinstance(band, geo.MultiPolygon) else geo.MultiPolygon([band])
+
+    @staticmethod
+    def _deepest_first(regions_list: list[Layer]) -> list[Layer]:
+        """
+        Orders regions such that seabed regions are parsed from the deepest one, whose merged
+        geometry is then available for deriving the depth band of the next shallower one.
+
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        :return: List of the regions, with seabed regions last and in descending depth.
+        """
+        seabeds = sorted((r for r in regions_list if isinstance(r, Seabed)), key=lambda r: r.depth, reverse=True)
+        return [r for r in regions_list if not isinstance(r, Seabed)] + seabeds
+
+    @staticmethod
+    def _detach(regions: Layer) -> Seabed | None:
+        """
+        Unlinks a seabed region from its deeper seabed, such that its geometry may be merged
+        from cumulative depth areas without deriving cumulative views.
+
+        :param regions: Layer object to be merged.
+        :return: The deeper seabed the region was linked to, if any.
+        """
+        if not isinstance(regions, Seabed):
+            return None
+        deeper, regions.deeper = regions.deeper, None
+        return deeper
+
+    def _attach(self, regions: Layer, deeper: Seabed | None) -> None:
+        """
+        Links a merged seabed region to its deeper seabed again, keeping only its depth band.
+
+        :param regions: Merged Layer object, holding all areas deeper than its depth.
+        :param deeper: The deeper seabed returned by _detach, if any.
+        """
+        if deeper is None:
+            return
+        regions.geometry = self._difference(regions.geometry, deeper.geometry)
+        regions.deeper = deeper
+
+    @staticmethod
+    def _difference(geometry: Any, deeper: Any) -> Any:
+        """
+        Derives the depth band of cumulative depth areas by removing the deeper areas.
+
+        :param geometry: Geometry of all areas deeper than the depth of the band.
+        :param deeper: Geometry of all areas deeper than the next depth.
+        :return: A MultiPolygon of the areas within the depth band.
+        """
+        if deeper is None or deeper.is_empty:
+            return geometry
+        return polygonal_parts(shapely.difference(geometry, deeper))
+
+    def _parse_regions_streaming(self, regions_list: list[Layer]) -> None:
+        """
+        Parses each region by streaming its records in chunks, merging them per spatial tile
+        with partial unions spilled to disk beyond the memory limit, and writing the merged
+        tiles to the shapefile one at a time.
+
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        """
+        for regions in self._deepest_first(regions_list):
+            start_time = time.time()
+            depth = regions.depth if hasattr(regions, "depth") else 0
+            external_labels = labels.NORWEGIAN_LABELS[regions.__class__.__name__]
+            records = self._read_file(regions.label, external_labels, depth)
+            with tempfile.TemporaryDirectory() as spill_directory:
+                tiles = TiledUnion(
+                    self.bounding_box, self.ingestion.tile_size,
+                    Path(spill_directory), self.ingestion.memory_limit
+                )
+                count = 0
+                for chunk in chunked(records, self.ingestion.chunk_size):
+                    tiles.add([regions._record_to_geometry(record) for record in chunk])
+                    count += len(chunk)
+                info = f"{count} {regions.name} geometries"
+                if tiles.repaired:
+                    print(f"\rRepaired {tiles.repaired} invalid {regions.name} geometries.")
+                if not count:
+                    print(f"\rFound {info}.")
+                    continue
+                print(f"\rMerging {info} in {len(tiles.tiles)} tiles...", end="")
+                deeper = regions.deeper.geometry if isinstance(regions, Seabed) and regions.deeper else None
+                regions.geometry = self._write_tiles_to_shapefile(regions, tiles.finish(), deeper)
+            end_time = round(time.time() - start_time, 1)
+            print(f"\rSaved {info} to shapefile in {end_time} s.")
+
+    def _write_tiles_to_shapefile(self, regions: Layer, tile_geometries: Generator,
+                                  deeper: Any | None = None) -> Any:
+        """
+        Writes the merged geometry of each tile of a region, snapped to the precision grid, as
+        a record of its shapefile, or of its columnar file together with the merged geometry
+        of the region. With a simplification tolerance, the tiles are first united and the
+        merged geometry is simplified once and written as a single record, such that no
+        simplified edges drift apart along tile borders. The deeper areas are removed after
+        simplification, so adjacent depth bands share the simplified edges of the deeper one.
+
+        :param regions: Layer object the tiles belong to.
+        :param tile_geometries: Generator of the merged MultiPolygon of each tile.
+        :param deeper: Optional geometry of deeper areas, removed from the tiles of a seabed.
+        :return: The merged geometry of the written tiles.
+        """
+        tolerance = self._tolerance(regions)
+        if tolerance > 0:
+            merged = self.union_engine.union_coverage(list(tile_geometries))
+            tile_geometries = self._simplify([merged], tolerance, regions.name)
+        written = []
+        file_path = self._shapefile_path(regions.label)
+        replaced = self._replaces_shapefiles
+        with nullcontext() if replaced else self._shapefile_writer(file_path, "MultiPolygon") as sink:
+            for geometry in tile_geometries:
+                geometry = polygonal_parts(self._quantize([self._difference(geometry, deeper)])[0])
+                if geometry.is_empty:
+                    continue
+                if sink is not None:
+                    sink.write(self._as_record(regions.depth, geometry.__geo_interface__))
+                written.append(geometry)
+        merged = polygonal_parts(self.union_engine.union_coverage(written))
+        properties = {"depth": [regions.depth] * len(written)}
+        self._write_layer_cache(regions.label, written, properties, merged)
+        self._complete_layer(regions.label)
+        return merged
+
+    def _scan_layers(self, regions_list: list[Layer]) -> dict[str, list[Any]]:
+        """
+        Reads every FGDB layer needed by the given regions once, and dispatches its geometries
+        to all regions using it. Depth areas are assigned to all depth bins at once.
+
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        :return: Dictionary mapping region labels to lists of Shapely geometries.
+        """
+        return self.scan_regions([self.bounding_box], regions_list)[0]
+
+    def scan_regions(
+            self,
+            bounding_boxes: list[tuple[int, int, int, int]],
+            regions_list: list[Layer],
+    ) -> list[dict[str, list[Any]]]:
+        """
+        Reads every FGDB layer needed by the given regions once within the bounding box of
+        the parser, and routes its geometries to all regions using them in every given
+        bounding box they intersect. Depth areas are assigned to all depth bins at once.
+
+        :param bounding_boxes: List of bounding boxes within the bounding box of the parser.
+        :param regions_list: List of Layer objects representing the regions to be parsed.
+        :return: List of dictionaries mapping region labels to lists of Shapely geometries,
+            one for each bounding box.
+        """
+        geometries = [{regions.label: [] for regions in regions_list} for _ in bounding_boxes]
+        boxes = shapely.box(*np.array(bounding_boxes, dtype=float).T)
+        targets: dict[str, list[tuple[Layer, str | None]]] = {}
+        for regions in regions_list:
+            for label in labels.NORWEGIAN_LABELS[regions.__class__.__name__]:
+                if isinstance(label, dict):
+                    targets.setdefault(label["layer"], []).append((regions, label["depth"]))
+                else:
+                    targets.setdefault(label, []).append((regions, None))
+
+        for gdb_path in self._sources_in_bounding_box():
+            for layer_name, layer_targets in targets.items():
+                table = self._read_spatial_table(gdb_path, layer=layer_name)
+                if table is None or not len(table):
+                    continue
+                print(f"\rNumber of {layer_name} records read: {len(table)}", end="")
+                shapes = np.asarray(self._repair(table.geometries, layer_name), dtype=object)
+                members = self._route(shapes, boxes)
+                for regions, depth_label in layer_targets:
+                    if depth_label is None:
+                        for routed, indices in zip(geometries, members):
+                            routed[regions.label].extend(shapes[indices])
+                depth_labels = {depth_label for _, depth_label in layer_targets if depth_label is not None}
+                for depth_label in depth_labels:
+                    depth_targets = [regions for regions, label in layer_targets if label == depth_label]
+                    values = np.array(table.properties[depth_label], dtype=float)
+                    depths = np.array([regions.depth for regions in depth_targets], dtype=float)
+                    in_bins = values[np.newaxis, :] >= depths[:, np.newaxis]
+                    for regions, in_bin in zip(depth_targets, in_bins):
+                        for routed, indices in zip(geometries, members):
+                            routed[regions.label].extend(shapes[indices[in_bin[indices]]])
+        return geometries
+
+    @staticmethod
+    def _route(shapes: np.ndarray, boxes: np.ndarray) -> list[np.ndarray]:
+        """
+        Finds the geometries intersecting each bounding box, through a spatial index of the
+        geometries. A single bounding box takes all geometries, as they were read within it.
+
+        :param shapes: Array of Shapely geometries.
+        :param boxes: Array of bounding box polygons.
+        :return: List of sorted geometry indices, one array for each bounding box.
+        """
+        if len(boxes) == 1:
+            return [np.arange(len(shapes))]
+        box_indices, shape_indices = shapely.STRtree(shapes).query(boxes, predicate="intersects")
+        return [np.sort(shape_indices[box_indices == i]) for i in range(len(boxes))]
+
     @staticmethod
     def _parse_records(records, name):
         for i, record in enumerate(records):
@@ -58,12 +350,41 @@ class FGDBParser(DataParser):
     def _read_file(
         self, name: str, external_labels: list[str], depth: int
     ) -> Generator:
-        for gdb_path in self._file_paths:
+        for gdb_path in self._sources_in_bounding_box():
             records = self._parse_layers(gdb_path, external_labels, depth)
             yield from self._parse_records(records, name)
 
     def _is_map_type(self, path) -> bool:
         return path.is_dir() and path.suffix == ".gdb"
+
+    def _is_source(self, path: Path) -> bool:
+        return path.suffix == ".gdb" and path.is_dir()
+
+    def _describe_sources(self, sources: list[Path]) -> dict[Path, dict]:
+        """
+        Describes FGDB directories for the resource catalogue, with their layers and the
+        bounds of all layers together, as read from the layer metadata.
+
+        :param sources: List of paths to the FGDB directories.
+        :return: Dictionary mapping FGDB paths to their 'bounds' and 'layers'.
+        """
+        descriptions = {}
+        for gdb_path in sources:
+            layer_names, extents = [], []
+            try:
+                layer_names = fiona.listlayers(gdb_path)
+                for layer_name in layer_names:
+                    with fiona.open(gdb_path, layer=layer_name) as source:
+                        if len(source):
+                            extents.append(source.bounds)
+            except (fiona.errors.DriverError, fiona.errors.FionaValueError) as error:
+                print(f"WARNING: Could not catalogue FGDB {gdb_path}: {error}")
+            bounds = None
+            if extents:
+                extents = np.array(extents)
+                bounds = *extents[:, :2].min(axis=0).tolist(), *extents[:, 2:].max(axis=0).tolist()
+            descriptions[gdb_path] = dict(bounds=bounds, layers=layer_names)
+        return descriptions
     
     def get_source_root_name(self) -> str | None:
         """
@@ -106,7 +427,32 @@ class FGDBParser(DataParser):
         )
 
     def _write_to_shapefile(self, regions: Layer):
-        geometry = regions.mapping
-        file_path = self._shapefile_path(regions.label)
-        with self._shapefile_writer(file_path, geometry["type"]) as sink:
-            sink.write(self._as_record(regions.depth, geometry))
+        stored = regions.band if isinstance(regions, Seabed) else regions.geometry
+        regions.geometry = stored = polygonal_parts(self._quantize([stored])[0])
+        if not self._write_layer_cache(regions.label, [stored], {"depth": [regions.depth]}, stored):
+            geometry = geo.mapping(stored)
+            file_path = self._shapefile_path(regions.label)
+            with self._shapefile_writer(file_path, geometry["type"]) as sink:
+                sink.write(self._as_record(regions.depth, geometry))
+        self._complete_layer(regions.label)
+
+
+def _finish_region(regions: Layer, geometries: list[Any], bounding_box: tuple[int, int, int, int],
+                   engine: UnionEngine | None = None) -> Any:
+    """
+    Merges, simplifies and clips the geometries of a region, as a worker process task.
+
+    :param regions: Layer object the geometries belong to.
+    :param geometries: List of Shapely geometries read for the region.
+    :param bounding_box: Bounding box the region is clipped to.
+    :param engine: Optional union engine uniting the geometries in spatial partitions.
+    :return: The finished geometry of the region.
+    """
+    deeper = FGDBParser._detach(regions)
+    regions.geometry = regions.collect(geometries, engine)
+    regions.simplify(0)
+    regions.clip(bounding_box)
+    geometry = regions.geometry
+    if deeper is not None:
+        regions.deeper = deeper
+    return geometry
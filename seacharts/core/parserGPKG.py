@@ -0,0 +1,102 @@
+"""
+Contains the GPKGParser class for parsing GeoPackage and FlatGeobuf map data.
+"""
+from pathlib import Path
+from typing import Generator
+
+from seacharts.core.parser import pyogrio
+from seacharts.core.parserFGDB import FGDBParser
+from seacharts.core.records import RecordTable
+
+# File suffixes of GeoPackage and FlatGeobuf files
+GPKG_SUFFIXES = (".gpkg", ".fgb")
+
+
+class GPKGParser(FGDBParser):
+    """
+    Parser for map data stored in GeoPackage (.gpkg) or FlatGeobuf (.fgb) files, holding
+    the layers of the FGDB data model. Each FlatGeobuf file holds a single layer, named
+    after the file.
+
+    Both formats carry a spatial index (an R-tree in GeoPackage, a packed Hilbert R-tree in
+    FlatGeobuf), which GDAL uses for the bounding box filter of every read. Extracting a
+    small area from a large file thus costs in proportion to the result. Layers are only
+    read from the files whose catalogued layer inventory holds them.
+    """
+
+    def _is_map_type(self, path) -> bool:
+        return path.is_file() and path.suffix in GPKG_SUFFIXES
+
+    def _is_source(self, path: Path) -> bool:
+        return path.suffix in GPKG_SUFFIXES and path.is_file()
+
+    def _describe_sources(self, sources: list[Path]) -> dict[Path, dict]:
+        """
+        Describes GeoPackage and FlatGeobuf files for the resource catalogue, with their
+        layers, the bounds of all layers together and the layers with a spatial index.
+        Layers without a spatial index are reported, as bounding box reads scan them whole.
+
+        :param sources: List of paths to the files.
+        :return: Dictionary mapping file paths to their 'bounds', 'layers' and 'indexed' layers.
+        """
+        if pyogrio is None:
+            return super()._describe_sources(sources)
+        descriptions = {}
+        for path in sources:
+            layer_names, indexed, extents = [], [], []
+            try:
+                layer_names = [str(name) for name, _ in pyogrio.list_layers(path)]
+                for layer_name in layer_names:
+                    info = pyogrio.read_info(path, layer=layer_name)
+                    if info["capabilities"].get("fast_spatial_filter"):
+                        indexed.append(layer_name)
+                    else:
+                        print(f"WARNING: Layer '{layer_name}' of {path.name} has no spatial index.")
+                    if info["features"] and info.get("total_bounds") is not None:
+                        extents.append(info["total_bounds"])
+            except (pyogrio.errors.DataSourceError, pyogrio.errors.DataLayerError) as error:
+                print(f"WARNING: Could not catalogue {path}: {error}")
+            bounds = None
+            if extents:
+                bounds = (min(e[0] for e in extents), min(e[1] for e in extents),
+                          max(e[2] for e in extents), max(e[3] for e in extents))
+            descriptions[path] = dict(bounds=bounds, layers=layer_names, indexed=indexed)
+        return descriptions
+
+    def _read_spatial_table(self, path: Path, **kwargs) -> RecordTable | None:
+        """
+        Reads a layer of a file within the bounding box through its spatial index, if the
+        file holds the layer according to the resource catalogue.
+
+        :param path: Path to the spatial file to be read.
+        :param kwargs: Additional arguments for reading the file, e.g. the layer name.
+        :return: A RecordTable of the records, or None if the file does not hold the layer.
+        """
+        if not self._holds_layer(path, kwargs.get("layer")):
+            return None
+        return super()._read_spatial_table(path, **kwargs)
+
+    def _read_spatial_file(self, path: Path, **kwargs) -> Generator:
+        """
+        Reads the records of a layer of a file within the bounding box through its spatial
+        index, if the file holds the layer according to the resource catalogue.
+
+        :param path: Path to the spatial file to be read.
+        :param kwargs: Additional arguments for reading the file, e.g. the layer name.
+        :yield: Records within the bounding box.
+        """
+        if self._holds_layer(path, kwargs.get("layer")):
+            yield from super()._read_spatial_file(path, **kwargs)
+
+    def _holds_layer(self, path: Path, layer: str | None) -> bool:
+        """
+        Checks whether a file holds a layer, according to the resource catalogue. Files that
+        are not catalogued sources (e.g. the shapefile cache) hold any layer.
+
+        :param path: Path to the spatial file.
+        :param layer: Name of the layer, or None for the default layer.
+        :return: True if the layer may be read from the file.
+        """
+        if layer is None or path.suffix not in GPKG_SUFFIXES:
+            return True
+        return layer in self.catalogue.layers(path)
@@ -1,11 +1,51 @@
+import json
 import os.path
 import subprocess
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Any
 
-from seacharts.core import DataParser
+import fiona
+import numpy as np
+import shapely
+from fiona.env import GDALDataFinder
+from pyproj import Transformer
+from shapely import geometry as geo
+
+try:  # optional GDAL bindings reading S-57 cells in-process
+    from osgeo import gdal, ogr, osr
+except ImportError:
+    gdal = ogr = osr = None
+
+from seacharts.core import DataParser, paths
+from seacharts.core.catalogS57 import (
+    CATALOG_NAME, USAGE_BANDS, cell_updates, cell_usage_band, read_cell_bounds,
+    read_object_classes, read_update_changes, scale_usage_band
+)
+from seacharts.core.columnar import read_columnar_schema
+from seacharts.core.ingestion import Ingestion
+from seacharts.core.quantized import read_quantized_schema
 from seacharts.layers import Land, Layer, Seabed, Shore
 
+if gdal is not None:
+    gdal.UseExceptions()
+    ogr.UseExceptions()
+    osr.UseExceptions()
+
+# Names of the OGR list field types, which the ESRI Shapefile format can only store as strings
+_LIST_FIELD_TYPES = ("IntegerList", "Integer64List", "RealList", "StringList")
+
+# Shapefile property types by OGR field type name, where other types are stored as strings
+_FIELD_TYPES = {"Integer": "int", "Integer64": "int", "Real": "float"}
+
+# Geometry types (without 'Multi' prefix) that may be written to shapefiles
+_SHAPEFILE_TYPES = ("Point", "LineString", "Polygon")
+
+# Label of the cache of raw clipped depth areas, from which seabed layers are binned
+_RAW_DEPTH_LABEL = "depare"
+
 
 class S57Parser(DataParser):
     """
@@ -16,48 +56,62 @@ class S57Parser(DataParser):
     :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax).
     :param path_strings: List of paths to data sources.
     :param epsg: EPSG code for the desired coordinate reference system.
+    :param ingestion: Optional settings controlling how resources are parsed.
+    :param depths: Optional list of all configured depth bins, bounding each seabed bin.
     """
     def __init__(
             self,
             bounding_box: tuple[int, int, int, int],
             path_strings: list[str],
-            epsg: str
+            epsg: str,
+            ingestion: Ingestion | None = None,
+            depths: list[int] | None = None
     ):
-        super().__init__(bounding_box, path_strings)
+        super().__init__(bounding_box, path_strings, ingestion)
         self.epsg = epsg
-        
+        self.depths = sorted(depths) if depths else []
+        self._clip_regions: dict[str, str] = {}
 
     def get_source_root_name(self) -> str:
         """ 
-        Returns the stem (base filename without suffix) of the first valid S57 file 
-        path in the given data paths.
-        Returns None if no valid S57 file is found.
+        Returns the stem (base filename without suffix) of the S57 file in the given data
+        paths, or the joined names of the data paths if they hold several S57 files.
+        Raises FileNotFoundError if no valid S57 file is found.
 
-        :return: The stem of the first valid S57 file or None.
+        :return: The name of the S57 source.
         """
-        for path in self._file_paths:
-            path = self.get_s57_file_path(path)
-            if path is not None:
-                return path.stem
-        raise FileNotFoundError("No valid S57 file found in the provided paths.")
+        cells = self._cell_paths
+        if not cells:
+            raise FileNotFoundError("No valid S57 file found in the provided paths.")
+        if len(cells) == 1:
+            return cells[0].stem
+        return "_".join(sorted(path.stem for path in self.paths))
+
+    @property
+    def _cache_crs(self) -> str:
+        return self.epsg.upper()
 
     @staticmethod
-    def __run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path) -> None:
+    def __run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path) -> bool:
         """
         Executes the ogr2ogr command to convert S57 files to shapefiles.
 
         :param ogr2ogr_cmd: Command to be executed for conversion.
         :param s57_file_path: Path to the input S57 file.
         :param shapefile_output_path: Path where the output shapefile will be saved.
+        :return: True if the conversion succeeded, False if ogr2ogr failed, was killed or is missing.
         """
         try:
             subprocess.run(ogr2ogr_cmd, check=True)
             print(f"Conversion successful: {s57_file_path} -> {shapefile_output_path}")
-        except subprocess.CalledProcessError as e:
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
             print(f"Error during conversion: {e}")
+            return False
 
     @staticmethod
-    def convert_s57_to_utm_shapefile(s57_file_path, shapefile_output_path, layer: str, epsg:str, bounding_box):
+    def convert_s57_to_utm_shapefile(s57_file_path, shapefile_output_path, layer: str, epsg:str, bounding_box,
+                                     append: bool = False, where: str | None = None) -> bool:
         """
         Converts a given layer from a S57 file to a UTM shapefile, clipping to the specified bounding box.
 
@@ -65,9 +119,13 @@ class S57Parser(DataParser):
         :param shapefile_output_path: Path where the output shapefile will be saved.
         :param layer: Layer type to be extracted (e.g., "LNDARE").
         :param epsg: EPSG code for the desired coordinate reference system.
-        :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax).
+        :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax),
+                             or WKT of a clipping polygon.
+        :param append: Optional; append to an existing shapefile, e.g. when merging several cells.
+        :param where: Optional; OGR SQL attribute predicate limiting which features are converted.
+        :return: True if the conversion succeeded.
         """
-        x_min, y_min, x_max, y_max = map(str, bounding_box)
+        clip = [bounding_box] if isinstance(bounding_box, str) else list(map(str, bounding_box))
         ogr2ogr_cmd = [
             'ogr2ogr',
             '-f', 'ESRI Shapefile',                 # Output format
@@ -75,14 +133,19 @@ class S57Parser(DataParser):
             s57_file_path,                          # Input S57 file
             layer,                                  # Converted layer name
             '-t_srs', epsg.upper(),                 # Target spatial reference system
-            '-clipdst', x_min, y_min, x_max, y_max, # Clipping to bounding box
+            '-clipdst', *clip,                      # Clipping to bounding box or polygon
             '-skipfailures'                         # Skip failures in processing
         ]
-        S57Parser.__run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path)
+        if where:
+            ogr2ogr_cmd.extend(['-where', where])   # Attribute filter
+        if append:
+            ogr2ogr_cmd.append('-append')           # Append to existing shapefile
+        return S57Parser.__run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path)
         
 
     @staticmethod
-    def convert_s57_depth_to_utm_shapefile(s57_file_path, shapefile_output_path, depth, epsg:str, bounding_box, next_depth = None):
+    def convert_s57_depth_to_utm_shapefile(s57_file_path, shapefile_output_path, depth, epsg:str, bounding_box,
+                                           next_depth = None, append: bool = False) -> bool:
         """
         Converts a S57 file DEPARE layer to a UTM shapefile based on specified depth criteria.
 
@@ -90,10 +153,13 @@ class S57Parser(DataParser):
         :param shapefile_output_path: Path where the output shapefile will be saved.
         :param depth: Minimum depth for filtering the data.
         :param epsg: EPSG code for the desired coordinate reference system.
-        :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax).
+        :param bounding_box: Tuple defining bounding box coordinates as (xmin, ymin, xmax, ymax),
+                             or WKT of a clipping polygon.
         :param next_depth: Optional; maximum depth for filtering the data.
+        :param append: Optional; append to an existing shapefile, e.g. when merging several cells.
+        :return: True if the conversion succeeded.
         """
-        x_min, y_min, x_max, y_max = map(str, bounding_box)
+        clip = [bounding_box] if isinstance(bounding_box, str) else list(map(str, bounding_box))
         query = f'SELECT * FROM DEPARE WHERE DRVAL1 >= {depth.__str__()}'
         if next_depth is not None:
             query += f' AND DRVAL1 < {next_depth.__str__()}'
@@ -104,10 +170,12 @@ class S57Parser(DataParser):
             s57_file_path,                          # Input S57 file
             '-sql', query,                          # SQL query for depth filtering
             '-t_srs', epsg.upper(),                 # Target spatial reference system
-            '-clipdst', x_min, y_min, x_max, y_max, # Clipping to bounding box
+            '-clipdst', *clip,                      # Clipping to bounding box or polygon
             '-skipfailures'                         # Skip failures in processing
         ]
-        S57Parser.__run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path)
+        if append:
+            ogr2ogr_cmd.append('-append')           # Append to existing shapefile
+        return S57Parser.__run_org2ogr(ogr2ogr_cmd, s57_file_path, shapefile_output_path)
 
     def parse_resources(
             self,
@@ -124,62 +192,617 @@ class S57Parser(DataParser):
         """
         if not self._valid_paths_and_resources(self.paths, resources, area): 
             return # interrupt parsing if paths are not valid
-        s57_path = None
-        for path in self._file_paths:
-            s57_path = self.get_s57_file_path(path)
-        s57_path = str(s57_path)
+        s57_paths = [str(path) for path in self._select_cells()]
+        if not s57_paths:
+            print("WARNING: No S57 cells intersect the bounding box.")
+            return
 
         # Separate Seabeds from rest of regions to extract depths from DEPARE correctly
         seabeds = [region for region in regions_list if isinstance(region, Seabed)]
         rest_of_regions = [region for region in regions_list if not isinstance(region, Seabed)]
-        
-        for index, region in enumerate(seabeds):
-            self._parse_S57_depth(index, region, s57_path, seabeds)
-        for region in rest_of_regions:
-            self._parse_S57_region(region, s57_path)
-        print(f"\rFinished processing {len(regions_list)} layers for S57 map at {s57_path}")
 
-    def _parse_S57_region(self, region: Layer, s57_path: str):
+        in_process = self.ingestion.in_process
+        if in_process and ogr is None:
+            print("WARNING: The GDAL Python bindings (osgeo) are not installed, "
+                  "so S57 cells are converted with ogr2ogr instead of in-process.")
+            in_process = False
+        if in_process:
+            self._parse_S57_cells(seabeds, rest_of_regions, s57_paths)
+        else:
+            if self.ingestion.single_pass_depths and seabeds:
+                self._parse_S57_depths(seabeds, s57_paths)
+            else:
+                for index, region in enumerate(seabeds):
+                    self._parse_S57_depth(index, region, s57_paths, seabeds)
+            for region in rest_of_regions:
+                self._parse_S57_region(region, s57_paths)
+        print(f"\rFinished processing {len(regions_list)} layers for {len(s57_paths)} S57 cell(s)")
+
+    def _parse_S57_region(self, region: Layer, s57_paths: list[str]):
         """
-        Parses a region from the S57 file and converts it to a shapefile.
+        Parses a region from the S57 files and converts it to a shapefile.
 
         :param region: Layer object representing the region to be parsed.
-        :param s57_path: Path to the input S57 file.
+        :param s57_paths: Paths to the input S57 files.
         """
         start_time = time.time()
         dest_path = self.__get_dest_path(region.label)
-
-        if isinstance(region, Land):
-            self.convert_s57_to_utm_shapefile(s57_path, dest_path, "LNDARE", self.epsg, self.bounding_box)
-        elif isinstance(region, Shore):
-            self.convert_s57_to_utm_shapefile(s57_path, dest_path, "COALNE", self.epsg, self.bounding_box)
-        else:
-            self.convert_s57_to_utm_shapefile(s57_path, dest_path, region.name, self.epsg, self.bounding_box)
-
+        layer_name = self._s57_layer_name(region)
+        for index, s57_path in enumerate(self._cells_with_layer(s57_paths, layer_name)):
+            if not self.convert_s57_to_utm_shapefile(s57_path, dest_path, layer_name, self.epsg,
+                                                     self._clip_of(s57_path), append=index > 0,
+                                                     where=self._layer_filter(region)):
+                self._discard_failed_conversion(region.label)
+                return
+        self._complete_layer(region.label)
         self.load_shapefiles(region)
         end_time = round(time.time() - start_time, 1)
         print(f"\rSaved {region.name} to shapefile in {end_time} s.")
 
-    def _parse_S57_depth(self, index: int, region: Seabed, s57_path: str, seabeds: list[Seabed]):
+    def _parse_S57_depth(self, index: int, region: Seabed, s57_paths: list[str], seabeds: list[Seabed]):
         """
-        Parses a seabed region (DEPARE) from the S57 file and converts it to a shapefile based on depth.
+        Parses a seabed region (DEPARE) from the S57 files and converts it to a shapefile based on depth.
 
         :param index: Index of the seabed region in the list.
         :param region: Seabed object representing the region to be parsed.
-        :param s57_path: Path to the input S57 file.
+        :param s57_paths: Paths to the input S57 files.
         :param seabeds: List of all seabed regions.
         """
         start_time = time.time()
         dest_path = self.__get_dest_path(region.label)
-        if index < len(seabeds) - 1:
-            next_depth = seabeds[index + 1].depth
-            self.convert_s57_depth_to_utm_shapefile(s57_path, dest_path, region.depth, self.epsg, self.bounding_box, next_depth)
-        else:
-            self.convert_s57_depth_to_utm_shapefile(s57_path, dest_path, region.depth, self.epsg, self.bounding_box)
+        next_depth = self._next_depth(region.depth, seabeds)
+        for cell_index, s57_path in enumerate(self._cells_with_layer(s57_paths, "DEPARE")):
+            if not self.convert_s57_depth_to_utm_shapefile(s57_path, dest_path, region.depth, self.epsg,
+                                                           self._clip_of(s57_path), next_depth,
+                                                           append=cell_index > 0):
+                self._discard_failed_conversion(region.label)
+                return
+        self._complete_layer(region.label)
         self.load_shapefiles(region)
         end_time = round(time.time() - start_time, 1)
         print(f"\rSaved {region.name} to shapefile in {end_time} s.")
 
+    def _parse_S57_depths(self, seabeds: list[Seabed], s57_paths: list[str]):
+        """
+        Parses all seabed regions from a single conversion of the S57 DEPARE layers,
+        assigning each depth area to its depth bin in one pass.
+
+        :param seabeds: List of seabed regions, sorted by depth.
+        :param s57_paths: Paths to the input S57 files.
+        """
+        start_time = time.time()
+        cached = self._read_raw_depth_areas(s57_paths)
+        if cached is not None:
+            schema, records = cached
+        else:
+            raw_path = self.__get_dest_path(_RAW_DEPTH_LABEL)
+            os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+            for stale_path in Path(raw_path).parent.glob(_RAW_DEPTH_LABEL + ".*"):
+                stale_path.unlink()
+            for index, s57_path in enumerate(self._cells_with_layer(s57_paths, "DEPARE")):
+                if not self.convert_s57_to_utm_shapefile(s57_path, raw_path, "DEPARE", self.epsg,
+                                                         self._clip_of(s57_path), append=index > 0):
+                    self._discard_failed_conversion(_RAW_DEPTH_LABEL)
+                    return
+            if not os.path.exists(raw_path):
+                return
+            self._complete_layer(_RAW_DEPTH_LABEL)
+            with fiona.open(raw_path, "r") as source:
+                schema = source.schema["properties"]
+                records = list(source)
+            self._write_raw_depth_metadata(s57_paths)
+
+        self._ingest_depth_areas(seabeds, schema, records)
+        end_time = round(time.time() - start_time, 1)
+        print(f"\rSaved {len(seabeds)} seabed layers to shapefiles in {end_time} s.")
+
+    def _cells_with_layer(self, s57_paths: list[str], layer_name: str) -> list[str]:
+        """
+        Selects the S57 cells containing the given object class according to the layer
+        inventory of the resource catalogue, as ogr2ogr fails for cells without it. Cells
+        without a recorded inventory are kept.
+
+        :param s57_paths: Paths to the input S57 files.
+        :param layer_name: Name of the S57 layer, e.g. "DEPARE".
+        :return: List of paths to the cells that may contain the layer.
+        """
+        return [
+            s57_path for s57_path in s57_paths
+            if not self.catalogue.layers(Path(s57_path)) or layer_name in self.catalogue.layers(Path(s57_path))
+        ]
+
+    def _discard_failed_conversion(self, label: str) -> None:
+        """
+        Discards the partial shapefile of a layer whose conversion of a cell containing it
+        failed, leaving the layer without a completion manifest such that it is parsed again
+        on the next run.
+
+        :param label: Label of the layer.
+        """
+        print(f"WARNING: Conversion of {label} failed, so it is left incomplete.")
+        self._discard_incomplete(label)
+
+    def _next_depth(self, depth: int, seabeds: list[Seabed]) -> int | None:
+        """
+        Returns the upper limit of the depth bin starting at the given depth, i.e. the next
+        configured depth, or the next depth among the given seabed regions.
+
+        :param depth: Minimum depth of the bin.
+        :param seabeds: List of seabed regions being parsed.
+        :return: The next depth, or None for the deepest bin.
+        """
+        deeper = [d for d in {*self.depths, *(region.depth for region in seabeds)} if d > depth]
+        return min(deeper) if deeper else None
+
+    def _raw_depth_state(self, s57_paths: list[str]) -> dict:
+        """
+        Describes the source of the raw depth area cache, i.e. the S57 cells with their
+        latest update numbers and the clipping area of each cell.
+
+        :param s57_paths: Paths to the input S57 files.
+        :return: Dictionary describing the cells and clipping areas.
+        """
+        cells = {}
+        for s57_path in s57_paths:
+            updates = cell_updates(Path(s57_path))
+            cells[Path(s57_path).stem] = updates[-1][0] if updates else 0
+        return dict(cells=cells, clips=[str(self._clip_of(s57_path)) for s57_path in s57_paths])
+
+    def _raw_depth_metadata(self) -> dict:
+        """
+        Reads the metadata of the raw depth area cache.
+
+        :return: Dictionary with the cache 'state' and the 'bins' of written seabed layers.
+        """
+        metadata_path = self._shapefile_dir_path(_RAW_DEPTH_LABEL) / "metadata.json"
+        if not metadata_path.exists():
+            return {}
+        with open(metadata_path) as metadata_file:
+            return json.load(metadata_file)
+
+    def _write_raw_depth_metadata(self, s57_paths: list[str] | None = None, bins: dict | None = None) -> None:
+        """
+        Updates the metadata of the raw depth area cache with a new cache state, or with the
+        depth bins of newly written seabed layers.
+
+        :param s57_paths: Optional paths to the S57 files the raw depth areas were read from.
+        :param bins: Optional dictionary mapping seabed labels to their [depth, next depth] bin.
+        """
+        metadata = self._raw_depth_metadata()
+        if s57_paths is not None:
+            metadata["state"] = self._raw_depth_state(s57_paths)
+        if bins is not None:
+            metadata.setdefault("bins", {}).update(bins)
+        directory = self._shapefile_dir_path(_RAW_DEPTH_LABEL)
+        directory.mkdir(exist_ok=True)
+        with open(directory / "metadata.json", "w") as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+    def _write_raw_depth_areas(self, schema: dict, depth_areas: list[dict], s57_paths: list[str]) -> None:
+        """
+        Caches the raw clipped depth areas (with their DRVAL1 and DRVAL2 values), from which
+        any set of depth bins can later be derived without reading the S57 cells again.
+
+        :param schema: Shapefile properties schema of the DEPARE records.
+        :param depth_areas: List of reprojected and clipped DEPARE records.
+        :param s57_paths: Paths to the S57 files the depth areas were read from.
+        """
+        if not depth_areas:
+            return
+        self._shapefile_dir_path(_RAW_DEPTH_LABEL).mkdir(exist_ok=True)
+        self._write_records_to_shapefile(_RAW_DEPTH_LABEL, schema, depth_areas)
+        self._write_raw_depth_metadata(s57_paths)
+
+    def _read_raw_depth_areas(self, s57_paths: list[str]) -> tuple[dict, list[dict]] | None:
+        """
+        Reads the cached raw depth areas, if they were read from the same S57 cells, updates
+        and clipping areas as the given ones.
+
+        :param s57_paths: Paths to the input S57 files.
+        :return: Tuple of the shapefile properties schema and the DEPARE records, or None.
+        """
+        raw_path = self._layer_path(_RAW_DEPTH_LABEL)
+        if not self._is_complete(_RAW_DEPTH_LABEL):
+            return None
+        if self._raw_depth_metadata().get("state") != self._raw_depth_state(s57_paths):
+            return None
+        columnar = self._read_columnar_cache(_RAW_DEPTH_LABEL)
+        quantized = self._read_quantized_cache(_RAW_DEPTH_LABEL)
+        if columnar is not None:
+            schema = dict(read_columnar_schema(raw_path)["properties"])
+            records = list(columnar[0])
+        elif quantized is not None:
+            schema = dict(read_quantized_schema(raw_path)["properties"])
+            records = list(quantized)
+        else:
+            with fiona.open(raw_path, "r") as source:
+                schema = dict(source.schema["properties"])
+                records = list(source)
+        print(f"\rRead {len(records)} cached depth areas.")
+        return schema, records
+
+    def _record_depth_bins(self, seabeds: list[Seabed]) -> None:
+        """
+        Records the depth bin of each written seabed layer in the raw depth area cache, so
+        that layers binned with other configured depths are parsed again.
+
+        :param seabeds: List of written seabed regions.
+        """
+        bins = {region.label: [region.depth, self._next_depth(region.depth, seabeds)] for region in seabeds}
+        self._write_raw_depth_metadata(bins=bins)
+
+    def _rebinned_regions(self, regions: list[Layer]) -> list[Layer]:
+        """
+        Finds the loaded seabed regions whose recorded depth bin differs from the bin given by
+        the configured depths, e.g. after adding a depth between two existing ones.
+
+        :param regions: List of Layer objects representing loaded regions.
+        :return: List of the seabed regions to be binned again.
+        """
+        bins = self._raw_depth_metadata().get("bins", {})
+        seabeds = [region for region in regions if isinstance(region, Seabed)]
+        return [
+            region for region in seabeds
+            if region.label in bins and bins[region.label] != [region.depth, self._next_depth(region.depth, seabeds)]
+        ]
+
+    @staticmethod
+    def _depth_bin_indices(values: list[float | None], depths: list[int]) -> np.ndarray:
+        """
+        Finds the depth bin of each minimum depth (DRVAL1) value, such that a value v is
+        assigned to bin i when depths[i] <= v < depths[i + 1], using a vectorized search.
+
+        :param values: List of minimum depth values, where None marks a missing value.
+        :param depths: Sorted list of depth bin limits.
+        :return: Array of bin indices, with -1 for values outside all bins.
+        """
+        values = np.array([np.nan if v is None else v for v in values], dtype=float)
+        indices = np.searchsorted(np.asarray(depths, dtype=float), values, side="right") - 1
+        indices[np.isnan(values)] = -1
+        return indices
+
+    @staticmethod
+    def _layer_filter(region: Layer) -> str | None:
+        """
+        Builds the OGR SQL attribute filter of a region from its configured attribute predicate
+        and geometry type, using the OGR_GEOMETRY special field for the latter.
+
+        :param region: Layer object to build the filter of.
+        :return: The attribute filter, or None if the region has no filters.
+        """
+        clauses = []
+        if getattr(region, "where", None):
+            clauses.append(f"({region.where})")
+        if getattr(region, "geometry_type", None):
+            geometry_type = region.geometry_type.upper()
+            clauses.append(f"OGR_GEOMETRY IN ('{geometry_type}', 'MULTI{geometry_type}')")
+        return " AND ".join(clauses) or None
+
+    @staticmethod
+    def _s57_layer_name(region: Layer) -> str:
+        """
+        Returns the S57 object class (layer name) holding the features of the given region.
+
+        :param region: Layer object representing the region to be parsed.
+        :return: Name of the S57 layer, e.g. "LNDARE" for land.
+        """
+        if isinstance(region, Land):
+            return "LNDARE"
+        elif isinstance(region, Shore):
+            return "COALNE"
+        elif isinstance(region, Seabed):
+            return "DEPARE"
+        return region.name
+
+    def _parse_S57_cells(self, seabeds: list[Seabed], regions: list[Layer], s57_paths: list[str]) -> None:
+        """
+        Parses all requested regions from the given S57 cells in-process, opening each cell
+        only once. Cells are read in parallel, and their features are merged per layer.
+
+        Features of every requested object class are reprojected, clipped and binned in memory,
+        loaded directly into their Layer objects, and written to shapefiles as a side effect.
+
+        :param seabeds: List of seabed regions, extracted from the DEPARE layer by depth.
+        :param regions: List of other regions, each extracted from its own S57 layer.
+        :param s57_paths: Paths to the input S57 files.
+        """
+        start_time = time.time()
+        layer_names = [self._s57_layer_name(region) for region in regions]
+        cached = self._read_raw_depth_areas(s57_paths) if seabeds else None
+        if seabeds and cached is None:
+            layer_names.append("DEPARE")
+        filters = {self._s57_layer_name(region): self._layer_filter(region) for region in regions}
+        cells = self._read_s57_cells(s57_paths, list(dict.fromkeys(layer_names)), filters)
+        layers = self._merge_s57_cells(cells)
+        end_time = round(time.time() - start_time, 1)
+        print(f"\rRead {len(layers)} layers from {len(s57_paths)} S57 cell(s) in {end_time} s.")
+
+        if seabeds:
+            start_time = time.time()
+            if cached is not None:
+                schema, depth_areas = cached
+            else:
+                schema, depth_areas = layers.get("DEPARE", ({}, []))
+                self._write_raw_depth_areas(schema, depth_areas, s57_paths)
+            depth_areas = self._simplify_records(depth_areas, self._tolerance(seabeds[0]), "Seabed", True)
+            if self.ingestion.single_pass_depths:
+                self._ingest_depth_areas(seabeds, schema, depth_areas)
+            else:
+                for region in seabeds:
+                    next_depth = self._next_depth(region.depth, seabeds)
+                    records = [r for r in depth_areas if self._in_depth_bin(r, region.depth, next_depth)]
+                    self._ingest_records(region, schema, records)
+            end_time = round(time.time() - start_time, 1)
+            print(f"\rSaved {len(seabeds)} seabed layers to shapefiles in {end_time} s.")
+
+        for region in regions:
+            start_time = time.time()
+            schema, records = layers.get(self._s57_layer_name(region), ({}, []))
+            records = self._simplify_records(records, self._tolerance(region), region.name)
+            self._ingest_records(region, schema, records)
+            end_time = round(time.time() - start_time, 1)
+            print(f"\rSaved {region.name} to shapefile in {end_time} s.")
+
+    def _read_s57_cells(self, s57_paths: list[str], layer_names: list[str],
+                        filters: dict[str, str | None] | None = None) -> list[dict]:
+        """
+        Reads the given layers from each S57 cell, using a worker process per cell.
+
+        :param s57_paths: Paths to the input S57 files.
+        :param layer_names: Names of the S57 layers to read.
+        :param filters: Optional dictionary mapping layer names to OGR SQL attribute filters.
+        :return: List of dictionaries, one per cell, mapping layer names to schema and records.
+        """
+        reader = partial(self._read_s57_cell, layer_names=layer_names, epsg=self.epsg, filters=filters)
+        clips = [self._clip_of(s57_path) for s57_path in s57_paths]
+        workers = min(self.ingestion.workers, len(s57_paths))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(reader, s57_paths, clips))
+        return list(map(reader, s57_paths, clips))
+
+    @staticmethod
+    def _merge_s57_cells(cells: list[dict]) -> dict[str, tuple[dict, list[dict]]]:
+        """
+        Merges the layers read from several S57 cells, dropping duplicate features, i.e.
+        features with the same long name (LNAM) and geometry found in more than one cell.
+
+        :param cells: List of dictionaries, one per cell, mapping layer names to schema and records.
+        :return: Dictionary mapping layer names to merged schema and records.
+        """
+        if len(cells) == 1:
+            return cells[0]
+        layers, seen = {}, {}
+        for cell in cells:
+            for name, (schema, records) in cell.items():
+                merged_schema, merged_records = layers.setdefault(name, ({}, []))
+                merged_schema.update(schema)
+                keys = seen.setdefault(name, set())
+                for record in records:
+                    key = record["properties"].get("LNAM"), json.dumps(record["geometry"])
+                    if key not in keys:
+                        keys.add(key)
+                        merged_records.append(record)
+        return layers
+
+    @staticmethod
+    def _read_s57_cell(s57_path: str, clip: tuple[int, int, int, int] | str, layer_names: list[str],
+                       epsg: str, filters: dict[str, str | None] | None = None) -> dict[str, tuple[dict, list[dict]]]:
+        """
+        Reads the given layers from a S57 cell in-process, opening the cell only once.
+
+        :param s57_path: Path to the input S57 file.
+        :param clip: Bounding box as (xmin, ymin, xmax, ymax), or WKT of a clipping polygon.
+        :param layer_names: Names of the S57 layers to read.
+        :param epsg: EPSG code for the desired coordinate reference system.
+        :param filters: Optional dictionary mapping layer names to OGR SQL attribute filters.
+        :return: Dictionary mapping layer names to their schema and reprojected, clipped records.
+        """
+        filters = filters or {}
+        try:
+            source = ogr.Open(s57_path)
+        except RuntimeError as e:
+            print(f"Error opening S57 file {s57_path}: {e}")
+            return {}
+        target = S57Parser._target_reference(epsg)
+        return {
+            name: S57Parser._read_s57_layer(source, name, target, clip, filters.get(name))
+            for name in layer_names
+        }
+
+    @staticmethod
+    def _target_reference(epsg: str) -> "osr.SpatialReference":
+        """
+        Creates the spatial reference of the given EPSG code, using (x, y) axis order.
+
+        :param epsg: EPSG code for the desired coordinate reference system.
+        :return: The target spatial reference.
+        """
+        reference = osr.SpatialReference()
+        reference.SetFromUserInput(epsg.upper())
+        reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        return reference
+
+    @staticmethod
+    def _read_s57_layer(source: "ogr.DataSource", layer_name: str, target: "osr.SpatialReference",
+                        clip: tuple[int, int, int, int] | str, where: str | None = None) -> tuple[dict, list[dict]]:
+        """
+        Reads the features of a S57 layer as records, reprojected to the target reference and
+        clipped to the bounding box, equivalent to the ogr2ogr '-t_srs', '-clipdst' and
+        '-where' options. Features failing the attribute filter are skipped by OGR.
+
+        :param source: Opened S57 data source.
+        :param layer_name: Name of the S57 layer to read.
+        :param target: Target spatial reference.
+        :param clip: Bounding box as (xmin, ymin, xmax, ymax), or WKT of a clipping polygon.
+        :param where: Optional OGR SQL attribute filter of the features to read.
+        :return: Tuple of the shapefile properties schema and the list of records.
+        """
+        layer = source.GetLayerByName(layer_name)
+        if layer is None:
+            print(f"Warning: {layer_name} not found in data set.")
+            return {}, []
+        reference = layer.GetSpatialRef()
+        if reference is None:
+            reference = osr.SpatialReference()
+            reference.SetFromUserInput("EPSG:4326")
+        reference = reference.Clone()
+        reference.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        transformation = osr.CoordinateTransformation(reference, target)
+
+        if isinstance(clip, str):
+            clip_box = ogr.CreateGeometryFromWkt(clip)
+        else:
+            x_min, y_min, x_max, y_max = clip
+            clip_box = ogr.CreateGeometryFromWkt(
+                f"POLYGON (({x_min} {y_min}, {x_max} {y_min}, {x_max} {y_max}, "
+                f"{x_min} {y_max}, {x_min} {y_min}))"
+            )
+        x_min, x_max, y_min, y_max = clip_box.GetEnvelope()
+        spatial_filter = clip_box.Clone()
+        spatial_filter.Segmentize(max(x_max - x_min, y_max - y_min) / 16)
+        spatial_filter.Transform(osr.CoordinateTransformation(target, reference))
+        layer.SetSpatialFilter(spatial_filter)
+        layer.SetAttributeFilter(where)
+        layer.ResetReading()
+
+        definition = layer.GetLayerDefn()
+        fields = [definition.GetFieldDefn(i) for i in range(definition.GetFieldCount())]
+        schema = {f.GetName(): _FIELD_TYPES.get(f.GetTypeName(), "str:254") for f in fields}
+        records = []
+        for feature in layer:
+            geometry = feature.GetGeometryRef()
+            if geometry is None:
+                continue
+            geometry = geometry.Clone()
+            geometry.Transform(transformation)
+            geometry = geometry.Intersection(clip_box)
+            if geometry is None or geometry.IsEmpty():
+                continue
+            properties = {}
+            for i, field in enumerate(fields):
+                if not feature.IsFieldSetAndNotNull(i):
+                    properties[field.GetName()] = None
+                elif field.GetTypeName() in _LIST_FIELD_TYPES:
+                    properties[field.GetName()] = feature.GetFieldAsString(i)
+                else:
+                    properties[field.GetName()] = feature.GetField(i)
+            records.append(dict(
+                type="Feature",
+                properties=properties,
+                geometry=json.loads(geometry.ExportToJson()),
+            ))
+        layer.SetSpatialFilter(None)
+        layer.SetAttributeFilter(None)
+        return schema, records
+
+    @staticmethod
+    def _in_depth_bin(record: dict, depth: int, next_depth: int | None) -> bool:
+        """
+        Checks if the minimum depth (DRVAL1) of a DEPARE record falls within a depth bin.
+
+        :param record: DEPARE record to be checked.
+        :param depth: Minimum depth of the bin.
+        :param next_depth: Optional; depth of the next bin, acting as upper limit.
+        :return: True if the record belongs to the bin, otherwise False.
+        """
+        value = record["properties"].get("DRVAL1")
+        if value is None or value < depth:
+            return False
+        return next_depth is None or value < next_depth
+
+    def _ingest_depth_areas(self, seabeds: list[Seabed], schema: dict, depth_areas: list[dict]) -> None:
+        """
+        Assigns each depth area to its depth bin in a single pass, writes each bin to the
+        shapefile of its seabed region and merges the bins in parallel. Bins are bounded by
+        all configured depths, such that any subset of seabed regions may be (re-)binned.
+
+        :param seabeds: List of seabed regions, sorted by depth.
+        :param schema: Shapefile properties schema of the DEPARE records.
+        :param depth_areas: List of reprojected and clipped DEPARE records.
+        """
+        depths = sorted(set(self.depths) | {region.depth for region in seabeds})
+        indices = self._depth_bin_indices([r["properties"].get("DRVAL1") for r in depth_areas], depths)
+        bins = [[] for _ in depths]
+        for record, index in zip(depth_areas, indices):
+            if index >= 0:
+                bins[index].append(record)
+        layer_records = [
+            (region, self._write_records_to_shapefile(region.label, schema, bins[depths.index(region.depth)]))
+            for region in seabeds if bins[depths.index(region.depth)]
+        ]
+        self._load_records_in_parallel(layer_records)
+        self._record_depth_bins(seabeds)
+
+    def _simplify_records(self, records: list[dict], tolerance: float, name: str,
+                          coverage: bool = False) -> list[dict]:
+        """
+        Simplifies the geometries of records with the given tolerance, preserving topology.
+        Depth areas are simplified as a coverage before binning, such that the edges shared
+        by adjacent depth bands stay identical in every seabed layer.
+
+        :param records: List of reprojected and clipped records.
+        :param tolerance: Simplification tolerance, where 0 leaves the records unchanged.
+        :param name: Name of the layer the records belong to, for reporting.
+        :param coverage: True if the record geometries are polygons forming a coverage.
+        :return: List of records with simplified geometries.
+        """
+        if tolerance <= 0 or not records:
+            return records
+        geometries = self._simplify([geo.shape(r["geometry"]) for r in records], tolerance, name, coverage)
+        return [
+            dict(record, geometry=geo.mapping(geometry))
+            for record, geometry in zip(records, geometries) if not geometry.is_empty
+        ]
+
+    def _ingest_records(self, region: Layer, schema: dict, records: list[dict]) -> None:
+        """
+        Writes records to the shapefile of the given region and loads them into its geometry.
+
+        :param region: Layer object to load the records into.
+        :param schema: Shapefile properties schema of the records.
+        :param records: List of reprojected and clipped records.
+        """
+        if not records:
+            return
+        records = self._write_records_to_shapefile(region.label, schema, records)
+        self._load_records(region, records)
+
+    def _write_records_to_shapefile(self, label: str, schema: dict, records: list[dict]) -> list[dict]:
+        """
+        Writes records to the shapefile (or the columnar file) of the given label, mirroring
+        ogr2ogr with the '-skipfailures' option: the layer takes the geometry type of the first
+        record, and records of other geometry types are skipped.
+
+        :param label: Label of the region the records belong to.
+        :param schema: Shapefile properties schema of the records.
+        :param records: List of records to be written, snapped to the precision grid if configured.
+        :return: List of all written records.
+        """
+        types = [r["geometry"]["type"].removeprefix("Multi") for r in records]
+        geometry_type = next((t for t in types if t in _SHAPEFILE_TYPES), None)
+        if geometry_type is None:
+            return []
+        records = [r for r, t in zip(records, types) if t == geometry_type]
+        if geometry_type == "Point" and any(r["geometry"]["type"] == "MultiPoint" for r in records):
+            # Shapefiles store points and multipoints (e.g. soundings) as separate shape types
+            geometry_type = "MultiPoint"
+            records = [dict(r, geometry=geo.mapping(geo.MultiPoint([geo.shape(r["geometry"])])))
+                       if r["geometry"]["type"] == "Point" else r for r in records]
+        geometries = [geo.shape(r["geometry"]) for r in records]
+        if self.ingestion.precision is not None:
+            geometries = self._quantize(geometries)
+            kept = [(dict(r, geometry=geo.mapping(g)), g) for r, g in zip(records, geometries) if not g.is_empty]
+            records, geometries = [r for r, _ in kept], [g for _, g in kept]
+        properties = {name: [r["properties"].get(name) for r in records] for name in schema}
+        full_schema = dict(geometry=geometry_type, properties=schema)
+        if not self._write_layer_cache(label, geometries, properties, schema=full_schema):
+            with fiona.open(self.__get_dest_path(label), "w", driver="ESRI Shapefile",
+                            schema=full_schema, crs=self.epsg.upper()) as sink:
+                sink.writerecords(records)
+        self._complete_layer(label)
+        return records
+
     def __get_dest_path(self, region_label):
         """
         Generates the destination path for saving the shapefile based on the region label.
@@ -193,16 +816,345 @@ class S57Parser(DataParser):
     @staticmethod
     def get_s57_file_path(path: Path) -> Path | None:
         """
-        Retrieves the path of the first S57 file (with .000 extension) in the given directory.
+        Retrieves the path of the first S57 file (with .000 extension) in the given directory,
+        or the path itself if it is a S57 file.
 
         :param path: Path to the directory to be searched.
         :return: Path to the found S57 file, or None if no valid file is found.
         """
+        if path.is_file():
+            return path if path.suffix == ".000" else None
         for p in path.iterdir():
             if p.suffix == ".000":
                 return p
         return None
 
+    @property
+    def _cell_paths(self) -> list[Path]:
+        """
+        Retrieves the paths of all S57 cells (files with .000 extension) in the given data paths,
+        as recorded in the resource catalogue.
+
+        :return: Sorted list of S57 file paths.
+        """
+        return list(self._file_paths)
+
+    def _is_source(self, path: Path) -> bool:
+        """
+        Determines if a path is a S57 cell, i.e. a base cell file with .000 extension.
+
+        :param path: Path to be checked.
+        :return: True if the path is a S57 cell, otherwise False.
+        """
+        return path.suffix == ".000" and not path.is_dir()
+
+    def _describe_sources(self, sources: list[Path]) -> dict[Path, dict]:
+        """
+        Describes S57 cells for the resource catalogue, with their geographic bounds from the
+        exchange set catalogues (CATALOG.031), or from the extent of their coverage (M_COVR)
+        if not catalogued, their coverage as the union of their M_COVR polygons of data
+        coverage (CATCOV=1) in WKT, and the object classes (layers) they contain.
+
+        :param sources: List of paths to the S57 cells.
+        :return: Dictionary mapping cell paths to their 'bounds', 'coverage' and 'layers'.
+        """
+        bounds = self._catalog_bounds(sources)
+        descriptions = {}
+        for cell in sources:
+            cell_bounds, coverage, layer_names = bounds.get(cell.resolve()), None, []
+            try:
+                layer_names = fiona.listlayers(cell)
+            except fiona.errors.FionaError as error:
+                print(f"WARNING: Could not catalogue S57 cell {cell}: {error}")
+            if "M_COVR" in layer_names:
+                coverage = self._read_coverage(cell)
+            if cell_bounds is None and coverage is not None:
+                cell_bounds = shapely.from_wkt(coverage).bounds
+            descriptions[cell] = dict(bounds=cell_bounds, coverage=coverage, layers=layer_names)
+        return descriptions
+
+    @staticmethod
+    def _read_coverage(cell: Path) -> str | None:
+        """
+        Reads the data coverage of a S57 cell, i.e. the union of its M_COVR polygons with
+        CATCOV=1, leaving out the polygons marking areas without data (CATCOV=2).
+
+        :param cell: Path to the S57 cell.
+        :return: Coverage in geographic coordinates as WKT, or None if the cell has none.
+        """
+        try:
+            with fiona.open(cell, layer="M_COVR") as source:
+                polygons = [
+                    geo.shape(record["geometry"]) for record in source
+                    if record["geometry"] is not None and record["properties"].get("CATCOV") == 1
+                ]
+        except (fiona.errors.FionaError, ValueError) as error:
+            print(f"WARNING: Could not read the coverage of S57 cell {cell}: {error}")
+            return None
+        coverage = shapely.union_all(polygons)
+        return coverage.wkt if not coverage.is_empty else None
+
+    def _sources_in_bounding_box(self) -> list[Path]:
+        """
+        Selects the S57 cells whose catalogued bounds, in geographic coordinates, intersect
+        the bounding box, without opening the cells. Cells without bounds are kept.
+
+        :return: List of paths to the selected S57 files.
+        """
+        transformer = Transformer.from_crs("EPSG:4326", self.epsg.upper(), always_xy=True)
+        x_min, y_min, x_max, y_max = self.bounding_box
+        selected = []
+        for cell in self._cell_paths:
+            cell_bounds = self.catalogue.bounds(cell)
+            if cell_bounds is not None:
+                c_x_min, c_y_min, c_x_max, c_y_max = transformer.transform_bounds(*cell_bounds)
+                if c_x_max < x_min or c_x_min > x_max or c_y_max < y_min or c_y_min > y_max:
+                    continue
+            selected.append(cell)
+        return selected
+
+    def _select_cells(self) -> list[Path]:
+        """
+        Selects the S57 cells intersecting the bounding box, using the cell bounds recorded in
+        the resource catalogue, without opening the cells. Cells without bounds are kept.
+
+        :return: List of paths to the selected S57 files.
+        """
+        cells = self._cell_paths
+        selected = self._sources_in_bounding_box()
+        print(f"Selected {len(selected)} of {len(cells)} S57 cell(s) intersecting the bounding box.")
+        if self.ingestion.best_scale:
+            transformer = Transformer.from_crs("EPSG:4326", self.epsg.upper(), always_xy=True)
+            coverages = {cell: self._cell_coverage(cell, transformer) for cell in selected}
+            regions = self._mosaic_regions(selected, coverages)
+            self._clip_regions = {str(cell): region.wkt for cell, region in regions.items()}
+            selected = [cell for cell in selected if cell in regions]
+            print(f"Kept {len(selected)} S57 cell(s) in the best-scale coverage mosaic.")
+        return selected
+
+    def _cell_coverage(self, cell: Path, transformer: Transformer) -> Any | None:
+        """
+        Returns the coverage of a S57 cell in the target reference, from its catalogued
+        M_COVR polygons, or approximated by its catalogued bounds if it has none.
+
+        :param cell: Path to the S57 file.
+        :param transformer: Transformer from geographic coordinates to the target reference.
+        :return: Shapely polygon or multipolygon of the coverage, or None if unknown.
+        """
+        coverage = self.catalogue.coverage(cell)
+        if coverage is not None:
+            def transform(coordinates: np.ndarray) -> np.ndarray:
+                return np.column_stack(transformer.transform(coordinates[:, 0], coordinates[:, 1]))
+            return shapely.transform(shapely.from_wkt(coverage), transform)
+        cell_bounds = self.catalogue.bounds(cell)
+        if cell_bounds is not None:
+            return geo.box(*transformer.transform_bounds(*cell_bounds))
+        return None
+
+    def _mosaic_regions(self, cells: list[Path], coverages: dict[Path, Any]) -> dict[Path, geo.Polygon]:
+        """
+        Precomputes a coverage mosaic of the bounding box, assigning each part of it to the
+        cell of the best (most detailed) usage band covering it. If a display scale is given,
+        cells more detailed than needed for that scale are left out of the mosaic.
+
+        Cells without a known coverage are assumed to cover the whole bounding box.
+
+        :param cells: List of S57 file paths intersecting the bounding box.
+        :param coverages: Dictionary mapping S57 file paths to their coverage in the target reference.
+        :return: Dictionary mapping the paths of cells in the mosaic to their clipping regions.
+        """
+        band_limit = max(USAGE_BANDS)
+        if self.ingestion.display_scale is not None:
+            band_limit = scale_usage_band(self.ingestion.display_scale)
+        extent = geo.box(*self.bounding_box)
+        covered = geo.Polygon()
+        regions = {}
+        for cell in sorted(cells, key=lambda c: cell_usage_band(c), reverse=True):
+            if cell_usage_band(cell) > band_limit:
+                continue
+            coverage = coverages.get(cell)
+            coverage = extent if coverage is None else coverage.intersection(extent)
+            region = coverage.difference(covered)
+            if region.area > 0:
+                regions[cell] = region
+                covered = covered.union(coverage)
+        return regions
+
+    def _clip_of(self, s57_path: str) -> tuple[int, int, int, int] | str:
+        """
+        Returns the clipping region of a S57 cell: its part of the coverage mosaic as WKT if
+        best-scale selection is enabled, otherwise the bounding box.
+
+        :param s57_path: Path to the S57 file.
+        :return: Bounding box as (xmin, ymin, xmax, ymax), or WKT of the clipping polygon.
+        """
+        return self._clip_regions.get(s57_path, self.bounding_box)
+
+    @staticmethod
+    def _catalog_bounds(cells: list[Path]) -> dict[Path, tuple[float, float, float, float]]:
+        """
+        Reads the cell bounds from the exchange set catalogues next to or above the given cells.
+
+        :param cells: List of S57 file paths.
+        :return: Dictionary mapping resolved S57 file paths to (west, south, east, north) bounds.
+        """
+        bounds = {}
+        directories = {directory for cell in cells for directory in (cell.parent, cell.parent.parent)}
+        for directory in directories:
+            catalog_path = directory / CATALOG_NAME
+            if catalog_path.is_file():
+                bounds.update(read_cell_bounds(catalog_path))
+        return bounds
+
+    def updated_regions(self, regions: list[Layer]) -> list[Layer]:
+        """
+        Finds the regions touched by pending S57 update files (.001, .002, ...), i.e. update
+        files of the cells that have not been applied to the shapefiles yet. A region is touched
+        if an update changes a feature of its object class, or the geometry of such a feature.
+
+        Seabed regions binned with other configured depths are also returned, to be binned
+        again from the cached raw depth areas.
+
+        :param regions: List of Layer objects representing loaded regions.
+        :return: List of the regions touched by pending updates.
+        """
+        rebinned = self._rebinned_regions(regions)
+        pending = self._pending_updates()
+        if not pending or not regions:
+            return rebinned
+        layer_names = {self._s57_layer_name(region) for region in regions}
+        touched = self._touched_layer_names(pending, layer_names)
+        return [
+            region for region in regions if self._s57_layer_name(region) in touched or region in rebinned
+        ]
+
+    def record_applied_updates(self, regions: list[Layer]) -> None:
+        """
+        Records the number of the last update file of each S57 cell as applied, since GDAL
+        applies all update files when reading a cell.
+
+        The pending updates of a cell are only recorded once every given region they touch is
+        completely written, i.e. has a valid completion manifest, or has no files at all (e.g.
+        without features in the bounding box). Updates touching regions whose parsing failed
+        or was interrupted thus stay pending, and these regions are parsed again.
+
+        :param regions: List of Layer objects representing the featured regions.
+        """
+        applied, pending = self._applied_updates(), self._pending_updates()
+        unfinished = {
+            self._s57_layer_name(region) for region in regions
+            if not self._is_complete(region.label) and self._layer_files(region.label)
+        }
+        state = {}
+        for cell in self._cell_paths:
+            updates = cell_updates(cell)
+            state[cell.stem] = updates[-1][0] if updates else 0
+            if cell in pending and unfinished and self._touched_layer_names({cell: pending[cell]}, unfinished):
+                state[cell.stem] = applied.get(cell.stem, 0)
+        if state != applied:
+            with open(self._updates_state_path(), "w") as state_file:
+                json.dump(state, state_file, indent=2)
+
+    @staticmethod
+    def _updates_state_path() -> Path:
+        """
+        Returns the path of the file recording the applied update numbers of each S57 cell.
+
+        :return: Path to the update state file next to the shapefiles.
+        """
+        return paths.shapefiles / "s57_updates.json"
+
+    def _applied_updates(self) -> dict[str, int]:
+        """
+        Reads the number of the last applied update file of each S57 cell.
+
+        :return: Dictionary mapping cell names to update numbers.
+        """
+        state_path = self._updates_state_path()
+        if not state_path.exists():
+            return {}
+        with open(state_path) as state_file:
+            return json.load(state_file)
+
+    def _pending_updates(self) -> dict[Path, list[Path]]:
+        """
+        Finds the update files of each S57 cell that have not been applied yet.
+
+        :return: Dictionary mapping S57 file paths to their pending update files.
+        """
+        applied = self._applied_updates()
+        pending = {}
+        for cell in self._cell_paths:
+            updates = [path for number, path in cell_updates(cell) if number > applied.get(cell.stem, 0)]
+            if updates:
+                pending[cell] = updates
+        return pending
+
+    def _touched_layer_names(self, pending: dict[Path, list[Path]], layer_names: set[str]) -> set[str]:
+        """
+        Finds which of the given S57 layers are touched by the pending update files.
+
+        If the object class codes cannot be resolved, all layers are considered touched.
+
+        :param pending: Dictionary mapping S57 file paths to their pending update files.
+        :param layer_names: Set of S57 layer names to be checked.
+        :return: Set of the touched S57 layer names.
+        """
+        acronyms = self._object_class_acronyms()
+        if acronyms is None:
+            return layer_names
+        touched = set()
+        for cell, updates in pending.items():
+            vectors = set()
+            for update in updates:
+                object_classes, update_vectors = read_update_changes(update)
+                touched.update(acronyms.get(code) for code in object_classes)
+                vectors |= update_vectors
+            remaining = sorted(layer_names - touched)
+            if vectors and remaining:
+                touched |= self._linked_layer_names(str(cell), remaining, vectors)
+        return touched & layer_names
+
+    @staticmethod
+    def _object_class_acronyms() -> dict[int, str] | None:
+        """
+        Reads the S57 object class acronyms of each object class code from the GDAL data files.
+
+        :return: Dictionary mapping object class codes to acronyms, or None if not found.
+        """
+        data_path = GDALDataFinder().search()
+        csv_path = Path(data_path) / "s57objectclasses.csv" if data_path else None
+        return read_object_classes(csv_path) if csv_path is not None and csv_path.is_file() else None
+
+    @staticmethod
+    def _linked_layer_names(s57_path: str, layer_names: list[str], vectors: set[tuple[int, int]]) -> set[str]:
+        """
+        Finds the S57 layers with features whose geometry is built from any of the given
+        spatial (vector) records, using the feature to spatial record linkages of the cell.
+
+        :param s57_path: Path to the S57 file, read with its update files applied.
+        :param layer_names: Names of the S57 layers to be checked.
+        :param vectors: Set of (RCNM, RCID) identifiers of changed vector records.
+        :return: Set of the S57 layer names linked to the changed vector records, or all
+            given layer names if the GDAL Python bindings (osgeo) are not installed.
+        """
+        if gdal is None:
+            return set(layer_names)
+        source = gdal.OpenEx(s57_path, gdal.OF_VECTOR, open_options=["RETURN_LINKAGES=ON"])
+        linked = set()
+        for name in layer_names:
+            layer = source.GetLayerByName(name)
+            if layer is None:
+                continue
+            layer.SetIgnoredFields(["OGR_GEOMETRY"])
+            for feature in layer:
+                links = zip(feature.GetFieldAsIntegerList("NAME_RCNM"),
+                            feature.GetFieldAsIntegerList("NAME_RCID"))
+                if not vectors.isdisjoint(links):
+                    linked.add(name)
+                    break
+        return linked
+
     def _is_map_type(self, path: Path) -> bool:
         """
         Determines if the specified path corresponds to a valid S57 map type (file or directory).
@@ -0,0 +1,106 @@
+"""
+Contains functions for storing layers as quantized integer coordinates on a precision grid.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import shapely
+
+from seacharts.core.records import RecordTable
+
+# Version of the quantized layer format, stored in each file
+_FORMAT_VERSION = 2
+
+# Suffix of quantized layer files
+QUANTIZED_SUFFIX = ".npz"
+
+# Geometry type stored for layers without geometries, which have no ragged array type
+_NO_GEOMETRIES = -1
+
+
+def write_quantized(
+        path: Path,
+        geometries: list[Any],
+        properties: dict[str, list],
+        origin: tuple[float, float],
+        grid_size: float,
+        schema: dict | None = None,
+) -> None:
+    """
+    Writes geometries and their attributes to a file, storing coordinates as integer offsets
+    from the origin in units of the precision grid. Coordinates take 32 bits each, or 64 bits
+    if the offsets do not fit. Z values of 3D geometries (e.g. S-57 soundings) are stored
+    separately as they are, as the grid only applies to the horizontal coordinates. The file
+    is written to a temporary file that is then renamed.
+
+    :param path: Path of the file to be written, with '.npz' suffix.
+    :param geometries: List of Shapely geometries of a single family (points, lines or polygons).
+    :param properties: Dictionary mapping attribute names to lists of values.
+    :param origin: Origin the coordinate offsets are relative to, e.g. the origin of the extent.
+    :param grid_size: Size of the precision grid, in units of the coordinate reference system.
+    :param schema: Optional shapefile schema of the records, kept in the file.
+    """
+    if len(geometries):
+        geometry_type, coordinates, offsets = shapely.to_ragged_array(np.asarray(geometries, dtype=object))
+    else:
+        geometry_type, coordinates, offsets = _NO_GEOMETRIES, np.empty((0, 2)), ()
+    steps = np.rint((coordinates[:, :2] - np.asarray(origin)) / grid_size)
+    limit = np.iinfo(np.int32)
+    dtype = np.int32 if not len(steps) or (steps.min() > limit.min and steps.max() < limit.max) else np.int64
+    arrays = {f"offsets_{i}": offset for i, offset in enumerate(offsets)}
+    if coordinates.shape[1] > 2:
+        arrays["z"] = coordinates[:, 2]
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "wb") as file:
+        np.savez(
+            file,
+            version=_FORMAT_VERSION,
+            geometry_type=int(geometry_type),
+            origin=np.asarray(origin, dtype=float),
+            grid_size=grid_size,
+            coordinates=steps.astype(dtype),
+            properties=json.dumps(properties),
+            schema=json.dumps(schema),
+            **arrays,
+        )
+    os.replace(temporary_path, path)
+
+
+def read_quantized(path: Path, bounding_box: tuple[int, int, int, int] | None = None) -> RecordTable:
+    """
+    Reads geometries and their attributes from a quantized layer file.
+
+    :param path: Path to the quantized layer file.
+    :param bounding_box: Optional bounding box, where only intersecting records are kept.
+    :return: A RecordTable of the records.
+    """
+    with np.load(path) as data:
+        coordinates = data["coordinates"] * float(data["grid_size"]) + data["origin"]
+        if "z" in data.files:
+            coordinates = np.column_stack([coordinates, data["z"]])
+        count = sum(key.startswith("offsets_") for key in data.files)
+        offsets = tuple(data[f"offsets_{i}"] for i in range(count))
+        geometry_type = int(data["geometry_type"])
+        properties = json.loads(str(data["properties"]))
+    if geometry_type == _NO_GEOMETRIES:
+        return RecordTable(np.empty(0, dtype=object), properties)
+    geometries = shapely.from_ragged_array(shapely.GeometryType(geometry_type), coordinates, offsets)
+    if bounding_box is not None:
+        keep = shapely.intersects(geometries, shapely.box(*bounding_box))
+        geometries = geometries[keep]
+        properties = {name: [v for v, k in zip(values, keep) if k] for name, values in properties.items()}
+    return RecordTable(geometries, properties)
+
+
+def read_quantized_schema(path: Path) -> dict | None:
+    """
+    Reads the shapefile schema of the records kept in a quantized layer file.
+
+    :param path: Path to the quantized layer file.
+    :return: The schema with its 'geometry' type and 'properties', or None if not kept.
+    """
+    with np.load(path) as data:
+        return json.loads(str(data["schema"]))
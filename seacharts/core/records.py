@@ -0,0 +1,109 @@
+"""
+Contains the RecordTable and LazyRecordTable classes for holding spatial data records.
+"""
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+import shapely
+from shapely import geometry as geo
+
+
+class RecordTable(Sequence):
+    """
+    Columnar table of spatial data records, holding an array of Shapely geometries and a
+    list of values for each attribute. The table behaves as a read-only sequence of
+    fiona-style record dictionaries, which are only built when accessed.
+
+    :param geometries: Array of Shapely geometries, one for each record.
+    :param properties: Dictionary mapping attribute names to lists of values.
+    """
+    def __init__(self, geometries: np.ndarray, properties: dict[str, list]):
+        """
+        Initializes the RecordTable from its geometry array and attribute columns.
+
+        :param geometries: Array of Shapely geometries.
+        :param properties: Dictionary mapping attribute names to lists of values.
+        """
+        self.geometries = geometries
+        self.properties = properties
+
+    @classmethod
+    def from_arrow(cls, table: Any, geometry_name: str) -> "RecordTable":
+        """
+        Creates a RecordTable from an Arrow table with a WKB geometry column, decoding all
+        geometries at once with shapely's vectorized from_wkb.
+
+        :param table: Arrow table as read by pyogrio.
+        :param geometry_name: Name of the WKB geometry column.
+        :return: A RecordTable of the records of the Arrow table.
+        """
+        wkb = table.column(geometry_name).to_numpy(zero_copy_only=False)
+        properties = {
+            name: table.column(name).to_pylist() for name in table.column_names if name != geometry_name
+        }
+        return cls(shapely.from_wkb(wkb), properties)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> "RecordTable":
+        """
+        Creates a RecordTable from fiona-style record dictionaries.
+
+        :param records: List of record dictionaries with geometry and properties.
+        :return: A RecordTable of the records.
+        """
+        geometries = np.array([geo.shape(record["geometry"]) for record in records], dtype=object)
+        names = list(records[0]["properties"].keys()) if records else []
+        properties = {name: [record["properties"][name] for record in records] for name in names}
+        return cls(geometries, properties)
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        geometry = self.geometries[index]
+        return {
+            "type": "Feature",
+            "properties": {name: values[index] for name, values in self.properties.items()},
+            "geometry": geo.mapping(geometry) if geometry is not None else None,
+        }
+
+
+class LazyRecordTable(Sequence):
+    """
+    Read-only sequence of spatial data records that are only read when first accessed,
+    for layers whose geometry is loaded from a cache holding no records.
+
+    :param load: Function returning the records, e.g. as a RecordTable, or None if not found.
+    """
+    def __init__(self, load: Callable[[], Sequence | None]):
+        """
+        Initializes the LazyRecordTable with the function reading its records.
+
+        :param load: Function returning the records, or None if not found.
+        """
+        self._load = load
+        self._records: Sequence | None = None
+
+    @property
+    def records(self) -> Sequence:
+        """
+        Returns the records, reading them on first access.
+
+        :return: Sequence of fiona-style record dictionaries.
+        """
+        if self._records is None:
+            self._records = self._load() or []
+            self._load = None
+        return self._records
+
+    def __getstate__(self) -> dict:
+        return dict(_load=None, _records=self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        return self.records[index]
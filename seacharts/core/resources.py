@@ -0,0 +1,202 @@
+"""
+Contains the ResourceCatalogue class for indexing spatial data sources found in resource trees.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+# Version of the catalogue file format, where files of other versions are rebuilt
+_FORMAT_VERSION = 3
+
+
+class ResourceCatalogue:
+    """
+    Persisted index of the spatial data sources (e.g. S-57 cells or FGDB directories) found
+    in resource trees, recording the modification time, size, checksum, bounds, coverage
+    and layer inventory of each source.
+
+    The catalogue is refreshed incrementally: a directory is only listed again if its
+    modification time changed since it was catalogued, and a source is only described again
+    (e.g. opened for its layers and checksummed) if its modification time or size changed. Sources can then
+    be selected by their recorded bounds without opening them.
+
+    :param path: Path of the catalogue file.
+    """
+    def __init__(self, path: Path):
+        """
+        Initializes the ResourceCatalogue by reading its file, if it exists.
+
+        :param path: Path of the catalogue file.
+        """
+        self.path = path
+        self.directories: dict[str, dict] = {}
+        self.sources: dict[str, dict] = {}
+        self._changed = False
+        if path.exists():
+            try:
+                with open(path) as catalogue_file:
+                    data = json.load(catalogue_file)
+                if data.get("version") == _FORMAT_VERSION:
+                    self.directories, self.sources = data["directories"], data["sources"]
+            except (ValueError, KeyError):
+                pass
+
+    def refresh(
+            self,
+            roots: list[Path],
+            is_source: Callable[[Path], bool],
+            describe: Callable[[list[Path]], dict[Path, dict]],
+    ) -> list[Path]:
+        """
+        Finds the sources in the given resource trees, reusing the recorded contents of
+        unchanged directories, and describes new or changed sources.
+
+        :param roots: List of resource paths, each a source or a directory tree of sources.
+        :param is_source: Function telling whether a path is a source, whose contents are not searched.
+        :param describe: Function mapping a list of source paths to their descriptions, e.g.
+            with 'bounds' as (xmin, ymin, xmax, ymax) or None, 'coverage' as WKT or None and
+            'layers' as a list of names.
+        :return: Sorted list of the source paths found.
+        """
+        found = sorted({source for root in roots for source in self._walk(root, is_source)})
+        stale = []
+        for source in found:
+            mtime, size = self._stat(source)
+            entry = self.sources.get(str(source))
+            if entry is None or entry["mtime"] != mtime or entry["size"] != size:
+                checksum = self._checksum(source)
+                self.sources[str(source)] = dict(
+                    mtime=mtime, size=size, checksum=checksum, bounds=None, coverage=None, layers=[]
+                )
+                stale.append(source)
+        if stale:
+            for source, description in describe(stale).items():
+                self.sources[str(source)].update(description)
+            print(f"Catalogued {len(stale)} of {len(found)} spatial data source(s).")
+            self._changed = True
+        self.save()
+        return found
+
+    def identity(self, source: Path) -> dict:
+        """
+        Returns the recorded identity of a source, changing whenever its contents change.
+
+        :param source: Path to the source.
+        :return: Dictionary of the 'mtime', 'size' and 'checksum' of the source.
+        """
+        entry = self.sources.get(str(source), {})
+        return {key: entry.get(key) for key in ("mtime", "size", "checksum")}
+
+    def bounds(self, source: Path) -> tuple[float, float, float, float] | None:
+        """
+        Returns the recorded bounds of a source.
+
+        :param source: Path to the source.
+        :return: Bounds as (xmin, ymin, xmax, ymax), or None if unknown.
+        """
+        bounds = self.sources.get(str(source), {}).get("bounds")
+        return tuple(bounds) if bounds is not None else None
+
+    def coverage(self, source: Path) -> str | None:
+        """
+        Returns the recorded coverage of a source, e.g. the data coverage of a S57 cell.
+
+        :param source: Path to the source.
+        :return: Coverage polygon as WKT, or None if unknown.
+        """
+        return self.sources.get(str(source), {}).get("coverage")
+
+    def layers(self, source: Path) -> list[str]:
+        """
+        Returns the recorded layer inventory of a source.
+
+        :param source: Path to the source.
+        :return: List of layer names.
+        """
+        return self.sources.get(str(source), {}).get("layers", [])
+
+    def save(self) -> None:
+        """
+        Writes the catalogue to its file if it changed, through a temporary file that is then
+        renamed, such that an interrupted write never leaves a partial catalogue.
+        """
+        if not self._changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary_path, "w") as catalogue_file:
+            data = dict(version=_FORMAT_VERSION, directories=self.directories, sources=self.sources)
+            json.dump(data, catalogue_file)
+        os.replace(temporary_path, self.path)
+        self._changed = False
+
+    @staticmethod
+    def _stat(source: Path) -> tuple[int, int]:
+        """
+        Returns the modification time and size of a source, where sources stored as
+        directories (e.g. FGDB) take the latest modification time and total size of their files.
+
+        :param source: Path to the source.
+        :return: Tuple of the modification time in nanoseconds and the size in bytes.
+        """
+        stat = source.stat()
+        if not source.is_dir():
+            return stat.st_mtime_ns, stat.st_size
+        with os.scandir(source) as entries:
+            stats = [entry.stat() for entry in entries if entry.is_file()]
+        return max([stat.st_mtime_ns, *(s.st_mtime_ns for s in stats)]), sum(s.st_size for s in stats)
+
+    @staticmethod
+    def _checksum(source: Path) -> str:
+        """
+        Computes the SHA-256 checksum of the contents of a source, where sources stored as
+        directories (e.g. FGDB) take the names and contents of their files in order.
+
+        :param source: Path to the source.
+        :return: Hexadecimal checksum.
+        """
+        digest = hashlib.sha256()
+        file_paths = sorted(p for p in source.iterdir() if p.is_file()) if source.is_dir() else [source]
+        for path in file_paths:
+            digest.update(path.name.encode())
+            with open(path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _walk(self, path: Path, is_source: Callable[[Path], bool]):
+        """
+        Yields the sources in a directory tree, listing only directories changed since they
+        were catalogued.
+
+        :param path: Path to a source or directory.
+        :param is_source: Function telling whether a path is a source.
+        :yield: Paths of the sources found.
+        """
+        if is_source(path):
+            yield path
+            return
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return
+        if not path.is_dir():
+            return
+        entry = self.directories.get(str(path))
+        if entry is None or entry["mtime"] != mtime:
+            with os.scandir(path) as entries:
+                children = [(e.name, e.is_dir()) for e in entries]
+            entry = dict(
+                mtime=mtime,
+                directories=sorted(name for name, is_dir in children if is_dir),
+                files=sorted(name for name, is_dir in children if not is_dir),
+            )
+            self.directories[str(path)] = entry
+            self._changed = True
+        for name in entry["files"]:
+            if is_source(path / name):
+                yield path / name
+        for name in entry["directories"]:
+            yield from self._walk(path / name, is_source)
@@ -3,8 +3,11 @@ Contains the Scope class for defining the extent, layers, depth bins, and other
 settings for spatial data files in Electronic Navigational Charts (ENC).
 """
 from dataclasses import dataclass
+from pathlib import Path
+
 from seacharts.core import files
 from .extent import Extent
+from .ingestion import Ingestion
 from .mapFormat import MapFormat
 from .time import Time
 
@@ -28,6 +31,9 @@ class Scope:
         self.extent = Extent(settings)
         self.settings = settings
         self.resources = settings["enc"].get("resources", [])
+
+        # Optional name prefixed to the shapefile cache entry of this chart
+        self.cache: str | None = settings["enc"].get("cache", None)
         
         # Set default depth bins if not provided in settings
         default_depths = [0, 1, 2, 5, 10, 20, 50, 100, 200, 350, 500]
@@ -38,9 +44,16 @@ class Scope:
         for depth in self.depths:
             self.features.append(f"seabed{depth}m")
 
-        # Set map format type based on provided layer information (S57 or FGDB)
+        # Set map format type based on provided layer information (S57), or on the
+        # resources holding only GeoPackage or FlatGeobuf files and no FGDB directories or
+        # S57 cells (GPKG), otherwise FGDB
+        resources = [Path(resource) for resource in self.resources]
         if settings["enc"].get("S57_layers", []):
             self.type = MapFormat.S57
+        elif any(self._holds(path, (".gpkg", ".fgb")) for path in resources) and not any(
+                self._holds(path, (".gdb", ".000")) for path in resources
+        ):
+            self.type = MapFormat.GPKG
         else:
             self.type = MapFormat.FGDB
 
@@ -58,8 +71,32 @@ class Scope:
 
         # Set weather data sources and any extra S57 layers
         self.weather = settings["enc"].get("weather", [])
-        self.extra_layers:dict[str,str] = settings["enc"].get("S57_layers", {})
+        self.extra_layers:dict[str,str] = {}
+        self.extra_layer_filters: dict[str, dict] = {}
+        for tag, value in settings["enc"].get("S57_layers", {}).items():
+            if isinstance(value, dict):
+                self.extra_layers[tag] = value["color"]
+                self.extra_layer_filters[tag] = dict(
+                    where=value.get("where"), geometry_type=value.get("geometry")
+                )
+            else:
+                self.extra_layers[tag] = value
         # Extend features to include any extra layers specified
         self.features.extend(self.extra_layers)
 
+        # Configure how resources are parsed into layers and shapefiles
+        self.ingestion = Ingestion(settings["enc"].get("ingestion", {}))
 
+    @staticmethod
+    def _holds(path: Path, suffixes: tuple[str, ...]) -> bool:
+        """
+        Checks whether a resource is, or directly contains, a file or directory with one
+        of the given suffixes.
+
+        :param path: Path to the resource.
+        :param suffixes: Tuple of suffixes, e.g. (".gpkg", ".fgb").
+        :return: True if the resource holds data with one of the suffixes.
+        """
+        if path.is_dir() and path.suffix not in suffixes:
+            return any(p.suffix in suffixes for p in path.iterdir())
+        return path.suffix in suffixes
@@ -0,0 +1,182 @@
+"""
+Contains the TiledUnion class for merging streamed geometries tile by tile in bounded memory.
+"""
+import math
+from pathlib import Path
+from typing import Any, Generator, Iterable, Iterator
+
+import numpy as np
+import shapely
+from shapely import geometry as geo
+
+from seacharts.shapes.repair import repair_geometries, repair_geometry
+
+# Rough estimate of the memory held per coordinate of a partial tile union
+_BYTES_PER_COORDINATE = 64
+
+# Shapely geometry type id of polygons, which are the only parts kept from clipped pieces
+_POLYGON = 3
+
+
+class TiledUnion:
+    """
+    Merges geometries streamed in chunks into the tiles of a grid over a bounding box, by
+    clipping each chunk to the tiles and uniting the pieces with the partial union of each
+    tile. Partial unions are spilled to disk whenever they exceed the memory limit, and
+    each tile is assembled from its spilled and in-memory parts when finishing.
+
+    :param bounding_box: Bounding box covered by the tiles as (xmin, ymin, xmax, ymax).
+    :param tile_size: Side length of each tile, in units of the coordinate reference system.
+    :param spill_directory: Directory where partial tile unions are spilled to.
+    :param memory_limit: Optional memory limit in megabytes for the partial tile unions.
+    """
+    def __init__(
+            self,
+            bounding_box: tuple[int, int, int, int],
+            tile_size: float,
+            spill_directory: Path,
+            memory_limit: int | None = None,
+    ):
+        """
+        Initializes the TiledUnion with a tile grid covering the bounding box.
+
+        :param bounding_box: Bounding box covered by the tiles.
+        :param tile_size: Side length of each tile.
+        :param spill_directory: Directory where partial tile unions are spilled to.
+        :param memory_limit: Optional memory limit in megabytes.
+        """
+        self.tiles = self._tile_grid(bounding_box, tile_size)
+        self.spill_directory = spill_directory
+        self.memory_limit = memory_limit
+        self._tree = shapely.STRtree(self.tiles)
+        self._partials: dict[int, Any] = {}
+        self._spilled: set[int] = set()
+        self._coordinates = 0
+        self.repaired = 0
+
+    @staticmethod
+    def _tile_grid(bounding_box: tuple[int, int, int, int], tile_size: float) -> np.ndarray:
+        """
+        Divides a bounding box into square tiles, where tiles on the edges are cut off.
+
+        :param bounding_box: Bounding box as (xmin, ymin, xmax, ymax).
+        :param tile_size: Side length of each tile.
+        :return: Array of tile boxes.
+        """
+        x_min, y_min, x_max, y_max = bounding_box
+        columns = max(1, math.ceil((x_max - x_min) / tile_size))
+        rows = max(1, math.ceil((y_max - y_min) / tile_size))
+        tiles = []
+        for row in range(rows):
+            for column in range(columns):
+                x, y = x_min + column * tile_size, y_min + row * tile_size
+                tiles.append(geo.box(x, y, min(x + tile_size, x_max), min(y + tile_size, y_max)))
+        return np.array(tiles, dtype=object)
+
+    def add(self, geometries: list[Any]) -> None:
+        """
+        Clips a chunk of geometries to the tiles, and unites the pieces with the partial
+        union of each tile, spilling the partial unions to disk if over the memory limit.
+
+        :param geometries: List of Shapely geometries of the chunk.
+        """
+        if not geometries:
+            return
+        geometries, repaired = repair_geometries(geometries)
+        self.repaired += repaired
+        geometry_index, tile_index = self._tree.query(geometries, predicate="intersects")
+        for tile in np.unique(tile_index):
+            pieces = shapely.intersection(geometries[geometry_index[tile_index == tile]], self.tiles[tile])
+            parts = shapely.get_parts(pieces)
+            parts = list(parts[shapely.get_type_id(parts) == _POLYGON])
+            existing = self._partials.get(tile)
+            if existing is not None:
+                parts.append(existing)
+                self._coordinates -= shapely.get_num_coordinates(existing)
+            merged = shapely.union_all(parts)
+            self._coordinates += shapely.get_num_coordinates(merged)
+            self._partials[tile] = merged
+        if self._over_memory_limit():
+            self._spill()
+
+    def finish(self) -> Generator[geo.MultiPolygon, None, None]:
+        """
+        Assembles each tile from its spilled and in-memory partial unions, one at a time.
+
+        :yield: The non-empty merged geometry of each tile as a MultiPolygon.
+        """
+        for tile in range(len(self.tiles)):
+            parts = list(self._read_spilled(tile))
+            if tile in self._partials:
+                parts.append(self._partials.pop(tile))
+            if not parts:
+                continue
+            geometry = repair_geometry(shapely.union_all(parts))
+            polygons = shapely.get_parts(geometry)
+            polygons = polygons[shapely.get_type_id(polygons) == _POLYGON]
+            if len(polygons):
+                yield geo.MultiPolygon(list(polygons))
+        self._coordinates = 0
+
+    def _over_memory_limit(self) -> bool:
+        """
+        Checks whether the partial tile unions held in memory exceed the memory limit.
+
+        :return: True if a memory limit is set and exceeded, otherwise False.
+        """
+        if self.memory_limit is None:
+            return False
+        return self._coordinates * _BYTES_PER_COORDINATE > self.memory_limit * 10 ** 6
+
+    def _spill(self) -> None:
+        """
+        Appends the partial union of every tile in memory to its spill file as WKB.
+        """
+        for tile, geometry in self._partials.items():
+            data = shapely.to_wkb(geometry)
+            with open(self._spill_path(tile), "ab") as spill_file:
+                spill_file.write(len(data).to_bytes(8, "little"))
+                spill_file.write(data)
+            self._spilled.add(tile)
+        self._partials.clear()
+        self._coordinates = 0
+
+    def _read_spilled(self, tile: int) -> Iterator[Any]:
+        """
+        Reads the partial unions spilled to disk for a tile.
+
+        :param tile: Index of the tile.
+        :yield: Each spilled partial union of the tile.
+        """
+        if tile not in self._spilled:
+            return
+        with open(self._spill_path(tile), "rb") as spill_file:
+            while header := spill_file.read(8):
+                yield shapely.from_wkb(spill_file.read(int.from_bytes(header, "little")))
+
+    def _spill_path(self, tile: int) -> Path:
+        """
+        Returns the path of the spill file of a tile.
+
+        :param tile: Index of the tile.
+        :return: Path to the spill file.
+        """
+        return self.spill_directory / f"tile_{tile}.wkb"
+
+
+def chunked(items: Iterable, size: int) -> Generator[list, None, None]:
+    """
+    Splits an iterable into lists of at most the given size, consuming it lazily.
+
+    :param items: Iterable of items, e.g. a generator of records.
+    :param size: Maximum number of items in each chunk.
+    :yield: Each chunk of items.
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -40,7 +40,7 @@ class ENC:
         """
         point = Point(easting, northing)
         for seabed in reversed(self.seabed.values()):
-            if any(polygon.contains(point) for polygon in seabed.geometry.geoms):
+            if any(polygon.contains(point) for polygon in seabed.band.geoms):
                 return seabed.depth
         return None
     
@@ -75,10 +75,12 @@ class ENC:
 
     def update(self) -> None:
         """
-        Update ENC with spatial data parsed from user-specified resources
+        Update ENC with spatial data parsed from user-specified resources,
+        re-parsing only the layers touched by new resource updates
         :return: None
         """
-        self._environment.map.parse_resources_into_shapefiles()
+        self._environment.parser.refresh_resources()
+        self._environment.apply_updates()
 
     @property
     def display(self) -> Display:
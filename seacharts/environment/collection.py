@@ -3,6 +3,9 @@ Contains the DataCollection abstract class for containing parsed spatial data.
 """
 from abc import abstractmethod, ABC
 from dataclasses import dataclass, field
+
+from shapely import geometry as geo
+
 from seacharts.core import Scope, DataParser
 from seacharts.layers import Layer
 
@@ -38,7 +41,7 @@ class DataCollection(ABC):
 
         :return: A list of loaded Layer instances (regions).
         """
-        return [layer for layer in self.layers if not layer.geometry.is_empty]
+        return [layer for layer in self.layers if layer.is_loaded]
     
     @property
     def not_loaded_regions(self) -> list[Layer]:
@@ -47,7 +50,7 @@ class DataCollection(ABC):
 
         :return: A list of Layer instances that are empty.
         """
-        return [layer for layer in self.layers if layer.geometry.is_empty]
+        return [layer for layer in self.layers if not layer.is_loaded]
     
     @property
     def loaded(self) -> bool:
@@ -88,6 +91,19 @@ class ShapefileBasedCollection(DataCollection, ABC):
         else:
             print("INFO: No existing spatial data was found.\n")
 
+    def discard_updated_regions(self) -> None:
+        """
+        Discards the loaded regions touched by pending updates of the resources, such that
+        only these regions are parsed again while all other regions are left as they are.
+        """
+        regions = self.parser.updated_regions(self.loaded_regions)
+        for region in regions:
+            region.geometry = geo.MultiPolygon()
+            region.records = None
+        if regions:
+            names = ", ".join(region.name for region in regions)
+            print(f"INFO: Resource updates found for {names}.\n")
+
     def parse_resources_into_shapefiles(self) -> None:
         """
         Parses resources into shapefiles for regions that have not been loaded.
@@ -96,6 +112,7 @@ class ShapefileBasedCollection(DataCollection, ABC):
         and updates the ENC based on the results. It prints a completion message 
         based on the loading status of the regions.
         """
+        self.parser.discard_layers(self.not_loaded_regions)
         self.parser.parse_resources(
             self.not_loaded_regions, self.scope.resources, self.scope.extent.area
         )
@@ -2,7 +2,7 @@
 Contains the Environment class for collecting and manipulating loaded spatial data.
 """
 import _warnings
-from seacharts.core import Scope, MapFormat, S57Parser, FGDBParser, DataParser
+from seacharts.core import Scope, MapFormat, S57Parser, FGDBParser, GPKGParser, DataParser
 from .map import MapData
 from .weather import WeatherData
 from .extra import ExtraLayers
@@ -25,19 +25,31 @@ class Environment:
 
         self.scope = Scope(settings)
         self.parser = self.set_parser()
-        files.build_directory_structure(self.scope.features, self.scope.resources, self.parser)
+        files.build_directory_structure(self.scope, self.parser)
         self.map = MapData(self.scope, self.parser)
         self.weather = WeatherData(self.scope, self.parser)
         self.extra_layers = ExtraLayers(self.scope, self.parser)
 
         self.map.load_existing_shapefiles()
-        if len(self.map.not_loaded_regions) > 0:
-            self.map.parse_resources_into_shapefiles()
-
         if self.scope.type is MapFormat.S57:
             self.extra_layers.load_existing_shapefiles()
-            if len(self.extra_layers.not_loaded_regions) > 0:
-                self.extra_layers.parse_resources_into_shapefiles()
+        self.apply_updates()
+
+    def apply_updates(self) -> None:
+        """
+        Discards the layers touched by pending resource updates (e.g. S-57 update files),
+        and parses them together with any layers not loaded yet from the resources. Updates
+        are then recorded as applied for the layers that were completely written.
+        """
+        collections = [self.map]
+        if self.scope.type is MapFormat.S57:
+            collections.append(self.extra_layers)
+        for collection in collections:
+            collection.discard_updated_regions()
+            if len(collection.not_loaded_regions) > 0:
+                collection.parse_resources_into_shapefiles()
+        regions = [region for collection in collections for region in collection.featured_regions]
+        self.parser.record_applied_updates(regions)
 
     def get_layers(self) -> list[Layer]:
         """
@@ -64,13 +76,17 @@ class Environment:
         """
         Sets the appropriate parser based on the map format specified in the scope.
 
-        :return: A DataParser instance specific to the map format (S57 or FGDB).
+        :return: A DataParser instance specific to the map format (S57, FGDB or GPKG).
         :raises ValueError: If the map format is not supported.
         """
         if self.scope.type is MapFormat.S57:
             return S57Parser(self.scope.extent.bbox, self.scope.resources,
-                             self.scope.extent.out_proj)
+                             self.scope.extent.out_proj, self.scope.ingestion, self.scope.depths)
         elif self.scope.type is MapFormat.FGDB:
-            return FGDBParser(self.scope.extent.bbox, self.scope.resources)
+            return FGDBParser(self.scope.extent.bbox, self.scope.resources,
+                              self.scope.ingestion)
+        elif self.scope.type is MapFormat.GPKG:
+            return GPKGParser(self.scope.extent.bbox, self.scope.resources,
+                              self.scope.ingestion)
         else:
             raise ValueError("Unsupported map format")
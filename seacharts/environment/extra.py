@@ -24,7 +24,8 @@ class ExtraLayers(ShapefileBasedCollection):
         """
         self.extra_layers : list[ExtraLayer] = []
         for tag, color in self.scope.extra_layers.items():
-            self.extra_layers.append(ExtraLayer(tag=tag, color=color))
+            filters = self.scope.extra_layer_filters.get(tag, {})
+            self.extra_layers.append(ExtraLayer(tag=tag, color=color, **filters))
 
     @property
     def layers(self) -> list[Layer]:
@@ -23,11 +23,36 @@ class MapData(ShapefileBasedCollection):
         """
         Initializes the MapData instance by creating Seabed instances for each 
         depth specified in the scope. Also initializes land and shore layers.
+
+        If the parser stores seabeds as depth bands of cumulative data, each seabed is linked
+        to the next deeper one, such that its geometry remains the cumulative view.
         """
         self.bathymetry = {d: Seabed(depth=d) for d in self.scope.depths}
+        if self.parser.cumulative_depths:
+            seabeds = [self.bathymetry[d] for d in sorted(self.bathymetry)]
+            for seabed, deeper in zip(seabeds, seabeds[1:]):
+                seabed.deeper = deeper
         self.land = Land()
         self.shore = Shore()
 
+    def load_existing_shapefiles(self) -> None:
+        """
+        Loads existing shapefiles for the featured regions, and stores the loaded layers in
+        the memory-mapped geometry cache if enabled and not loaded from it.
+        """
+        super().load_existing_shapefiles()
+        self.parser.write_mapped_cache(self.loaded_regions)
+
+    def parse_resources_into_shapefiles(self) -> None:
+        """
+        Parses resources into shapefiles for regions that have not been loaded, and stores
+        the polygonal layers in the shared-edge topology cache and the loaded layers in the
+        memory-mapped geometry cache if enabled.
+        """
+        super().parse_resources_into_shapefiles()
+        self.parser.write_topology(self.loaded_regions)
+        self.parser.write_mapped_cache(self.loaded_regions)
+
     @property
     def layers(self) -> list[Layer]:
         """
@@ -9,7 +9,7 @@ from shapely.geometry import base as geobase, Polygon, Point
 from shapely.ops import unary_union
 
 from seacharts.layers.types import ZeroDepth, SingleDepth, MultiDepth
-from seacharts.shapes import Shape
+from seacharts.shapes import Shape, UnionEngine
 
 
 @dataclass
@@ -28,6 +28,25 @@ class Layer(Shape, ABC):
     depth: int = None
     records: list[dict] = None
     
+    @property
+    def is_coverage(self) -> bool:
+        """
+        Returns whether the area geometries of the layer are expected to form a coverage,
+        i.e. to share edges without overlapping, such that they may be merged faster.
+
+        :return: False, unless overridden by layers of coverage data.
+        """
+        return False
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Returns whether the layer holds any parsed or loaded geometry.
+
+        :return: True if the geometry of the layer is not empty.
+        """
+        return not self.geometry.is_empty
+
     @property
     def label(self) -> str:
         """
@@ -37,24 +56,30 @@ class Layer(Shape, ABC):
         """
         return self.name.lower()
 
-    def _geometries_to_multi(self, multi_geoms, geometries, geo_class: type):
+    def _geometries_to_multi(self, multi_geoms, geometries, geo_class: type, engine: UnionEngine | None = None):
         """
         Combines geometries into a single MultiGeometry.
 
         :param multi_geoms: A list of MultiGeometries to combine.
         :param geometries: A list of geometries to add to the MultiGeometry.
         :param geo_class: The class type for the resulting geometry (MultiPolygon or MultiLineString).
+        :param engine: Optional union engine uniting the geometries in spatial partitions.
         :return: A unified geometry of the specified type.
         """
-        if len(geometries):
-            geometries = self.as_multi(geometries)
-            multi_geoms.append(geometries)
-        geom = unary_union(multi_geoms)
+        if engine is not None and self.is_coverage and geo_class is geo.MultiPolygon:
+            geom = engine.union_coverage([*multi_geoms, *geometries])
+        elif engine is not None:
+            geom = engine.union([*multi_geoms, *geometries])
+        else:
+            if len(geometries):
+                geometries = self.as_multi(geometries)
+                multi_geoms.append(geometries)
+            geom = unary_union(multi_geoms)
         if not isinstance(geom, geo_class):
             geom = geo_class([geom])
         return geom
 
-    def records_as_geometry(self, records: list[dict]) -> None:
+    def records_as_geometry(self, records: list[dict], engine: UnionEngine | None = None) -> None:
         """
         Converts a list of geometric data records into geometries for the layer.
 
@@ -67,6 +92,7 @@ class Layer(Shape, ABC):
                         dictionary is expected to contain information necessary for 
                         constructing a geometry, which is handled by the 
                         _record_to_geometry method.
+        :param engine: Optional union engine uniting the geometries in spatial partitions.
 
         The method distinguishes between different types of geometries:
         - Polygons and MultiPolygons are stored for area representations.
@@ -75,6 +101,19 @@ class Layer(Shape, ABC):
         If any geometries are found, they are combined into a MultiGeometry format 
         appropriate for the layer's type (either MultiPolygon or MultiLineString).
         """
+        # Convert each record to a geometry using a helper method
+        self.geometries_as_geometry([self._record_to_geometry(record) for record in records], engine)
+
+    def geometries_as_geometry(self, geometries_list: list, engine: UnionEngine | None = None) -> None:
+        """
+        Combines a list of Shapely geometries into a single geometry for the layer.
+
+        Polygons and MultiPolygons are unified into a MultiPolygon, and if there are
+        none, LineStrings and MultiLineStrings are unified into a MultiLineString.
+
+        :param geometries_list: A list of Shapely geometries, e.g. converted from records.
+        :param engine: Optional union engine uniting the geometries in spatial partitions.
+        """
 
         # Initialize lists to store geometries by type
         geometries = []
@@ -82,12 +121,9 @@ class Layer(Shape, ABC):
         linestrings = []
         multi_linestrings = []
 
-        # Process each record to convert it to a geometry
-        if len(records) > 0:
-            for record in records:
-                # Convert the record to a geometry using a helper method
-                geom_tmp = self._record_to_geometry(record)
-
+        # Process each geometry
+        if len(geometries_list) > 0:
+            for geom_tmp in geometries_list:
                 # Classify the geometry type and append it to the corresponding list
                 if isinstance(geom_tmp, geo.Polygon):
                     geometries.append(geom_tmp) # For area geometries
@@ -99,21 +135,26 @@ class Layer(Shape, ABC):
                     multi_linestrings.append(geom_tmp) # For multiple linear geometries
 
             if len(geometries) + len(multi_geoms) > 0:
-                self.geometry = self._geometries_to_multi(multi_geoms, geometries, geo.MultiPolygon)
+                self.geometry = self._geometries_to_multi(multi_geoms, geometries, geo.MultiPolygon, engine)
 
             elif len(linestrings) + len(multi_linestrings) > 0:
-                self.geometry = self._geometries_to_multi(multi_linestrings, linestrings, geo.MultiLineString)
+                self.geometry = self._geometries_to_multi(
+                    multi_linestrings, linestrings, geo.MultiLineString, engine
+                )
         
-    def unify(self, records: list[dict]) -> None:
+    def unify(self, records: list[dict], engine: UnionEngine | None = None) -> None:
         """
         Unifies geometries from a list of records into the layer's geometry.
 
         :param records: A list of dictionaries representing geometrical data.
+        :param engine: Optional union engine uniting the geometries in spatial partitions.
         """
         geometries = [self._record_to_geometry(r) for r in records]
-        self.geometry = self.collect(geometries)
+        self.geometry = self.collect(geometries, engine)
 
     def get_params_at_coord(self, easting: int, northing: int) -> dict | None:
+        if self.records is None:
+            return None
         point = Point(easting, northing)
         for record in self.records:
             if record['geometry']['type'] == 'Polygon' and Polygon(record['geometry']['coordinates'][0]).contains(point):
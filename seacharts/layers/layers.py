@@ -1,15 +1,89 @@
 """
 Contains depth-specific layer definitions used by the MapData container class.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
+
+from shapely import geometry as geo
+from shapely.ops import unary_union
 
 from seacharts.layers.layer import SingleDepthLayer, ZeroDepthLayer
 
 
 @dataclass
 class Seabed(SingleDepthLayer):
-    """Layer representing seabed geometries at a single depth."""
-    ...
+    """
+    Layer representing seabed geometries at a single depth.
+
+    Each seabed stores its depth band, i.e. the area between its depth and the next depth.
+    If linked to the next deeper seabed, the geometry of the seabed is the cumulative view
+    of all areas at least as deep as its depth, derived from the bands on demand and cached
+    until any of the bands change. Assigning a geometry sets the band.
+
+    :param deeper: Optional next deeper seabed, whose areas are included in the geometry.
+    """
+    deeper: "Seabed" = field(default=None, repr=False, compare=False)
+
+    @property
+    def geometry(self) -> Any:
+        """
+        Returns the band of the seabed, or its cumulative view if linked to a deeper seabed.
+
+        :return: A MultiPolygon of the seabed areas.
+        """
+        if self.deeper is None:
+            return self.band
+        key = self._view_key()
+        if self._view is None or len(self._view[0]) != len(key) or any(
+                cached is not band for cached, band in zip(self._view[0], key)):
+            deeper = self.deeper.geometry
+            view = unary_union([self.band, deeper]) if not deeper.is_empty else self.band
+            if not isinstance(view, geo.MultiPolygon):
+                view = geo.MultiPolygon([view]) if not view.is_empty else geo.MultiPolygon()
+            self._view = key, view
+        return self._view[1]
+
+    @geometry.setter
+    def geometry(self, geometry: Any) -> None:
+        self.band = geometry
+        self._view = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Returns whether the band of the seabed holds any geometry.
+
+        :return: True if the band is not empty.
+        """
+        return not self.band.is_empty
+
+    @property
+    def is_coverage(self) -> bool:
+        """
+        Returns True, as depth areas share edges without overlapping.
+
+        :return: True.
+        """
+        return True
+
+    def _view_key(self) -> tuple[Any, ...]:
+        """
+        Identifies the bands the cumulative view is derived from. The bands themselves are
+        kept with the cached view and compared by identity, as the ids of replaced bands
+        may be reused by new ones once they are freed.
+
+        :return: Tuple of the band of this and every deeper seabed.
+        """
+        key, seabed = [], self
+        while seabed is not None:
+            key.append(seabed.band)
+            seabed = seabed.deeper
+        return tuple(key)
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state.update(deeper=None, _view=None)
+        return state
 
 
 @dataclass
@@ -29,8 +103,12 @@ class ExtraLayer(ZeroDepthLayer):
     Class for defining extra layers with additional attributes.
 
     :param tag: A tag associated with the extra layer - originates from S57 tags, will be later treated as name.
+    :param where: Optional OGR SQL attribute predicate limiting which features are read.
+    :param geometry_type: Optional geometry type (Point, LineString or Polygon) of the features read.
     """
     tag:str = None
+    where: str = None
+    geometry_type: str = None
     @property
     def name(self) -> str:
         return self.tag
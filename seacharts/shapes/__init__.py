@@ -5,3 +5,5 @@ from .areas import Area, Circle
 from .bodies import Rectangle, Ship
 from .lines import Arrow, Line
 from .shape import Shape
+from .topology import Topology
+from .union import UnionEngine
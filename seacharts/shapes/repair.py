@@ -0,0 +1,82 @@
+"""
+Contains functions for repairing invalid geometries with shapely's array functions.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import shapely
+from shapely import geometry as geo
+
+# Minimum number of invalid geometries repaired in worker processes instead of in-process
+_PARALLEL_THRESHOLD = 1000
+
+# Shapely geometry type ids of polygonal geometries and geometry collections
+_POLYGON, _MULTI_POLYGON, _COLLECTION = 3, 6, 7
+
+
+def repair_geometries(geometries: list[Any] | np.ndarray, workers: int = 1) -> tuple[np.ndarray, int]:
+    """
+    Repairs the invalid geometries among the given ones with shapely's make_valid, checking
+    validity for the whole array at once and repairing only the invalid geometries, split
+    between worker processes if there are many of them. Repaired polygonal geometries keep
+    only their polygonal parts, as with buffer(0).
+
+    :param geometries: List or array of Shapely geometries.
+    :param workers: Number of worker processes used for repairing.
+    :return: Tuple of the array of valid geometries and the number of repaired geometries.
+    """
+    array = np.asarray(geometries, dtype=object)
+    invalid = np.flatnonzero(~shapely.is_valid(array))
+    if not len(invalid):
+        return array, 0
+    array = array.copy()
+    if workers > 1 and len(invalid) >= _PARALLEL_THRESHOLD:
+        chunks = np.array_split(array[invalid], workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            array[invalid] = np.concatenate(list(executor.map(_make_valid, chunks)))
+    else:
+        array[invalid] = _make_valid(array[invalid])
+    return array, len(invalid)
+
+
+def repair_geometry(geometry: Any) -> Any:
+    """
+    Repairs a single geometry if it is invalid, keeping only polygonal parts of polygons.
+
+    :param geometry: Shapely geometry to be repaired.
+    :return: The geometry itself if valid, otherwise its repaired form.
+    """
+    if geometry.is_valid:
+        return geometry
+    return _make_valid(np.array([geometry], dtype=object))[0]
+
+
+def polygonal_parts(geometry: Any) -> geo.MultiPolygon:
+    """
+    Keeps the non-empty polygons of a geometry, e.g. dropping line slivers left by clipping,
+    such that polygonal layers are always stored as MultiPolygons.
+
+    :param geometry: Shapely geometry, e.g. a Polygon, MultiPolygon or GeometryCollection.
+    :return: A MultiPolygon of the polygons of the geometry.
+    """
+    parts = shapely.get_parts(shapely.get_parts(geometry))
+    return geo.MultiPolygon(list(parts[(shapely.get_type_id(parts) == _POLYGON) & ~shapely.is_empty(parts)]))
+
+
+def _make_valid(geometries: np.ndarray) -> np.ndarray:
+    """
+    Makes invalid geometries valid, collapsing repaired polygonal geometries that became
+    geometry collections (e.g. with collapsed lines) back into (multi)polygons.
+
+    :param geometries: Array of invalid Shapely geometries.
+    :return: Array of repaired geometries.
+    """
+    polygonal = np.isin(shapely.get_type_id(geometries), (_POLYGON, _MULTI_POLYGON))
+    repaired = shapely.make_valid(geometries)
+    collections = np.flatnonzero(polygonal & (shapely.get_type_id(repaired) == _COLLECTION))
+    for i in collections:
+        parts = shapely.get_parts(shapely.get_parts(repaired[i]))
+        polygons = parts[shapely.get_type_id(parts) == _POLYGON]
+        repaired[i] = geo.MultiPolygon(list(polygons))
+    return repaired
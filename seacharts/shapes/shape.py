@@ -6,6 +6,9 @@ from dataclasses import dataclass
 from typing import Any
 from shapely import geometry as geo, ops
 
+from .repair import repair_geometries, repair_geometry
+from .union import UnionEngine
+
 
 @dataclass
 class Shape(ABC):
@@ -58,10 +61,12 @@ class Shape(ABC):
             raise NotImplementedError(type(geometry))
 
     @staticmethod
-    def collect(geometries: list[Any]) -> Any:
-        if any(not g.is_valid for g in geometries):
-            geometries = [g.buffer(0) if not g.is_valid else g for g in geometries]
-        geometry = ops.unary_union(geometries)
-        if not geometry.is_valid:
-            geometry = geometry.buffer(0)
-        return geometry
+    def collect(geometries: list[Any], engine: UnionEngine | None = None) -> Any:
+        geometries, repaired = repair_geometries(geometries, engine.workers if engine is not None else 1)
+        if repaired:
+            print(f"\rRepaired {repaired} invalid geometries.")
+        if engine is not None:
+            geometry = engine.union(list(geometries))
+        else:
+            geometry = ops.unary_union(geometries)
+        return repair_geometry(geometry)
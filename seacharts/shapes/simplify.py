@@ -0,0 +1,60 @@
+"""
+Contains functions for topology-preserving simplification of geometry arrays.
+"""
+from functools import cache
+from typing import Any
+
+import numpy as np
+import shapely
+
+# Memory used per coordinate of a geometry, as a pair of float64 values
+BYTES_PER_COORDINATE = 16
+
+# Shapely geometry type ids of polygonal geometries
+_POLYGON, _MULTI_POLYGON = 3, 6
+
+
+def simplify_geometries(geometries: list[Any] | np.ndarray, tolerance: float, coverage: bool = False) -> np.ndarray:
+    """
+    Simplifies geometries with the given tolerance while preserving their topology.
+
+    Polygons forming a coverage (sharing edges without overlapping) are simplified together
+    with shapely's coverage_simplify, such that shared edges stay identical. As simplifying
+    them one by one would let shared edges drift apart, they are left unchanged if
+    coverage_simplify is unavailable (before shapely 2.1). Other geometries are simplified
+    one by one with preserve_topology enabled.
+
+    :param geometries: List or array of Shapely geometries.
+    :param tolerance: Simplification tolerance, in units of the coordinate reference system.
+    :param coverage: True if the geometries are polygons forming a coverage.
+    :return: Array of simplified geometries.
+    """
+    array = np.asarray(geometries, dtype=object)
+    if tolerance <= 0 or not len(array):
+        return array
+    polygonal = np.isin(shapely.get_type_id(array), (_POLYGON, _MULTI_POLYGON)).all()
+    if coverage and polygonal:
+        if not hasattr(shapely, "coverage_simplify"):  # requires shapely 2.1
+            _report_unsimplified()
+            return array
+        return shapely.coverage_simplify(array, tolerance, simplify_boundary=True)
+    return shapely.simplify(array, tolerance, preserve_topology=True)
+
+
+def coordinate_count(geometries: list[Any] | np.ndarray | Any) -> int:
+    """
+    Counts the coordinates (vertices) of one or more geometries.
+
+    :param geometries: Shapely geometry, or list or array of Shapely geometries.
+    :return: Total number of coordinates.
+    """
+    return int(np.sum(shapely.get_num_coordinates(np.asarray(geometries, dtype=object))))
+
+
+@cache
+def _report_unsimplified() -> None:
+    """
+    Reports once that coverages are not simplified, as coverage simplification is unavailable.
+    """
+    print(f"\rWARNING: Coverage simplification requires shapely 2.1 or later (found {shapely.__version__}), "
+          f"so depth bands are not simplified. Upgrade shapely to simplify them.")
@@ -0,0 +1,267 @@
+"""
+Contains the Topology class for storing polygonal layers with shared edges kept once as arcs.
+"""
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import shapely
+from shapely import geometry as geo
+
+from .repair import repair_geometries
+
+# Shapely geometry type id of polygons, which are the only parts kept from layers
+_POLYGON = 3
+
+
+class Topology:
+    """
+    Topological store of polygonal layers in the style of TopoJSON, where every boundary is
+    kept once as an arc, and each ring of each polygon references its arcs by index. A ring
+    traversing an arc backwards references it by the one's complement (~index) of its index.
+    Each layer is kept as its features, i.e. the polygons of each record with its attributes.
+
+    Rings are cut into arcs at junctions, i.e. at vertices whose neighbouring vertices differ
+    between the rings passing through them, such that edges shared by adjacent layers (e.g.
+    depth bands, land and shore) or polygons become identical arcs. Coordinates are expected
+    to match exactly along shared edges, e.g. after snapping them to a precision grid.
+
+    :param arcs: List of arcs as arrays of coordinates.
+    :param layers: Dictionary mapping layer labels to their features, as lists of polygons,
+        as lists of rings, as lists of arc references.
+    :param properties: Dictionary mapping layer labels to their attribute columns.
+    :param token: Optional identifier of the stored contents, generated if not given.
+    """
+    def __init__(
+            self,
+            arcs: list[np.ndarray],
+            layers: dict[str, list[list[list[list[int]]]]],
+            properties: dict[str, dict[str, list]],
+            token: str | None = None,
+    ):
+        """
+        Initializes the Topology from its arcs and the arc references of each layer.
+
+        :param arcs: List of arcs as arrays of coordinates.
+        :param layers: Dictionary mapping layer labels to features referencing arcs.
+        :param properties: Dictionary mapping layer labels to their attribute columns.
+        :param token: Optional identifier of the stored contents, generated if not given.
+        """
+        self.arcs = arcs
+        self.layers = layers
+        self.properties = properties
+        self.token = token if token is not None else uuid.uuid4().hex
+
+    @classmethod
+    def from_features(cls, features: dict[str, tuple[list[Any], dict[str, list]]]) -> "Topology":
+        """
+        Builds a Topology from the polygonal features of several layers.
+
+        :param features: Dictionary mapping layer labels to a list of the (Multi)Polygon
+            geometries of their features and a dictionary of their attribute columns.
+        :return: A Topology of the features of all layers.
+        """
+        polygons = {
+            label: [_polygon_parts(geometry) for geometry in geometries]
+            for label, (geometries, _) in features.items()
+        }
+        rings = [
+            _ring_coordinates(ring)
+            for parts in polygons.values() for feature in parts for polygon in feature
+            for ring in (polygon.exterior, *polygon.interiors)
+        ]
+        junctions = _junctions(rings)
+        arcs, index = [], {}
+        references = iter([_cut_ring(ring, junctions, arcs, index) for ring in rings])
+        layers = {
+            label: [
+                [[next(references) for _ in range(1 + len(polygon.interiors))] for polygon in feature]
+                for feature in parts
+            ]
+            for label, parts in polygons.items()
+        }
+        return cls(arcs, layers, {label: properties for label, (_, properties) in features.items()})
+
+    @property
+    def coordinate_count(self) -> int:
+        """
+        Counts the coordinates stored in the arcs, each shared edge being counted once.
+
+        :return: Total number of arc coordinates.
+        """
+        return sum(len(arc) for arc in self.arcs)
+
+    def features(self, label: str) -> tuple[list[Any], dict[str, list]]:
+        """
+        Reconstructs the features of a layer from the arcs referenced by their rings.
+
+        :param label: Label of the layer.
+        :return: Tuple of a list of the geometries of the features, each a Polygon, or a
+            MultiPolygon if it has several or no parts, and a dictionary of their attribute
+            columns. The list is empty if the layer is not stored.
+        """
+        features, polygons = self.layers.get(label, []), []
+        for feature in features:
+            for polygon in feature:
+                rings = [self._ring(references) for references in polygon]
+                polygons.append(geo.Polygon(rings[0], rings[1:]))
+        if polygons:
+            polygons, _ = repair_geometries(polygons)
+        polygons, geometries, start = list(polygons), [], 0
+        for feature in features:
+            parts = shapely.get_parts(polygons[start:start + len(feature)])
+            parts = list(parts[shapely.get_type_id(parts) == _POLYGON])
+            geometries.append(parts[0] if len(parts) == 1 else geo.MultiPolygon(parts))
+            start += len(feature)
+        return geometries, self.properties.get(label, {})
+
+    def simplify(self, tolerance: float) -> None:
+        """
+        Simplifies every arc once with the given tolerance, keeping its end points, such that
+        shared edges stay identical in all layers referencing them. Closed arcs that would
+        collapse are kept as they are.
+
+        :param tolerance: Simplification tolerance, in units of the coordinate reference system.
+        """
+        if tolerance <= 0 or not self.arcs:
+            return
+        lengths = [len(arc) for arc in self.arcs]
+        lines = shapely.linestrings(np.concatenate(self.arcs), indices=np.repeat(np.arange(len(lengths)), lengths))
+        lines = shapely.simplify(lines, tolerance)
+        for i, line in enumerate(lines):
+            coordinates = shapely.get_coordinates(line)
+            closed = np.array_equal(self.arcs[i][0], self.arcs[i][-1])
+            if len(coordinates) >= (4 if closed else 2):
+                self.arcs[i] = coordinates
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the Topology to a file, with all arc coordinates in a single array, through
+        a temporary file that is then renamed.
+
+        :param path: Path of the file to be written, with '.npz' suffix.
+        """
+        lengths = np.array([len(arc) for arc in self.arcs], dtype=np.int64)
+        coordinates = np.concatenate(self.arcs) if self.arcs else np.empty((0, 2))
+        temporary_path = path.with_name(path.name + ".tmp")
+        with open(temporary_path, "wb") as file:
+            np.savez(
+                file,
+                coordinates=coordinates,
+                lengths=lengths,
+                layers=json.dumps(self.layers),
+                properties=json.dumps(self.properties),
+                token=self.token,
+            )
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Topology":
+        """
+        Reads a Topology from a file written by save.
+
+        :param path: Path to the topology file.
+        :return: The loaded Topology.
+        """
+        with np.load(path) as data:
+            coordinates, lengths = data["coordinates"], data["lengths"]
+            layers = json.loads(str(data["layers"]))
+            properties = json.loads(str(data["properties"]))
+            token = str(data["token"])
+        arcs = np.split(coordinates, np.cumsum(lengths)[:-1]) if len(lengths) else []
+        return cls(list(arcs), layers, properties, token)
+
+    def _ring(self, references: list[int]) -> np.ndarray:
+        """
+        Joins the referenced arcs into the coordinates of a closed ring.
+
+        :param references: List of arc indices, where ~index references a reversed arc.
+        :return: Array of ring coordinates.
+        """
+        parts = []
+        for i, reference in enumerate(references):
+            arc = self.arcs[reference] if reference >= 0 else self.arcs[~reference][::-1]
+            parts.append(arc if i == 0 else arc[1:])
+        return np.concatenate(parts)
+
+
+def _polygon_parts(geometry: Any) -> list[geo.Polygon]:
+    """
+    Returns the non-empty polygons of a geometry.
+
+    :param geometry: Shapely geometry, e.g. a MultiPolygon.
+    :return: List of polygons.
+    """
+    parts = shapely.get_parts(geometry)
+    return [part for part in parts[shapely.get_type_id(parts) == _POLYGON] if not part.is_empty]
+
+
+def _ring_coordinates(ring: geo.LinearRing) -> np.ndarray:
+    """
+    Returns the coordinates of a ring without its closing coordinate.
+
+    :param ring: Shapely LinearRing.
+    :return: Array of the distinct ring coordinates in order.
+    """
+    return shapely.get_coordinates(ring)[:-1]
+
+
+def _junctions(rings: list[np.ndarray]) -> set[bytes]:
+    """
+    Finds the junctions of rings, i.e. the coordinates passed by rings with different
+    neighbouring coordinates, where shared edges start or end.
+
+    :param rings: List of ring coordinates without closing coordinates.
+    :return: Set of junction coordinates as bytes.
+    """
+    if not rings:
+        return set()
+    points = np.concatenate(rings)
+    previous = np.concatenate([np.roll(ring, 1, axis=0) for ring in rings])
+    following = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+    swap = (previous[:, 0] > following[:, 0]) | (
+        (previous[:, 0] == following[:, 0]) & (previous[:, 1] > following[:, 1])
+    )
+    first = np.where(swap[:, np.newaxis], following, previous)
+    second = np.where(swap[:, np.newaxis], previous, following)
+    neighbourhoods = np.unique(np.hstack([points, first, second]), axis=0)
+    coordinates, counts = np.unique(neighbourhoods[:, :2], axis=0, return_counts=True)
+    return {coordinate.tobytes() for coordinate in coordinates[counts > 1]}
+
+
+def _cut_ring(ring: np.ndarray, junctions: set[bytes], arcs: list[np.ndarray], index: dict[bytes, int]) -> list[int]:
+    """
+    Cuts a ring into arcs at its junctions, adding new arcs to the store and referencing
+    arcs that are already stored, in either direction.
+
+    :param ring: Ring coordinates without closing coordinate.
+    :param junctions: Set of junction coordinates as bytes.
+    :param arcs: List of stored arcs, extended with new arcs.
+    :param index: Dictionary mapping the coordinates of stored arcs as bytes to their index.
+    :return: List of arc references of the ring.
+    """
+    cuts = [i for i, point in enumerate(ring) if point.tobytes() in junctions]
+    if cuts:
+        ring = np.roll(ring, -cuts[0], axis=0)
+        cuts = [cut - cuts[0] for cut in cuts]
+    else:
+        # a ring without junctions is a single closed arc, starting at its smallest coordinate
+        ring = np.roll(ring, -np.lexsort((ring[:, 1], ring[:, 0]))[0], axis=0)
+        cuts = [0]
+    closed = np.vstack([ring, ring[:1]])
+    references = []
+    for start, end in zip(cuts, [*cuts[1:], len(ring)]):
+        arc = closed[start:end + 1]
+        forward, backward = arc.tobytes(), arc[::-1].tobytes()
+        if forward in index:
+            references.append(index[forward])
+        elif backward in index:
+            references.append(~index[backward])
+        else:
+            index[forward] = len(arcs)
+            references.append(len(arcs))
+            arcs.append(arc)
+    return references
@@ -0,0 +1,218 @@
+"""
+Contains the UnionEngine class for merging large numbers of geometries in parallel.
+"""
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import cache
+from typing import Any
+
+import numpy as np
+import shapely
+
+# Rough estimate of the memory used per input coordinate while overlaying geometries
+_BYTES_PER_COORDINATE = 200
+
+# Shapely geometry type ids of the components merged without overlay
+_LINESTRING, _POLYGON = 1, 3
+
+
+class UnionEngine:
+    """
+    Union engine merging geometries by partitioning them spatially on a grid, uniting the
+    partitions in a pool of worker processes, and merging the partial unions pairwise in a
+    reduction tree, such that neighbouring partitions are merged first.
+
+    :param workers: Number of worker processes, where 1 unites all partitions in-process.
+    :param max_memory: Optional memory ceiling in megabytes, bounding the number of
+                       coordinates of the partitions united at the same time.
+    :param partition_size: Maximum number of geometries in each partition.
+    :param coverage: How polygonal coverages are merged, either 'validate' to check that
+                     the polygons form a coverage, 'trust' to assume so, or None to always
+                     use the generic union.
+    """
+    def __init__(self, workers: int = 1, max_memory: int | None = None, partition_size: int = 2000,
+                 coverage: str | None = "validate"):
+        """
+        Initializes the UnionEngine with its worker count and partition limits.
+
+        :param workers: Number of worker processes.
+        :param max_memory: Optional memory ceiling in megabytes.
+        :param partition_size: Maximum number of geometries in each partition.
+        :param coverage: How polygonal coverages are merged ('validate', 'trust' or None).
+        """
+        self.workers = max(1, workers)
+        self.max_memory = max_memory
+        self.partition_size = partition_size
+        self.coverage = coverage
+
+    def serial(self) -> "UnionEngine":
+        """
+        Returns an engine with the same partition limits that unites in-process, e.g. for use
+        inside worker processes that must not start pools of their own.
+
+        :return: A single-worker UnionEngine.
+        """
+        return UnionEngine(1, self.max_memory, self.partition_size, self.coverage)
+
+    def union(self, geometries: list[Any]) -> Any:
+        """
+        Unites the given geometries into a single geometry, as shapely's unary_union.
+
+        :param geometries: List of Shapely geometries to be united.
+        :return: The union of the geometries.
+        """
+        partitions = self._partitions(geometries)
+        if len(partitions) <= 1:
+            return shapely.union_all(geometries)
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(partitions))) as executor:
+                return self._reduce(partitions, executor)
+        return self._reduce(partitions, None)
+
+    def union_coverage(self, geometries: list[Any]) -> Any:
+        """
+        Unites the polygonal parts of geometries expected to form a coverage, i.e. sharing
+        edges without overlapping (e.g. S-57 depth areas), using shapely's coverage_union.
+        Other parts (e.g. line slivers left by clipping) and empty parts are dropped.
+
+        Falls back to the generic union if the polygons fail validation, if the coverage
+        union fails or if a trusted coverage union is invalid. Validation requires shapely
+        2.1 or later, without which 'validate' always uses the generic union.
+
+        :param geometries: List of Shapely geometries to be united.
+        :return: The union of the polygonal parts, or an empty MultiPolygon if there are none.
+        """
+        parts = shapely.get_parts(np.asarray(geometries, dtype=object))
+        polygons = parts[(shapely.get_type_id(parts) == _POLYGON) & ~shapely.is_empty(parts)]
+        if not len(polygons):
+            return shapely.MultiPolygon()
+        if self.coverage is not None and len(polygons) > 1 and self._coverage_supported():
+            try:
+                if self.coverage == "trust":
+                    geometry = shapely.coverage_union_all(polygons)
+                    if geometry.is_valid:
+                        return geometry
+                elif shapely.is_valid(polygons).all() and shapely.coverage_is_valid(polygons):
+                    return shapely.coverage_union_all(polygons)
+            except shapely.errors.GEOSException:
+                pass
+        return self.union(list(polygons))
+
+    def _coverage_supported(self) -> bool:
+        """
+        Checks whether the configured coverage union can be used, reporting once if coverage
+        validation is unavailable, as it requires shapely 2.1 or later.
+
+        :return: True if the coverage union is trusted, or may be validated.
+        """
+        if self.coverage == "trust" or hasattr(shapely, "coverage_is_valid"):
+            return True
+        _report_unvalidated()
+        return False
+
+    @staticmethod
+    def _reduce(partitions: list[list[Any]], executor: Executor | None) -> Any:
+        """
+        Unites each partition, and merges the partial unions pairwise until one remains.
+
+        :param partitions: List of spatially ordered partitions of geometries.
+        :param executor: Optional executor running the unions in worker processes.
+        :return: The union of all partitions.
+        """
+        apply = executor.map if executor is not None else map
+        parts = list(apply(shapely.union_all, partitions))
+        while len(parts) > 1:
+            pairs = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+            parts = list(apply(UnionEngine._merge_pair, pairs))
+        return parts[0]
+
+    @staticmethod
+    def _merge_pair(pair: list[Any]) -> Any:
+        """
+        Merges two partial unions, overlaying only the components of each that intersect
+        components of the other, and collecting all other components as they are.
+
+        :param pair: List of one or two partial unions.
+        :return: The union of the partial unions.
+        """
+        if len(pair) == 1:
+            return pair[0]
+        first, second = (shapely.get_parts(part) for part in pair)
+        types = set(shapely.get_type_id(np.concatenate([first, second])).tolist())
+        if not types <= {_POLYGON} and not types <= {_LINESTRING}:
+            return shapely.union_all(pair)
+        first_index, second_index = shapely.STRtree(second).query(first, predicate="intersects")
+        first_index, second_index = np.unique(first_index), np.unique(second_index)
+        overlaid = shapely.union_all(np.concatenate([first[first_index], second[second_index]]))
+        components = np.concatenate([
+            np.delete(first, first_index), np.delete(second, second_index), shapely.get_parts(overlaid)
+        ])
+        if types == {_POLYGON}:
+            return shapely.multipolygons(components)
+        return shapely.multilinestrings(components)
+
+    def _partitions(self, geometries: list[Any]) -> list[list[Any]]:
+        """
+        Splits geometries into partitions of spatial neighbours, ordering them along the
+        rows of a grid in alternating directions, and limiting each partition by its number
+        of geometries and coordinates.
+
+        :param geometries: List of Shapely geometries to be partitioned.
+        :return: List of partitions, where consecutive partitions are spatial neighbours.
+        """
+        if len(geometries) <= self.partition_size:
+            return [list(geometries)]
+        array = np.asarray(geometries, dtype=object)
+        bounds = shapely.bounds(array)
+        x = (bounds[:, 0] + bounds[:, 2]) / 2
+        y = (bounds[:, 1] + bounds[:, 3]) / 2
+        side = math.ceil(math.sqrt(len(geometries) / self.partition_size))
+        columns = self._grid_index(x, side)
+        rows = self._grid_index(y, side)
+        columns = np.where(rows % 2 == 0, columns, side - 1 - columns)
+        order = np.lexsort((columns, rows))
+
+        max_coordinates = None
+        if self.max_memory is not None:
+            max_coordinates = self.max_memory * 10 ** 6 // (_BYTES_PER_COORDINATE * self.workers)
+        coordinates = shapely.get_num_coordinates(array)
+
+        partitions, partition, count = [], [], 0
+        for i in order:
+            full = len(partition) >= self.partition_size
+            if max_coordinates is not None and count + coordinates[i] > max_coordinates:
+                full = True
+            if partition and full:
+                partitions.append(partition)
+                partition, count = [], 0
+            partition.append(geometries[i])
+            count += coordinates[i]
+        if partition:
+            partitions.append(partition)
+        return partitions
+
+    @staticmethod
+    def _grid_index(values: np.ndarray, side: int) -> np.ndarray:
+        """
+        Returns the grid cell index of each value, dividing their range into equal cells.
+
+        :param values: Array of coordinate values.
+        :param side: Number of grid cells along the axis.
+        :return: Array of grid cell indices from 0 to side - 1.
+        """
+        low, high = np.nanmin(values), np.nanmax(values)
+        if not high > low:
+            return np.zeros(len(values), dtype=int)
+        values = np.where(np.isnan(values), low, values)
+        index = ((values - low) / (high - low) * side).astype(int)
+        return np.clip(index, 0, side - 1)
+
+
+@cache
+def _report_unvalidated() -> None:
+    """
+    Reports once that coverage unions are not validated, and thus not used.
+    """
+    print(f"WARNING: Coverage validation requires shapely 2.1 or later (found {shapely.__version__}), "
+          f"so depth areas are merged with the generic union. Upgrade shapely, or set "
+          f"'coverage_union: trust' for depth areas known to form a coverage.")
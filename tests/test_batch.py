@@ -0,0 +1,141 @@
+"""
+Tests of batch builds of many regions, comparing the cached layers of parallel and serial builds
+and checking that the cache limit keeps the entries of every region in the batch and those
+recently used by other processes.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+import fiona
+import pytest
+import yaml
+from shapely import geometry as geo
+
+from seacharts import build_regions
+from seacharts.core import GPKGParser, Ingestion, cache, paths
+from seacharts.layers import Land, Seabed, Shore
+
+X, Y = 500000, 7000000
+DEPTHS = [0, 2, 5]
+
+
+def _write_chart(path: Path, islets: int = 0) -> None:
+    """
+    Writes a small GeoPackage chart with overlapping depth areas, a shoal and an island.
+
+    :param path: Path of the GeoPackage file to be written.
+    :param islets: Number of rows and columns of a grid of small islets, enlarging the cache.
+    """
+    def box(x, y, size=10):
+        return geo.mapping(geo.box(X + x, Y + y, X + x + size, Y + y + size))
+
+    layers = dict(
+        dybdeareal=([(box(i * 5, 0), dict(minimumsdybde=float(i))) for i in range(10)], dict(minimumsdybde="float")),
+        grunne=([(box(0, 50), dict(dybde=3.0))], dict(dybde="float")),
+        landareal=([(box(100, 100), {})] + [
+            (box(30 + 2 * i, 100 + 2 * j, size=1), {}) for i in range(islets) for j in range(islets)
+        ], {}),
+    )
+    for name, (features, properties) in layers.items():
+        schema = dict(geometry="Polygon", properties=properties)
+        with fiona.open(path, "w", driver="GPKG", layer=name, schema=schema, crs="EPSG:25833") as sink:
+            sink.writerecords(dict(geometry=g, properties=p) for g, p in features)
+
+
+def _write_configs(directory: Path, chart: Path, **ingestion) -> list[Path]:
+    """
+    Writes the config files of two overlapping regions of a chart.
+
+    :param directory: Directory of the config files.
+    :param chart: Path to the chart resource.
+    :param ingestion: Ingestion settings of both regions.
+    :return: List of the config file paths.
+    """
+    configs = []
+    for name, origin, size in (("a", [X - 10, Y - 10], [40, 80]), ("b", [X + 20, Y - 10], [200, 200])):
+        settings = dict(enc=dict(size=size, origin=origin, depths=DEPTHS, crs="UTM33N",
+                                 resources=[str(chart)], ingestion=dict(precision=0.01, **ingestion)))
+        path = directory / f"{name}.yaml"
+        path.write_text(yaml.dump(settings))
+        configs.append(path)
+    return configs
+
+
+def _cached_layers(root: Path, chart: Path, monkeypatch) -> dict[str, dict[str, geo.base.BaseGeometry]]:
+    """
+    Loads the cached layers of every cache entry under a shapefile directory, with seabeds
+    as their stored depth bands.
+
+    :param root: Shapefile directory the regions were built into.
+    :param chart: Path to the chart resource.
+    :return: Dictionary mapping cache entry names to the geometries of their layers by label.
+    """
+    cached = {}
+    for entry in sorted(path for path in root.glob("*/*") if path.is_dir()):
+        monkeypatch.setattr(paths, "shapefiles", entry)
+        parser = GPKGParser((X - 10, Y - 10, X + 220, Y + 190), [str(chart)], Ingestion())
+        layers = [Land(), Shore(), *(Seabed(depth=depth) for depth in DEPTHS)]
+        for layer in layers:
+            parser.load_shapefiles(layer)
+        cached[entry.name] = {layer.label: layer.geometry for layer in layers}
+    return cached
+
+
+@pytest.fixture
+def chart(tmp_path: Path) -> Path:
+    path = tmp_path / "chart.gpkg"
+    _write_chart(path)
+    return path
+
+
+def test_parallel_build_matches_serial_build(tmp_path: Path, chart: Path, monkeypatch) -> None:
+    configs = _write_configs(tmp_path, chart)
+    results = {}
+    for workers in (1, 2):
+        root = tmp_path / f"shapefiles{workers}"
+        monkeypatch.setattr(paths, "shapefiles", root)
+        build_regions(configs, workers=workers)
+        results[workers] = _cached_layers(root, chart, monkeypatch)
+
+    assert len(results[1]) == 2
+    assert results[1].keys() == results[2].keys()
+    for name, serial in results[1].items():
+        for label, geometry in serial.items():
+            assert geometry.equals(results[2][name][label]), f"{label} of entry {name} differs"
+    assert any(not layer.is_empty for layers in results[1].values() for layer in layers.values())
+
+
+def test_batch_build_keeps_cache_entries_of_every_region(tmp_path: Path, monkeypatch) -> None:
+    configs = []
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        chart = tmp_path / name / "chart.gpkg"
+        _write_chart(chart, islets=85)
+        configs += _write_configs(tmp_path / name, chart, cache_limit=1)
+    root = tmp_path / "shapefiles"
+    monkeypatch.setattr(paths, "shapefiles", root)
+    monkeypatch.setattr(cache, "_GRACE_PERIOD", 0)
+    build_regions(configs)
+
+    entries = [path for path in root.glob("*/*") if path.is_dir()]
+    assert len(entries) == 4
+    assert all((entry / "build.json").exists() for entry in entries)
+    assert sum(path.stat().st_size for path in root.rglob("*") if path.is_file()) > 1e6
+
+
+def test_cache_limit_keeps_entries_used_within_the_grace_period(tmp_path: Path) -> None:
+    long_ago = time.time() - 2 * cache._GRACE_PERIOD
+    entries = {}
+    for name, used, written in (("old", long_ago, long_ago), ("used", time.time(), long_ago),
+                                ("written", long_ago, time.time())):
+        entries[name] = tmp_path / name
+        entries[name].mkdir()
+        (entries[name] / "entry.json").write_text(json.dumps(dict(used=used, inputs={})))
+        (entries[name] / "layer.shp").write_bytes(bytes(1000))
+        for path in entries[name].iterdir():
+            os.utime(path, (written, written))
+    cache.collect_garbage(tmp_path, 0, keep=set())
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["used", "written"]
@@ -0,0 +1,140 @@
+"""
+Tests of the layer cache formats, writing geometries and reading them back.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+import shapely
+from shapely import geometry as geo
+
+from seacharts.core.columnar import (
+    COLUMNAR_SUFFIXES, columnar_available, read_columnar, read_columnar_schema, write_columnar,
+)
+from seacharts.core.mapped import read_mapped, write_mapped
+from seacharts.core.quantized import read_quantized, read_quantized_schema, write_quantized
+from seacharts.shapes import Topology
+
+
+def _geometries() -> dict:
+    """
+    Creates layer geometries of every stored dimension and of several geometry types.
+
+    :return: Dictionary mapping layer labels to geometries.
+    """
+    return dict(
+        land=geo.MultiPolygon([geo.box(0, 0, 10, 10), geo.box(20, 0, 30, 10).difference(geo.box(22, 2, 28, 8))]),
+        shore=geo.MultiLineString([[(0, 0), (5, 5), (10, 0)]]),
+        soundings=geo.MultiPoint([(1, 2, -3.5), (4, 5, -12.0)]),
+    )
+
+
+def test_mapped_round_trip_keeps_geometries_and_z_values(tmp_path: Path) -> None:
+    path = tmp_path / "geometry.bin"
+    geometries = _geometries()
+    write_mapped(path, geometries)
+    loaded = read_mapped(path, verify=True)
+
+    assert loaded.keys() == geometries.keys()
+    for label, geometry in geometries.items():
+        assert shapely.equals_exact(loaded[label], geometry, 0)
+    assert shapely.has_z(loaded["soundings"])
+    assert shapely.get_coordinates(loaded["soundings"], include_z=True)[:, 2].tolist() == [-3.5, -12.0]
+
+
+def test_truncated_mapped_file_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "geometry.bin"
+    write_mapped(path, _geometries())
+    path.write_bytes(path.read_bytes()[:-8])
+
+    assert read_mapped(path) is None
+
+
+def test_mapped_checksum_is_only_verified_on_request(tmp_path: Path) -> None:
+    path = tmp_path / "geometry.bin"
+    write_mapped(path, dict(land=geo.MultiPolygon([geo.box(0, 0, 10, 10)])))
+    data = bytearray(path.read_bytes())
+    data[data.find(np.float64(10).tobytes())] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert read_mapped(path) is not None
+    assert read_mapped(path, verify=True) is None
+
+
+@pytest.mark.skipif(not columnar_available(), reason="pyarrow is not installed")
+@pytest.mark.parametrize("cache_format", ["parquet", "feather"])
+def test_columnar_round_trip_keeps_records_merged_geometry_and_z_values(tmp_path: Path, cache_format: str) -> None:
+    path = tmp_path / f"soundings{COLUMNAR_SUFFIXES[cache_format]}"
+    geometries = [geo.MultiPoint([(1, 2, -3.5)]), geo.MultiPoint([(4, 5, -12.0)])]
+    merged = shapely.union_all(geometries)
+    schema = dict(geometry="MultiPoint", properties=dict(DEPTH="float", name="str"))
+    write_columnar(path, geometries, dict(DEPTH=[3.5, 12.0], name=["a", None]), merged, schema, "EPSG:25833")
+    table, loaded = read_columnar(path)
+
+    assert all(shapely.equals_exact(a, b, 0) for a, b in zip(table.geometries, geometries))
+    assert shapely.get_coordinates(table.geometries, include_z=True)[:, 2].tolist() == [-3.5, -12.0]
+    assert table.properties == dict(DEPTH=[3.5, 12.0], name=["a", None])
+    assert shapely.equals_exact(loaded, merged, 0)
+    assert read_columnar_schema(path) == schema
+
+
+@pytest.mark.skipif(not columnar_available(), reason="pyarrow is not installed")
+@pytest.mark.parametrize("cache_format", ["parquet", "feather"])
+def test_columnar_read_keeps_records_in_bounding_box(tmp_path: Path, cache_format: str) -> None:
+    path = tmp_path / f"land{COLUMNAR_SUFFIXES[cache_format]}"
+    geometries = [geo.box(0, 0, 10, 10), geo.box(50, 50, 60, 60)]
+    write_columnar(path, geometries, dict(name=["near", "far"]))
+    table, merged = read_columnar(path, (-5, -5, 20, 20))
+
+    assert [record["properties"]["name"] for record in table] == ["near"]
+    assert shapely.equals(table.geometries[0], geometries[0])
+    assert merged is None
+    assert read_columnar_schema(path) is None
+
+
+def test_quantized_round_trip_snaps_to_the_grid_and_keeps_z_values(tmp_path: Path) -> None:
+    path = tmp_path / "soundings.npz"
+    geometries = [geo.MultiPoint([(100.004, 200.006, -3.5)]), geo.MultiPoint([(150.0, 250.0, -12.25)])]
+    schema = dict(geometry="MultiPoint", properties=dict(DEPTH="float"))
+    write_quantized(path, geometries, dict(DEPTH=[3.5, 12.25]), (100, 200), 0.01, schema)
+    table = read_quantized(path)
+
+    assert shapely.get_coordinates(table.geometries, include_z=True).tolist() == [
+        [100.0, 200.01, -3.5], [150.0, 250.0, -12.25],
+    ]
+    assert table.properties == dict(DEPTH=[3.5, 12.25])
+    assert read_quantized_schema(path) == schema
+
+
+def test_quantized_read_keeps_records_in_bounding_box(tmp_path: Path) -> None:
+    path = tmp_path / "land.npz"
+    geometries = [geo.box(0, 0, 10, 10), geo.box(50, 50, 60, 60)]
+    write_quantized(path, geometries, dict(name=["near", "far"]), (0, 0), 0.5)
+    table = read_quantized(path, (-5, -5, 20, 20))
+
+    assert [record["properties"]["name"] for record in table] == ["near"]
+    assert shapely.equals(table.geometries[0], geometries[0])
+
+
+def test_quantized_layer_without_geometries_reads_empty(tmp_path: Path) -> None:
+    path = tmp_path / "shore.npz"
+    write_quantized(path, [], dict(depth=[]), (0, 0), 0.01)
+
+    assert len(read_quantized(path)) == 0
+
+
+def test_topology_round_trip_keeps_features_and_shares_edges(tmp_path: Path) -> None:
+    path = tmp_path / "topology.npz"
+    land = [geo.box(0, 0, 10, 10), geo.MultiPolygon([geo.box(20, 0, 30, 10), geo.box(40, 0, 50, 10)])]
+    seabed = [geo.box(10, 0, 20, 10).difference(geo.box(12, 2, 18, 8))]
+    features = dict(land=(land, dict(name=["a", "b"])), seabed=(seabed, dict(depth=[0])))
+    Topology.from_features(features).save(path)
+    topology = Topology.load(path)
+
+    for label, (geometries, properties) in features.items():
+        loaded, loaded_properties = topology.features(label)
+        assert loaded_properties == properties
+        assert all(a.equals(b) for a, b in zip(loaded, geometries))
+    shared = [arc for arc in topology.arcs if np.array_equal(arc[:, 0], [10, 10])]
+    assert len(shared) == 1
+    assert topology.features("shore") == ([], {})
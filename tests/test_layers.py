@@ -0,0 +1,38 @@
+"""
+Tests of the cumulative views of seabed layers stored as depth bands.
+"""
+from shapely import geometry as geo
+
+from seacharts.layers import Seabed
+
+
+def _linked_seabeds(*depths: int) -> list[Seabed]:
+    """
+    Creates seabeds of the given depths, each linked to the next deeper one.
+
+    :param depths: Depths of the seabeds, in ascending order.
+    :return: List of the linked seabeds.
+    """
+    seabeds = [Seabed(depth=depth) for depth in depths]
+    for seabed, deeper in zip(seabeds, seabeds[1:]):
+        seabed.deeper = deeper
+    return seabeds
+
+
+def test_cumulative_view_follows_replaced_bands() -> None:
+    shallow, deep = _linked_seabeds(0, 5)
+    shallow.geometry = geo.MultiPolygon([geo.box(0, 0, 1, 1)])
+    for size in range(2, 20):
+        # freeing the previous band first lets the new band take its id
+        deep.geometry = geo.MultiPolygon()
+        deep.geometry = geo.MultiPolygon([geo.box(1, 0, size, 1)])
+        assert shallow.geometry.area == size
+        assert shallow.band.area == 1
+
+
+def test_cumulative_view_of_empty_deeper_band_is_the_band() -> None:
+    shallow, deep = _linked_seabeds(0, 5)
+    shallow.geometry = geo.MultiPolygon([geo.box(0, 0, 1, 1)])
+    assert isinstance(shallow.geometry, geo.MultiPolygon)
+    assert shallow.geometry.equals(shallow.band)
+    assert deep.geometry.is_empty
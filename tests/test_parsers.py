@@ -0,0 +1,148 @@
+"""
+Tests of parsing FGDB-style charts into map layers, read from a small GeoPackage chart.
+"""
+from pathlib import Path
+
+import fiona
+import pytest
+from shapely import geometry as geo
+
+from seacharts.core import GPKGParser, Ingestion, MapFormat, Scope, paths
+from seacharts.layers import Land, Layer, Seabed, Shore
+
+X, Y = 500000, 7000000
+BOUNDING_BOX = X - 10, Y - 10, X + 120, Y + 120
+
+
+def _write_chart(path: Path) -> None:
+    """
+    Writes a GeoPackage chart with depth areas from 0 to 9 meters and an island.
+
+    :param path: Path of the GeoPackage file to be written.
+    """
+    layers = dict(
+        dybdeareal=([(geo.box(X + i * 5, Y, X + i * 5 + 10, Y + 10), dict(minimumsdybde=float(i)))
+                     for i in range(10)], dict(minimumsdybde="float")),
+        landareal=([(geo.box(X + 100, Y + 100, X + 110, Y + 110), {})], {}),
+    )
+    for name, (features, properties) in layers.items():
+        schema = dict(geometry="Polygon", properties=properties)
+        with fiona.open(path, "w", driver="GPKG", layer=name, schema=schema, crs="EPSG:25833") as sink:
+            sink.writerecords(dict(geometry=geo.mapping(g), properties=p) for g, p in features)
+
+
+def _map_layers(depths: list[int]) -> list[Layer]:
+    """
+    Creates the map layers of a chart, with each seabed linked to the next deeper one.
+
+    :param depths: List of depth bins.
+    :return: List of the land, shore and seabed layers.
+    """
+    seabeds = [Seabed(depth=depth) for depth in sorted(depths)]
+    for seabed, deeper in zip(seabeds, seabeds[1:]):
+        seabed.deeper = deeper
+    return [Land(), Shore(), *seabeds]
+
+
+@pytest.fixture
+def chart(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "chart.gpkg"
+    _write_chart(path)
+    monkeypatch.setattr(paths, "shapefiles", tmp_path / "shapefiles")
+    return path
+
+
+def _parse(chart: Path, layers: list[Layer], **ingestion) -> GPKGParser:
+    """
+    Parses the layers of a chart into the shapefile cache.
+
+    :param chart: Path to the chart resource.
+    :param layers: List of Layer objects to be parsed.
+    :param ingestion: Ingestion settings of the parser.
+    :return: The parser of the chart.
+    """
+    for layer in layers:
+        (paths.shapefiles / layer.label).mkdir(parents=True, exist_ok=True)
+    parser = GPKGParser(BOUNDING_BOX, [str(chart)], Ingestion(ingestion))
+    parser.parse_resources(layers, [str(chart)], 1e8)
+    return parser
+
+
+@pytest.mark.parametrize("single_scan", [True, False])
+def test_empty_deepest_depth_bin_leaves_other_layers_parsed(chart: Path, single_scan: bool) -> None:
+    land, shore, *seabeds = layers = _map_layers([0, 2, 50])
+    _parse(chart, layers, single_scan=single_scan, workers=1)
+
+    assert land.geometry.area == pytest.approx(100)
+    assert seabeds[2].geometry.is_empty
+    assert seabeds[1].geometry.area == pytest.approx(45 * 10)
+    assert seabeds[0].geometry.area == pytest.approx(55 * 10)
+    assert seabeds[0].band.area == pytest.approx(10 * 10)
+
+
+def test_layers_loaded_from_mapped_cache_read_their_records(chart: Path) -> None:
+    layers = _map_layers([0, 2])
+    _parse(chart, layers, mapped=True).write_mapped_cache(layers)
+    parsers, loaded = {}, {}
+    for mapped in (True, False):
+        parsers[mapped] = GPKGParser(BOUNDING_BOX, [str(chart)], Ingestion(dict(mapped=mapped)))
+        loaded[mapped] = _map_layers([0, 2])
+        for layer in loaded[mapped]:
+            parsers[mapped].load_shapefiles(layer)
+    land, *_ = loaded[True]
+
+    assert parsers[True]._read_mapped_cache().keys() == {layer.label for layer in layers}
+    assert len(land.records) == 1
+    assert land.get_params_at_coord(X + 105, Y + 105) is not None
+    assert land.get_params_at_coord(X + 105, Y + 105) == loaded[False][0].get_params_at_coord(X + 105, Y + 105)
+
+
+def test_quantized_cache_format_replaces_the_shapefiles(chart: Path) -> None:
+    layers = _map_layers([0, 2])
+    _parse(chart, layers, cache_format="quantized", precision=0.01)
+    directory = paths.shapefiles / layers[-1].label
+    loaded = _map_layers([0, 2])
+    parser = GPKGParser(BOUNDING_BOX, [str(chart)], Ingestion(dict(cache_format="quantized", precision=0.01)))
+    for layer in loaded:
+        parser.load_shapefiles(layer)
+
+    assert sorted(path.suffix for path in directory.iterdir()) == [".json", ".npz"]
+    for layer, cached in zip(layers, loaded):
+        assert cached.geometry.equals(layer.geometry)
+        assert len(cached.records) == 1
+
+
+def test_topology_cache_format_replaces_the_layer_files(chart: Path) -> None:
+    ingestion = dict(cache_format="topology", simplification=dict(topology=1))
+    layers = _map_layers([0, 2])
+    _parse(chart, layers, **ingestion).write_topology(layers)
+    topology_path = paths.shapefiles / "topology.npz"
+    written = topology_path.stat().st_mtime_ns
+    loaded = _map_layers([0, 2])
+    parser = GPKGParser(BOUNDING_BOX, [str(chart)], Ingestion(ingestion))
+    for layer in loaded:
+        parser.load_shapefiles(layer)
+    parser.write_topology(loaded)
+
+    assert topology_path.stat().st_mtime_ns == written
+    for layer, cached in zip(layers, loaded):
+        directory = paths.shapefiles / layer.label
+        assert sorted(path.suffix for path in directory.iterdir()) == [".json", ".topology"]
+        assert cached.geometry.equals(layer.geometry)
+        assert list(cached.records) == list(layer.records)
+
+
+@pytest.mark.parametrize("sources, map_format", [
+    (["chart.gpkg"], MapFormat.GPKG),
+    (["chart.gpkg", "Basisdata.gdb"], MapFormat.FGDB),
+    (["chart.gpkg", "cells/NO500001.000"], MapFormat.FGDB),
+])
+def test_geopackage_format_is_only_chosen_without_other_sources(tmp_path: Path, sources, map_format) -> None:
+    for source in sources:
+        path = tmp_path / source
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.mkdir() if path.suffix == ".gdb" else path.write_bytes(b"")
+    resources = [str(tmp_path / Path(source).parts[0]) for source in sources]
+    settings = dict(enc=dict(size=[100, 100], center=[X, Y], crs="EPSG:25833", resources=resources))
+
+    assert Scope(settings).type == map_format
@@ -0,0 +1,152 @@
+"""
+Tests of the S-57 parser helpers selecting and clipping cells, run without any S-57 data.
+"""
+from pathlib import Path
+
+import pytest
+from pyproj import Transformer
+from shapely import geometry as geo
+
+from seacharts.core import Ingestion, S57Parser, parserS57, paths
+from seacharts.core.catalogS57 import cell_updates, read_update_changes
+from seacharts.layers import Land, Seabed, Shore
+
+BOUNDING_BOX = 0, 0, 10, 10
+
+
+@pytest.fixture
+def parser(tmp_path: Path, monkeypatch) -> S57Parser:
+    monkeypatch.setattr(paths, "shapefiles", tmp_path / "shapefiles")
+    return S57Parser(BOUNDING_BOX, [], "EPSG:4326", Ingestion(dict(best_scale=True)))
+
+
+def test_mosaic_takes_each_part_from_the_most_detailed_covering_cell(parser: S57Parser) -> None:
+    harbour, approach, general = Path("NO500001.000"), Path("NO400001.000"), Path("NO200001.000")
+    coverages = {
+        harbour: geo.Polygon([(0, 0), (4, 0), (0, 4)]),
+        approach: geo.box(0, 0, 6, 10),
+    }
+    regions = parser._mosaic_regions([general, approach, harbour], coverages)
+
+    assert regions[harbour].equals(coverages[harbour])
+    assert regions[approach].equals(geo.box(0, 0, 6, 10).difference(coverages[harbour]))
+    assert regions[general].equals(geo.box(6, 0, 10, 10))
+
+
+def test_mosaic_leaves_out_cells_hidden_by_more_detailed_ones(parser: S57Parser) -> None:
+    harbour, approach = Path("NO500001.000"), Path("NO400001.000")
+    regions = parser._mosaic_regions([approach, harbour], {harbour: geo.box(-5, -5, 20, 20)})
+
+    assert list(regions) == [harbour]
+    assert regions[harbour].equals(geo.box(*BOUNDING_BOX))
+
+
+def test_cell_coverage_prefers_coverage_polygons_over_bounds(parser: S57Parser) -> None:
+    covered, bounded, unknown = Path("NO500001.000"), Path("NO500002.000"), Path("NO500003.000")
+    parser.catalogue.sources = {
+        str(covered): dict(bounds=[0, 0, 4, 4], coverage="POLYGON ((0 0, 4 0, 0 4, 0 0))"),
+        str(bounded): dict(bounds=[0, 0, 4, 4], coverage=None),
+    }
+    transformer = Transformer.from_crs("EPSG:4326", "EPSG:4326", always_xy=True)
+
+    assert parser._cell_coverage(covered, transformer).equals(geo.Polygon([(0, 0), (4, 0), (0, 4)]))
+    assert parser._cell_coverage(bounded, transformer).equals(geo.box(0, 0, 4, 4))
+    assert parser._cell_coverage(unknown, transformer) is None
+
+
+def test_cells_are_converted_with_ogr2ogr_without_gdal_bindings(parser: S57Parser, monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(parserS57, "ogr", None)
+    monkeypatch.setattr(parser, "_valid_paths_and_resources", lambda *args: True)
+    monkeypatch.setattr(parser, "_select_cells", lambda: [Path("NO500001.000")])
+    monkeypatch.setattr(parser, "_parse_S57_cells", lambda *args: calls.append("in_process"))
+    monkeypatch.setattr(parser, "_parse_S57_depths", lambda *args: calls.append("depths"))
+    monkeypatch.setattr(parser, "_parse_S57_region", lambda *args: calls.append("region"))
+    parser.parse_resources([Seabed(depth=0), Land()], [], 1e8)
+
+    assert calls == ["depths", "region"]
+
+
+def test_object_class_acronyms_are_read_from_the_gdal_data_files() -> None:
+    acronyms = S57Parser._object_class_acronyms()
+
+    assert acronyms[42] == "DEPARE"
+    assert acronyms[71] == "LNDARE"
+
+
+@pytest.mark.parametrize("complete", [True, False])
+def test_updates_are_recorded_once_the_touched_layers_are_complete(tmp_path: Path, monkeypatch,
+                                                                   complete: bool) -> None:
+    monkeypatch.setattr(paths, "shapefiles", tmp_path / "shapefiles")
+    cell = tmp_path / "ENC_ROOT" / "NO500001" / "NO500001.000"
+    cell.parent.mkdir(parents=True)
+    cell.write_bytes(b"")
+    cell.with_suffix(".001").write_bytes(b"")
+    parser = S57Parser(BOUNDING_BOX, [str(tmp_path / "ENC_ROOT")], "EPSG:4326")
+    monkeypatch.setattr(parser, "_touched_layer_names", lambda pending, names: names & {"LNDARE"})
+    land, shore = Land(), Shore()
+    for layer in (land, shore):
+        (paths.shapefiles / layer.label).mkdir(parents=True)
+        (paths.shapefiles / layer.label / (layer.label + ".shp")).write_bytes(b"shape")
+    parser._complete_layer(shore.label)
+    if complete:
+        parser._complete_layer(land.label)
+    parser.record_applied_updates([land, shore])
+
+    assert parser._applied_updates() == dict(NO500001=1 if complete else 0)
+
+
+def _iso8211_record(leader_type: bytes, fields: list[tuple[str, bytes]]) -> bytes:
+    """
+    Encodes an ISO 8211 record with 4-digit field lengths and positions in its directory.
+
+    :param leader_type: Leader identifier, b"L" for the DDR and b"D" for data records.
+    :param fields: List of (tag, field data) pairs, each ending with a field terminator.
+    :return: Raw bytes of the record.
+    """
+    directory, position = b"", 0
+    for tag, data in fields:
+        directory += tag.encode() + b"%04d%04d" % (len(data), position)
+        position += len(data)
+    directory += b"\x1e"
+    base_address = 24 + len(directory)
+    length = base_address + position
+    leader = b"%05d3%s     %05d   4404" % (length, leader_type, base_address)
+    return leader + directory + b"".join(data for _, data in fields)
+
+
+def _write_update(path: Path, object_classes: list[int], vectors: list[tuple[int, int]]) -> None:
+    """
+    Writes a S-57 update file changing features of the given object classes and the given
+    vector records, holding only the fields read to find the touched layers.
+
+    :param path: Path of the update file.
+    :param object_classes: List of object class codes (OBJL) of changed features.
+    :param vectors: List of (RCNM, RCID) identifiers of changed vector records.
+    """
+    frid = "RCNM!RCID!PRIM!GRUP!OBJL!RVER!RUIN", "(b11,b14,2b11,2b12,b11)"
+    vrid = "RCNM!RCID!RVER!RUIN", "(b11,b14,b12,b11)"
+    ddr = [(tag, b"1600;&\x1f" + labels.encode() + b"\x1f" + formats.encode() + b"\x1e")
+           for tag, (labels, formats) in (("FRID", frid), ("VRID", vrid))]
+    records = [_iso8211_record(b"L", ddr)]
+    for i, code in enumerate(object_classes):
+        values = (100).to_bytes(1, "little") + i.to_bytes(4, "little") + bytes([3, 2])
+        values += code.to_bytes(2, "little") + (2).to_bytes(2, "little") + bytes([3])
+        records.append(_iso8211_record(b"D", [("FRID", values + b"\x1e")]))
+    for rcnm, rcid in vectors:
+        values = rcnm.to_bytes(1, "little") + rcid.to_bytes(4, "little") + (2).to_bytes(2, "little") + bytes([3])
+        records.append(_iso8211_record(b"D", [("VRID", values + b"\x1e")]))
+    path.write_bytes(b"".join(records))
+
+
+def test_update_changes_are_read_from_update_files(tmp_path: Path) -> None:
+    cell = tmp_path / "NO500001.000"
+    cell.write_bytes(b"")
+    for number in (2, 1, 10):
+        _write_update(cell.with_suffix(f".{number:03d}"), [42, 71 + number], [(130, number)])
+    (tmp_path / "NO500002.001").write_bytes(b"")
+
+    updates = cell_updates(cell)
+    assert [number for number, _ in updates] == [1, 2, 10]
+    assert read_update_changes(updates[0][1]) == ({42, 72}, {(130, 1)})
+    assert read_update_changes(updates[2][1]) == ({42, 81}, {(130, 10)})